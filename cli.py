@@ -6,91 +6,145 @@ Provides command-line interface for credential management and login automation.
 import os
 import sys
 import json
-import asyncio
-import getpass
 import argparse
 from pathlib import Path
 
-# Add src directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Application modules (and asyncio/getpass) are imported inside the commands
+# that need them, so --help and argument errors never pay for Playwright,
+# cryptography or requests.
 
-from src.core.app_core import AppCore
-from src.utils.config_manager import ConfigManager
-from src.utils.logger import Logger
-from src.core.credential_manager import CredentialManager
+def _build_parser():
+    """Create command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Automated Login CLI - Securely manage and automate website logins"
+    )
+    
+    # Add subparsers for different commands
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    
+    # Init command
+    init_parser = subparsers.add_parser("init", help="Initialize application with master password")
+    init_parser.add_argument("--password", help="Master password (not recommended, use prompt instead)")
+    init_parser.add_argument("--confirm-password", help="Confirm master password (for non-interactive use)")
+    init_parser.add_argument("--no-confirm", action="store_true", help="Skip password confirmation (use with caution)")
+    init_parser.add_argument("--force", action="store_true", help="Force initialization even if already initialized")
+    
+    # Add website command
+    add_parser = subparsers.add_parser("add", help="Add or update website credentials")
+    add_parser.add_argument("url", help="Website URL")
+    add_parser.add_argument("username", help="Login username")
+    add_parser.add_argument("--password", help="Login password (not recommended, use prompt instead)")
+    add_parser.add_argument("--has-bonus", action="store_true", help="Website offers free credit/trial bonus")
+    add_parser.add_argument("--notes", help="Additional notes")
+    add_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
+    
+    # Remove website command
+    remove_parser = subparsers.add_parser("remove", help="Remove website credentials")
+    remove_parser.add_argument("url", help="Website URL")
+    remove_parser.add_argument("--force", "-f", action="store_true", help="Skip confirmation")
+    remove_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
+    
+    # List websites command
+    list_parser = subparsers.add_parser("list", help="List website credentials")
+    list_parser.add_argument("--bonus-only", action="store_true", help="List only websites with bonus")
+    list_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
+    
+    # Login command
+    login_parser = subparsers.add_parser("login", help="Login to website(s)")
+    login_parser.add_argument("urls", nargs="*", help="Website URLs to login (empty for all)")
+    login_parser.add_argument("--bonus-only", action="store_true", help="Login only to websites with bonus")
+    login_parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], 
+                             default="chromium", help="Browser to use")
+    login_parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
+    login_parser.add_argument("--concurrency", type=int, default=4,
+                             help="Maximum number of websites to log in to at the same time")
+    login_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
+    
+    # Change master password command
+    change_parser = subparsers.add_parser("change-password", help="Change master password")
+    change_parser.add_argument("--current-password", help="Current master password (not recommended, use prompt instead)")
+    change_parser.add_argument("--new-password", help="New master password (not recommended, use prompt instead)")
+    change_parser.add_argument("--confirm-password", help="Confirm new password (for non-interactive use)")
+    change_parser.add_argument("--no-confirm", action="store_true", help="Skip password confirmation (use with caution)")
+    
+    return parser
+
+_PARSER = None
+
+def _get_parser():
+    """
+    Return the command-line argument parser, building it on first use.
+    
+    Returns:
+        argparse.ArgumentParser: Shared parser instance
+    """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+def _run_event_loop(coroutine):
+    """
+    Run a coroutine to completion on a new event loop.
+    
+    The loop is a uvloop loop when uvloop is installed (POSIX only). It is
+    created for this run only, so the process-wide event loop policy is
+    left alone.
+    
+    Args:
+        coroutine: Coroutine to run
+        
+    Returns:
+        Result of the coroutine
+    """
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.run(coroutine)
+    import asyncio
+    return asyncio.run(coroutine)
 
 class CLI:
     """Command-line interface for the Automated Login Application."""
     
     def __init__(self):
         """Initialize CLI application."""
-        self.logger = Logger("CLI")
-        self.config_manager = ConfigManager()
+        self.logger = None
+        self.config_manager = None
         self.app_core = None  # Initialize later with password
         self.credential_manager = None  # Initialize directly when needed
         self.is_initialized = False
+        self._data_dir = None
+        self._credentials_path = None
+        
+        # Command dispatch table (init is handled separately, it needs no unlock)
+        self._handlers = {
+            "add": self._add_command,
+            "remove": self._remove_command,
+            "list": self._list_command,
+            "login": self._login_command,
+            "change-password": self._change_password_command,
+        }
         
         # Parse command-line arguments
-        self.parser = self._create_parser()
+        self.parser = _get_parser()
         self.args = self.parser.parse_args()
         
+        # Only load configuration when a command will actually run
+        if self.args.command is not None:
+            from src.utils.config_manager import ConfigManager
+            from src.utils.logger import Logger
+            self.logger = Logger("CLI")
+            self.config_manager = ConfigManager()
+            self._data_dir = self.config_manager.get("data_dir")
+            self._credentials_path = os.path.join(self._data_dir, "credentials.enc")
+        
         # Process commands
         self._process_commands()
     
-    def _create_parser(self):
-        """Create command-line argument parser."""
-        parser = argparse.ArgumentParser(
-            description="Automated Login CLI - Securely manage and automate website logins"
-        )
-        
-        # Add subparsers for different commands
-        subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-        
-        # Init command
-        init_parser = subparsers.add_parser("init", help="Initialize application with master password")
-        init_parser.add_argument("--password", help="Master password (not recommended, use prompt instead)")
-        init_parser.add_argument("--confirm-password", help="Confirm master password (for non-interactive use)")
-        init_parser.add_argument("--no-confirm", action="store_true", help="Skip password confirmation (use with caution)")
-        init_parser.add_argument("--force", action="store_true", help="Force initialization even if already initialized")
-        
-        # Add website command
-        add_parser = subparsers.add_parser("add", help="Add or update website credentials")
-        add_parser.add_argument("url", help="Website URL")
-        add_parser.add_argument("username", help="Login username")
-        add_parser.add_argument("--password", help="Login password (not recommended, use prompt instead)")
-        add_parser.add_argument("--has-bonus", action="store_true", help="Website offers free credit/trial bonus")
-        add_parser.add_argument("--notes", help="Additional notes")
-        add_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
-        
-        # Remove website command
-        remove_parser = subparsers.add_parser("remove", help="Remove website credentials")
-        remove_parser.add_argument("url", help="Website URL")
-        remove_parser.add_argument("--force", "-f", action="store_true", help="Skip confirmation")
-        remove_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
-        
-        # List websites command
-        list_parser = subparsers.add_parser("list", help="List website credentials")
-        list_parser.add_argument("--bonus-only", action="store_true", help="List only websites with bonus")
-        list_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
-        
-        # Login command
-        login_parser = subparsers.add_parser("login", help="Login to website(s)")
-        login_parser.add_argument("urls", nargs="*", help="Website URLs to login (empty for all)")
-        login_parser.add_argument("--bonus-only", action="store_true", help="Login only to websites with bonus")
-        login_parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], 
-                                 default="chromium", help="Browser to use")
-        login_parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
-        login_parser.add_argument("--master-password", help="Master password (for non-interactive use)")
-        
-        # Change master password command
-        change_parser = subparsers.add_parser("change-password", help="Change master password")
-        change_parser.add_argument("--current-password", help="Current master password (not recommended, use prompt instead)")
-        change_parser.add_argument("--new-password", help="New master password (not recommended, use prompt instead)")
-        change_parser.add_argument("--confirm-password", help="Confirm new password (for non-interactive use)")
-        change_parser.add_argument("--no-confirm", action="store_true", help="Skip password confirmation (use with caution)")
-        
-        return parser
-    
     def _process_commands(self):
         """Process command-line arguments and execute commands."""
         if not self.args.command:
@@ -109,27 +163,23 @@ class CLI:
             if not self._ensure_initialized(master_password):
                 return
             
-            # Execute command
-            if self.args.command == "add":
-                self._add_command()
-            elif self.args.command == "remove":
-                self._remove_command()
-            elif self.args.command == "list":
-                self._list_command()
-            elif self.args.command == "login":
-                self._login_command()
-            elif self.args.command == "change-password":
-                self._change_password_command()
+            # Execute command, then write any debounced credential changes
+            # before this short-lived process exits
+            try:
+                self._handlers[self.args.command]()
+            finally:
+                if self.credential_manager:
+                    self.credential_manager.flush()
     
     def _init_command(self):
         """Initialize application with master password."""
-        # Check if already initialized
-        data_dir = self.config_manager.get("data_dir")
-        os.makedirs(data_dir, exist_ok=True)
+        from src.core.app_core import AppCore
+        from src.core.credential_manager import CredentialManager
         
-        credentials_file = os.path.join(data_dir, "credentials.enc")
+        # Check if already initialized
+        os.makedirs(self._data_dir, exist_ok=True)
         
-        if os.path.exists(credentials_file) and not self.args.force:
+        if os.path.exists(self._credentials_path) and not self.args.force:
             print("Application already initialized. Use --force to reinitialize.")
             return
         
@@ -162,17 +212,15 @@ class CLI:
         # Initialize credential manager directly
         self.credential_manager = CredentialManager(self.config_manager, password)
         
-        # Force initialization of cipher suite
-        if not hasattr(self.credential_manager, 'cipher_suite') or self.credential_manager.cipher_suite is None:
-            self.credential_manager._initialize_cipher_suite()
-        
-        # Add a dummy website to ensure the file is created
-        self.credential_manager.add_website("dummy.example.com", "dummy", "dummy123")
-        self.credential_manager.remove_website("dummy.example.com")
+        # Write the credentials file directly (a single encrypt-and-write),
+        # never deferred since later commands check for the file
+        if not (self.credential_manager.save_credentials() and self.credential_manager.flush()):
+            print("Error: Failed to create credentials file")
+            return
         
         # Initialize app core for other operations
-        self.app_core = AppCore(self.config_manager)
-        if self.app_core.initialize(password):
+        self.app_core = AppCore.from_config(self.config_manager)
+        if self.app_core.initialize(password, self.credential_manager):
             print("Application initialized successfully")
             self.is_initialized = True
         else:
@@ -232,55 +280,51 @@ class CLI:
     
     def _list_command(self):
         """List website credentials."""
-        # Get websites
-        websites = {}
+        # Get websites (the bonus filter is applied while formatting rows)
         if self.credential_manager:
-            if self.args.bonus_only:
-                websites = {url: creds for url, creds in self.credential_manager.credentials.items() 
-                           if creds.get("has_bonus", False)}
-                print("Listing websites with bonus:")
-            else:
-                websites = self.credential_manager.credentials
-                print("Listing all websites:")
+            websites = self.credential_manager.credentials
         else:
-            if self.args.bonus_only:
-                websites = self.app_core.get_bonus_websites()
-                print("Listing websites with bonus:")
-            else:
-                websites = self.app_core.get_all_websites()
-                print("Listing all websites:")
+            websites = self.app_core.get_all_websites()
         
-        if not websites:
-            print("No websites found")
-            return
+        bonus_only = self.args.bonus_only
+        if bonus_only:
+            print("Listing websites with bonus:")
+        else:
+            print("Listing all websites:")
         
         # Print websites
-        print("\n{:<40} {:<20} {:<10} {:<30}".format("URL", "Username", "Has Bonus", "Last Login"))
-        print("-" * 100)
+        rows = [
+            f"\n{'URL':<40} {'Username':<20} {'Has Bonus':<10} {'Last Login':<30}\n",
+            "-" * 100 + "\n",
+        ]
         
         for url, data in websites.items():
+            has_bonus_val = data.get("has_bonus", False)
+            if bonus_only and not has_bonus_val:
+                continue
+            
             # Format last login info
             last_login = "Never"
-            if data.get("last_login"):
-                timestamp = data["last_login"]["timestamp"]
-                success = "Success" if data["last_login"]["success"] else "Failed"
-                last_login = f"{timestamp} ({success})"
+            last_login_obj = data.get("last_login")
+            if last_login_obj:
+                success = "Success" if last_login_obj["success"] else "Failed"
+                last_login = f"{last_login_obj['timestamp']} ({success})"
             
             # Format has_bonus
-            has_bonus = "Yes" if data.get("has_bonus", False) else "No"
+            has_bonus = "Yes" if has_bonus_val else "No"
             
-            print("{:<40} {:<20} {:<10} {:<30}".format(
-                url[:40], data["username"][:20], has_bonus, last_login[:30]
-            ))
+            rows.append(f"{url[:40]:<40} {data['username'][:20]:<20} {has_bonus:<10} {last_login[:30]:<30}\n")
+        
+        if len(rows) == 2:
+            print("No websites found")
+            return
+        
+        # One write instead of a flushed print per row
+        sys.stdout.write("".join(rows))
     
     def _login_command(self):
         """Login to website(s)."""
-        # Set browser options
-        if self.app_core.browser_automation:
-            self.app_core.browser_automation.set_browser_type(self.args.browser)
-            self.app_core.browser_automation.set_headless(self.args.headless)
-        
-        # Get websites to login
+        # Get websites to login as (url, credentials) pairs
         websites = {}
         urls_to_login = []
         
@@ -290,23 +334,23 @@ class CLI:
             websites = self.app_core.get_all_websites()
             
         if self.args.urls:
-            # Login to specified websites
-            urls = self.args.urls
-            urls_to_login = [url for url in urls if url in websites]
+            # Login to specified websites (keep command-line order, drop duplicates)
+            valid = set(self.args.urls) & websites.keys()
+            urls_to_login = [(url, websites[url]) for url in dict.fromkeys(self.args.urls) if url in valid]
             
             if not urls_to_login:
                 print("Error: No valid websites specified")
                 return
         elif self.args.bonus_only:
             # Login to bonus websites
-            urls_to_login = [url for url, data in websites.items() if data.get("has_bonus", False)]
+            urls_to_login = [(url, data) for url, data in websites.items() if data.get("has_bonus", False)]
             
             if not urls_to_login:
                 print("No bonus websites found")
                 return
         else:
             # Login to all websites
-            urls_to_login = list(websites.keys())
+            urls_to_login = list(websites.items())
             
             if not urls_to_login:
                 print("No websites found")
@@ -315,68 +359,140 @@ class CLI:
         # Login to each website
         print(f"Logging in to {len(urls_to_login)} website(s)...")
         
-        # Create event loop for async operations
-        loop = asyncio.get_event_loop()
+        results = {}
+        try:
+            _run_event_loop(self._do_logins(urls_to_login, results))
+        except KeyboardInterrupt:
+            print("\nLogin process interrupted, aborting batch")
+        finally:
+            # Collect last login updates for every site that finished (even
+            # if the batch was interrupted) and write them once at the end
+            last_logins = {}
+            try:
+                for url, _ in urls_to_login:
+                    if url not in results:
+                        continue
+                    status = results[url]
+                    if isinstance(status, BaseException):
+                        print(f"Login failed for {url}: {status}")
+                        continue
+                    
+                    if status["success"] is not None:
+                        last_logins[url] = status["success"]
+                    
+                    # Print result
+                    if status["success"]:
+                        print(f"Login successful for {url}")
+                    elif status["success"] is False:
+                        print(f"Login failed for {url}: {status['message']}")
+                    else:
+                        print(f"Login status unknown for {url}")
+            finally:
+                credential_manager = self.credential_manager or self.app_core.credential_manager
+                credential_manager.update_last_login_bulk(last_logins)
+    
+    async def _do_logins(self, urls_to_login, results):
+        """
+        Log in to the given websites inside a single event loop.
+        
+        Args:
+            urls_to_login (list): (url, credentials) pairs to log in to
+            results (dict): Filled with the status dictionary (or raised
+                exception) of each URL as soon as its login finishes, so
+                completed sites survive an interrupted batch
+            
+        Returns:
+            dict: results
+        """
+        import asyncio
+        from src.core.browser_automation import BrowserAutomation
+        
+        queue = asyncio.Queue()
+        printer = asyncio.create_task(self._print_status(queue))
+        concurrency = max(1, self.args.concurrency or 4)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        def record(url, task):
+            # Cancelled logins (an interrupted batch) have no result to keep
+            if not task.cancelled():
+                results[url] = task.exception() or task.result()
+        
+        # Launch one browser up front; every site gets its own context in it
+        browser_automation = BrowserAutomation(self.config_manager)
+        browser_automation.set_browser_type(self.args.browser)
+        browser_automation.set_headless(self.args.headless)
         
         try:
-            # Login to each website
-            for url in urls_to_login:
-                print(f"\nLogging in to {url}...")
-                
-                # Get credentials
-                credentials = websites[url]
-                
-                # Initialize browser if needed
-                if not hasattr(self.app_core.browser_automation, 'browser') or not self.app_core.browser_automation.browser:
-                    print("Initializing browser...")
-                    loop.run_until_complete(self.app_core.browser_automation.initialize())
-                
+            await browser_automation.prewarm(min(concurrency, len(urls_to_login)))
+            tasks = []
+            for url, credentials in urls_to_login:
+                task = asyncio.create_task(self._login_to_site(url, credentials, browser_automation, semaphore, queue))
+                task.add_done_callback(lambda t, url=url: record(url, t))
+                tasks.append(task)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return results
+        finally:
+            await browser_automation.close()
+            await queue.join()
+            printer.cancel()
+    
+    async def _login_to_site(self, url, credentials, browser_automation, semaphore, queue):
+        """
+        Log in to one website in a dedicated context of the shared browser.
+        
+        Args:
+            url (str): Website URL
+            credentials (dict): Stored credentials for the website
+            browser_automation (BrowserAutomation): Launched browser shared by all sites
+            semaphore (asyncio.Semaphore): Bounds the number of concurrent contexts
+            queue (asyncio.Queue): Status lines to print
+            
+        Returns:
+            dict: Login status
+        """
+        async with semaphore:
+            queue.put_nowait(f"\nLogging in to {url}...")
+            
+            # Each task drives its own context and page so pages never collide
+            session = await browser_automation.new_session()
+            
+            try:
                 # Login to website
-                status = loop.run_until_complete(
-                    self.app_core.browser_automation.login_to_website(
-                        url, credentials["username"], credentials["password"],
-                        lambda s: print(f"Status: {s['stage']} - {s['message']}")
-                    )
+                status = await session.login_to_website(
+                    url, credentials["username"], credentials["password"],
+                    lambda s: queue.put_nowait(f"[{url}] Status: {s['stage']} - {s['message']}")
                 )
                 
                 # Check if user action is required
                 if status.get("requires_user_action", False):
                     if status.get("captcha_detected", False):
-                        print("\nCAPTCHA detected. Please complete the CAPTCHA in the browser window.")
+                        queue.put_nowait(f"\n[{url}] CAPTCHA detected. Please complete the CAPTCHA in the browser window.")
                     elif status.get("two_factor_detected", False):
-                        print("\nTwo-factor authentication detected. Please complete the verification in the browser window.")
+                        queue.put_nowait(f"\n[{url}] Two-factor authentication detected. Please complete the verification in the browser window.")
                     
-                    print("Waiting for user action (press Ctrl+C to skip)...")
+                    queue.put_nowait(f"[{url}] Waiting for user action (press Ctrl+C to abort)...")
                     
-                    try:
-                        # Wait for user action
-                        loop.run_until_complete(self.app_core.browser_automation.wait_for_user_action())
-                    except KeyboardInterrupt:
-                        print("\nSkipping website...")
-                        continue
-                
-                # Update last login timestamp
-                if status["success"] is not None:
-                    if self.credential_manager:
-                        self.credential_manager.update_last_login(url, status["success"])
-                    else:
-                        self.app_core.credential_manager.update_last_login(url, status["success"])
+                    # Wait for user action (Ctrl+C cancels the whole batch)
+                    await session.wait_for_user_action()
                 
-                # Print result
-                if status["success"]:
-                    print(f"Login successful for {url}")
-                elif status["success"] is False:
-                    print(f"Login failed for {url}: {status['message']}")
-                else:
-                    print(f"Login status unknown for {url}")
+                return status
+            finally:
+                # Close this site's context
+                await session.close()
+    
+    @staticmethod
+    async def _print_status(queue):
+        """
+        Print queued status lines until cancelled.
         
-        except KeyboardInterrupt:
-            print("\nLogin process interrupted")
-        finally:
-            # Close browser
-            if hasattr(self.app_core.browser_automation, 'browser') and self.app_core.browser_automation.browser:
-                print("\nClosing browser...")
-                loop.run_until_complete(self.app_core.browser_automation.close())
+        A single consumer keeps lines from concurrent logins from interleaving.
+        
+        Args:
+            queue (asyncio.Queue): Status lines to print
+        """
+        while True:
+            print(await queue.get())
+            queue.task_done()
     
     def _change_password_command(self):
         """Change master password."""
@@ -389,11 +505,11 @@ class CLI:
         
         # Verify current password
         if self.credential_manager:
-            if current != self.credential_manager.master_password:
+            if not self.credential_manager.verify_password(current):
                 print("Error: Incorrect password")
                 return
         else:
-            if current != self.app_core.credential_manager.master_password:
+            if not self.app_core.credential_manager.verify_password(current):
                 print("Error: Incorrect password")
                 return
         
@@ -448,11 +564,11 @@ class CLI:
         if self.is_initialized and (self.app_core or self.credential_manager):
             return True
         
-        # Check if credentials file exists
-        data_dir = self.config_manager.get("data_dir")
-        credentials_file = os.path.join(data_dir, "credentials.enc")
+        from src.core.app_core import AppCore
+        from src.core.credential_manager import CredentialManager
         
-        if not os.path.exists(credentials_file):
+        # Check if credentials file exists
+        if not os.path.exists(self._credentials_path):
             print("Error: Application not initialized. Run 'init' command first.")
             return False
         
@@ -465,20 +581,15 @@ class CLI:
         
         # Initialize credential manager directly
         try:
+            # The constructor derives the key and loads the credentials file
             self.credential_manager = CredentialManager(self.config_manager, password)
-            
-            # Force initialization of cipher suite
-            if not hasattr(self.credential_manager, 'cipher_suite') or self.credential_manager.cipher_suite is None:
-                self.credential_manager._initialize_cipher_suite()
-                
-            # Load credentials
-            if not self.credential_manager.load_credentials():
+            if not self.credential_manager.is_loaded:
                 print("Error: Failed to load credentials")
                 return False
                 
             # Initialize app core for other operations
-            self.app_core = AppCore(self.config_manager)
-            if not self.app_core.initialize(password):
+            self.app_core = AppCore.from_config(self.config_manager)
+            if not self.app_core.initialize(password, self.credential_manager):
                 print("Error: Failed to initialize application core")
                 return False
                 
@@ -502,6 +613,8 @@ class CLI:
         if arg_password:
             return arg_password
         
+        import getpass
+        
         try:
             return getpass.getpass(prompt)
         except (KeyboardInterrupt, EOFError):
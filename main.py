@@ -2,19 +2,15 @@
 Main entry point for the Automated Login Application.
 """
 
-import tkinter as tk
-import sys
-import os
-
-# Add src directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.ui.main_window import MainWindow
 from src.core.service_container import ServiceContainer
 from src.utils.config_manager import ConfigManager
 from src.utils.logger import Logger
 from src.utils.error_handler import ErrorHandler
-from src.core.browser_automation import BrowserAutomation
+
+def _create_browser_automation(config_manager):
+    """Import and build BrowserAutomation only when a service first asks for it."""
+    from src.core.browser_automation import BrowserAutomation
+    return BrowserAutomation(config_manager)
 
 def main():
     """Main application entry point."""
@@ -32,7 +28,10 @@ def main():
     container.register("error_handler", error_handler)
     
     # Register browser automation as a factory for lazy loading
-    container.register_factory("browser_automation", lambda: BrowserAutomation(config_manager))
+    container.register_factory("browser_automation", lambda: _create_browser_automation(config_manager))
+    
+    # Tk is only loaded once a dialog is about to be shown
+    import tkinter as tk
     
     # Create root window (needed for dialogs)
     root = tk.Tk()
@@ -62,7 +61,7 @@ def main():
             if not password:
                 root.destroy()
                 return
-            app_core = AppCore(container)
+            app_core = AppCore.from_container(container)
             is_initialized = app_core.initialize(password)
             if not is_initialized:
                 tk.messagebox.showerror("Error", "Failed to initialize application. Please try again.")
@@ -76,14 +75,20 @@ def main():
             if not password:
                 root.destroy()
                 return
-            app_core = AppCore(container)
+            app_core = AppCore.from_container(container)
             is_initialized = app_core.initialize(password)
             if not is_initialized:
                 tk.messagebox.showerror("Error", "Invalid master password. Please try again.")
 
+    # Status updates from login tasks must reach the widgets on the Tk thread
+    app_core.use_tk_dispatcher(root)
+
     # Register initialized AppCore in the service container
     container.register("app_core", app_core)
 
+    # The main window pulls in the whole UI package; load it once unlocked
+    from src.ui.main_window import MainWindow
+
     root.deiconify()  # Show main window after initialization
 
     # Set application style
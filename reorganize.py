@@ -3,7 +3,6 @@ Utility script for moving debug and validation scripts to a dedicated tools dire
 """
 
 import os
-import shutil
 import sys
 from pathlib import Path
 
@@ -26,10 +25,11 @@ for file in files_to_move:
     src = os.path.join(os.path.dirname(os.path.abspath(__file__)), file)
     dst = os.path.join(tools_dir, file)
     
-    if os.path.exists(src):
-        shutil.move(src, dst)
+    # Same filesystem, so a single atomic rename is enough
+    try:
+        os.replace(src, dst)
         print(f"Moved {file} to tools directory")
-    else:
+    except FileNotFoundError:
         print(f"File {file} not found")
 
 print("Reorganization complete")
@@ -4,61 +4,287 @@ Connects GUI with backend functionality and manages application state.
 """
 
 import asyncio
+import itertools
 import threading
-import uuid
-from typing import Dict, Optional, Any, Callable, List, Tuple, Union, Awaitable
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional, Any, Callable, List, Set, Tuple, Union, Awaitable
+from urllib.parse import urlparse
 
-from ..core.credential_manager import CredentialManager
-from ..core.browser_automation import BrowserAutomation, precheck_google_oauth
+try:
+    import uvloop
+except ImportError:  # Optional; not available on Windows
+    uvloop = None
+
+from ..core.credential_manager import CredentialManager, _normalize_url
 from ..core.service_container import ServiceContainer
 from ..utils.logger import Logger
 from ..utils.config_manager import ConfigManager
 from ..utils.error_handler import ErrorHandler
 from ..utils.exceptions import AppError, BrowserError, CredentialError
 
+if TYPE_CHECKING:
+    # Imported on first use at runtime; it pulls in Playwright, requests and bs4
+    from ..core.browser_automation import BrowserAutomation
+
 error_handler = ErrorHandler(Logger("AppCore"))
 
+# Most pages AppCore keeps Google OAuth precheck results for
+_OAUTH_CACHE_SIZE = 512
+
+class LoginTask:
+    """State of a login started with AppCore.login_to_website."""
+    
+    # Declared by hand rather than with dataclass(slots=True), which needs
+    # Python 3.10; the task history can hold thousands of these
+    __slots__ = ("url", "status", "future", "created_at")
+    
+    def __init__(self, url: str, status: str, future: Optional[Future] = None,
+                 created_at: Optional[float] = None) -> None:
+        """
+        Initialize a login task.
+        
+        Args:
+            url: Website URL
+            status: Current login stage
+            future: Future of the login coroutine, once it is scheduled
+            created_at: Monotonic creation time (defaults to now)
+        """
+        self.url = url
+        self.status = status
+        self.future = future
+        self.created_at = time.monotonic() if created_at is None else created_at
+    
+    def __repr__(self) -> str:
+        return f"LoginTask(url={self.url!r}, status={self.status!r})"
+    
+    @property
+    def done(self) -> bool:
+        """Whether the login has finished (successfully or not)."""
+        if self.future is not None:
+            return self.future.done()
+        return self.status != "starting"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the task as a plain dictionary.
+        
+        Returns:
+            Dictionary with url, status and future keys
+        """
+        return {"url": self.url, "status": self.status, "future": self.future}
+
+class _MissingCredentialManager:
+    """Stand-in for AppCore._cm until a credential manager is set."""
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only the manager's public API reports the missing manager; private,
+        # dunder and protocol lookups (hasattr, copy, pickle, repr) behave normally
+        if name.startswith("_") or not hasattr(CredentialManager, name):
+            raise AttributeError(name)
+        raise CredentialError("Credential manager not initialized")
+
+_MISSING_CREDENTIAL_MANAGER = _MissingCredentialManager()
+
+class _InflightLogin:
+    """A login_to_website_async call that later identical calls wait on."""
+    
+    __slots__ = ("task", "params", "callers")
+    
+    def __init__(self, task: "asyncio.Future[Dict[str, Any]]", params: Tuple[Any, ...]) -> None:
+        """
+        Initialize an in-flight login.
+        
+        Args:
+            task: Task running the login
+            params: Arguments besides the URL and login method that a caller must match to share it
+        """
+        self.task = task
+        self.params = params
+        # Callers still waiting; the login is cancelled when the last one is
+        self.callers = 0
+
+class LoginTaskHistory(OrderedDict):
+    """
+    Login tasks in insertion order with bounded size.
+    
+    Inserting a task evicts finished tasks older than the TTL and, while the
+    history is over its size limit, the oldest finished tasks. Tasks that are
+    still running are never evicted.
+    """
+    
+    def __init__(self, max_size: int = 512, ttl: Optional[float] = None) -> None:
+        """
+        Initialize an empty task history.
+        
+        Args:
+            max_size: Maximum number of tasks to keep
+            ttl: Seconds after which a finished task is dropped, or None to keep it
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+    
+    def __setitem__(self, key: str, value: LoginTask) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self._evict()
+    
+    def _evict(self) -> None:
+        """Drop expired finished tasks, then the oldest finished ones over the limit."""
+        if self.ttl is not None:
+            cutoff = time.monotonic() - self.ttl
+            expired = []
+            for key, task in self.items():
+                # Tasks are in creation order, so stop at the first recent one
+                if task.created_at > cutoff:
+                    break
+                if task.done:
+                    expired.append(key)
+            for key in expired:
+                del self[key]
+        
+        if len(self) > self.max_size:
+            finished = [key for key, task in self.items() if task.done]
+            for key in finished[:len(self) - self.max_size]:
+                del self[key]
+
 class AppCore:
     """
     Core application logic that connects GUI with backend functionality.
     Manages application state and coordinates between modules.
     """
     
-    def __init__(self, container_or_config) -> None:
+    def __init__(self, container_or_config: Union[ServiceContainer, ConfigManager, None] = None, *,
+                 container: Optional[ServiceContainer] = None,
+                 config_manager: Optional[ConfigManager] = None) -> None:
         """
         Initialize application core with dependencies from service container or directly from ConfigManager.
         
+        Prefer from_container/from_config when the type is known; the positional
+        form is kept for existing callers.
+        
         Args:
             container_or_config: ServiceContainer or ConfigManager instance
+            container: Service container to take the configuration and services from
+            config_manager: Configuration manager to use without a container
         """
-        # Support both ServiceContainer and ConfigManager for test and app flexibility
-        from ..utils.config_manager import ConfigManager
-        from ..core.service_container import ServiceContainer
-
-        self.container = None
-        self.logger = None
-        self.config_manager = None
-        self.error_handler = None
-
-        if isinstance(container_or_config, ServiceContainer):
-            self.container = container_or_config
-            self.logger = self.container.get("logger") if self.container.has("logger") else Logger("AppCore")
-            self.config_manager = self.container.get("config_manager")
-            self.error_handler = self.container.get("error_handler") if self.container.has("error_handler") else ErrorHandler(self.logger)
-        elif isinstance(container_or_config, ConfigManager):
-            self.config_manager = container_or_config
-            self.logger = Logger("AppCore")
-            self.error_handler = ErrorHandler(self.logger)
-        else:
+        if container_or_config is not None:
+            # Support both ServiceContainer and ConfigManager for test and app flexibility
+            if isinstance(container_or_config, ServiceContainer):
+                container = container_or_config
+            elif isinstance(container_or_config, ConfigManager):
+                config_manager = container_or_config
+            else:
+                raise TypeError("AppCore requires a ServiceContainer or ConfigManager as its argument.")
+
+        if container is not None:
+            config_manager = container.get("config_manager")
+        elif config_manager is None:
             raise TypeError("AppCore requires a ServiceContainer or ConfigManager as its argument.")
+        self.container = container
+        self.config_manager = config_manager
+
+        # Resolve services once; later accesses are plain attribute loads
+        self.logger = self._resolve("logger", lambda: Logger("AppCore"))
+        self.error_handler = self._resolve("error_handler", lambda: ErrorHandler(self.logger))
 
         # These will be initialized lazily when needed
-        self.credential_manager: Optional[CredentialManager] = None
-        self._browser_automation: Optional[BrowserAutomation] = None
+        self.credential_manager = None
+        self._browser_automation: Optional["BrowserAutomation"] = None
 
-        self.login_tasks: Dict[str, Dict[str, Any]] = {}
+        self.login_tasks: LoginTaskHistory = LoginTaskHistory(
+            int(self.config_manager.get("max_task_history", 512)),
+            float(self.config_manager.get("task_history_ttl", 86400))
+        )
+        self._task_counter = itertools.count()
+        # login_tasks is written on the event loop and read from the GUI thread
+        self._tasks_lock = threading.Lock()
         self.is_initialized: bool = False
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Optional hook that runs status callbacks on the GUI thread:
+        # dispatcher(callback, status)
+        self.callback_dispatcher: Optional[Callable[[Callable[[Dict[str, Any]], None], Dict[str, Any]], None]] = None
+        
+        # Blocking helpers (HTTP precheck, opening the system browser) run here
+        # so they never stall the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Google OAuth precheck results per page (scheme, host and path) as
+        # (monotonic timestamp, result), least recently used first
+        self._oauth_cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        # Precheck scans in progress per (event loop, page), so concurrent
+        # callers share one scan; entries are removed when the scan finishes
+        self._oauth_scans: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        
+        # Tasks running logins started with login_to_website, so close can
+        # cancel them and wait for them to finish
+        self._login_runs: Set[asyncio.Task] = set()
+        
+        # Logins currently running, per normalized URL and login method, so
+        # duplicate requests share one
+        self._inflight: Dict[Tuple[str, Optional[str]], _InflightLogin] = {}
+        
+        # All browser work runs on one long-lived event loop in a background
+        # thread (Playwright objects are bound to the loop that created them)
+        self._bg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bg_thread: Optional[threading.Thread] = None
+        self._bg_lock = threading.Lock()
+    
+    @classmethod
+    def from_container(cls, container: ServiceContainer) -> "AppCore":
+        """
+        Create an application core from a service container.
+        
+        Args:
+            container: Service container providing config_manager and optional services
+            
+        Returns:
+            Application core
+        """
+        return cls(container=container)
+    
+    @classmethod
+    def from_config(cls, config_manager: ConfigManager) -> "AppCore":
+        """
+        Create an application core from a configuration manager alone.
+        
+        Args:
+            config_manager: Configuration manager
+            
+        Returns:
+            Application core
+        """
+        return cls(config_manager=config_manager)
+    
+    def use_tk_dispatcher(self, root: Any) -> None:
+        """
+        Deliver status callbacks on the Tk thread.
+        
+        Login coroutines run on background event loops; handing each update to
+        root.after(0, ...) makes Tk run the callback on its own thread instead
+        of touching widgets from the loop thread.
+        
+        Args:
+            root: Tk root window (or any widget)
+        """
+        self.callback_dispatcher = lambda callback, status: root.after(0, callback, status)
+    
+    def _resolve(self, name: str, default: Callable[[], Any]) -> Any:
+        """
+        Get a service from the container, or build a default without one.
+        
+        Args:
+            name: Service name in the container
+            default: Factory for the service when the container lacks it
+            
+        Returns:
+            Service instance
+        """
+        if self.container is not None and self.container.has(name):
+            return self.container.get(name)
+        return default()
     
     @property
     def get_credential_manager(self) -> CredentialManager:
@@ -76,7 +302,19 @@ class AppCore:
         return self.credential_manager
     
     @property
-    def browser_automation(self) -> BrowserAutomation:
+    def credential_manager(self) -> Optional[CredentialManager]:
+        """Credential manager, or None before initialization."""
+        return self._credential_manager
+    
+    @credential_manager.setter
+    def credential_manager(self, value: Optional[CredentialManager]) -> None:
+        self._credential_manager = value
+        # Forwarders call straight through _cm; until a manager is set every
+        # attribute access on it raises CredentialError
+        self._cm = value if value is not None else _MISSING_CREDENTIAL_MANAGER
+    
+    @property
+    def browser_automation(self) -> "BrowserAutomation":
         """
         Lazily instantiate and return the browser automation instance.
 
@@ -86,68 +324,97 @@ class AppCore:
         Raises:
             BrowserError: If config_manager is not initialized
         """
-        if self._browser_automation is None:
+        browser_automation = self._browser_automation
+        if browser_automation is None:
             # Prefer container if it has a browser_automation, else create new
-            if getattr(self, "container", None) is not None and self.container.has("browser_automation"):
-                self._browser_automation = self.container.get("browser_automation")
-            else:
-                if self.config_manager is None:
-                    raise BrowserError("Config manager not initialized for browser automation")
-                self._browser_automation = BrowserAutomation(self.config_manager)
-        return self._browser_automation
+            browser_automation = self._browser_automation = self._resolve(
+                "browser_automation", self._create_browser_automation
+            )
+        return browser_automation
+    
+    def _create_browser_automation(self) -> "BrowserAutomation":
+        """
+        Create a browser automation instance from this core's configuration.
+        
+        Returns:
+            Browser automation instance
+            
+        Raises:
+            BrowserError: If config_manager is not initialized
+        """
+        if self.config_manager is None:
+            raise BrowserError("Config manager not initialized for browser automation")
+        from ..core.browser_automation import BrowserAutomation
+        return BrowserAutomation(self.config_manager)
 
     @browser_automation.setter
-    def browser_automation(self, value: BrowserAutomation) -> None:
+    def browser_automation(self, value: "BrowserAutomation") -> None:
         self._browser_automation = value
     
-    async def initialize_async(self, master_password: Optional[str] = None) -> bool:
+    def _init_core_sync(self, master_password: Optional[str] = None,
+                        credential_manager: Optional[CredentialManager] = None) -> None:
+        """
+        Set up the configuration and credential manager shared by both initializers.
+        
+        Args:
+            master_password: Master password for credential encryption
+            credential_manager: Already unlocked credential manager to reuse
+                instead of deriving the key again
+        """
+        # Ensure config_manager is set
+        if self.config_manager is None:
+            self.config_manager = ConfigManager()
+        # Initialize credential manager (key derivation is deliberately slow,
+        # so reuse a caller's unlocked manager when one is supplied)
+        if credential_manager is not None:
+            self.credential_manager = credential_manager
+        else:
+            self.credential_manager = CredentialManager(self.config_manager, master_password)
+        self.is_initialized = True
+    
+    async def initialize_async(self, master_password: Optional[str] = None,
+                               credential_manager: Optional[CredentialManager] = None) -> bool:
         """
         Initialize application core components asynchronously.
         
         Args:
             master_password: Master password for credential encryption
+            credential_manager: Already unlocked credential manager to reuse
+                instead of deriving the key again
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Ensure config_manager is set
-            if self.config_manager is None:
-                self.config_manager = ConfigManager()
-            # Initialize credential manager
-            self.credential_manager = CredentialManager(self.config_manager, master_password)
+            self._init_core_sync(master_password, credential_manager)
             
-            # Instantiate and initialize browser automation
-            self._browser_automation = BrowserAutomation(self.config_manager)
-            await self._browser_automation.initialize()
+            # Start the browser (the property reuses a container-provided instance)
+            await self.browser_automation.initialize()
             
-            self.is_initialized = True
             self.logger.info("Application core initialized asynchronously")
             return True
         except Exception as e:
+            self.is_initialized = False
             self.logger.error(f"Error initializing application core asynchronously: {e}")
             return False
     
     @error_handler.handle
-    def initialize(self, master_password: Optional[str] = None) -> bool:
+    def initialize(self, master_password: Optional[str] = None,
+                   credential_manager: Optional[CredentialManager] = None) -> bool:
         """
         Initialize application core components (synchronous wrapper).
         
         Args:
             master_password: Master password for credential encryption
+            credential_manager: Already unlocked credential manager to reuse
+                instead of deriving the key again
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Ensure config_manager is set
-            if self.config_manager is None:
-                self.config_manager = ConfigManager()
-            # Initialize credential manager
-            self.credential_manager = CredentialManager(self.config_manager, master_password)
-            
             # Do not instantiate browser automation here (lazy loading)
-            self.is_initialized = True
+            self._init_core_sync(master_password, credential_manager)
             self.logger.info("Application core initialized")
             return True
         except Exception as e:
@@ -186,10 +453,8 @@ class AppCore:
             True if successful, False otherwise
         """
         self.logger.debug(f"add_website ENTRY: url={url}, username={username}, has_bonus={has_bonus}, google_login={google_login}")
-        credential_manager = self.get_credential_manager
-        
         self.logger.debug("add_website: calling credential_manager.add_website")
-        result = credential_manager.add_website(url, username, password, has_bonus, notes, google_login=google_login)
+        result = self._cm.add_website(url, username, password, has_bonus, notes, google_login=google_login)
         self.logger.debug(f"add_website EXIT: result={result}")
         return result
     
@@ -204,10 +469,8 @@ class AppCore:
         Returns:
             True if successful, False otherwise
         """
-        credential_manager = self.get_credential_manager
-        return credential_manager.remove_website(url)
+        return self._cm.remove_website(url)
     
-    @error_handler.handle
     def get_website(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Get website credentials.
@@ -218,10 +481,8 @@ class AppCore:
         Returns:
             Website credentials or None if not found
         """
-        credential_manager = self.get_credential_manager
-        return credential_manager.get_website(url)
+        return self._cm.get_website(url)
     
-    @error_handler.handle
     def get_all_websites(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all website credentials.
@@ -229,10 +490,8 @@ class AppCore:
         Returns:
             All website credentials
         """
-        credential_manager = self.get_credential_manager
-        return credential_manager.get_all_websites()
+        return self._cm.get_all_websites()
     
-    @error_handler.handle
     def get_bonus_websites(self) -> Dict[str, Dict[str, Any]]:
         """
         Get websites with bonus flag.
@@ -240,34 +499,175 @@ class AppCore:
         Returns:
             Website credentials with has_bonus=True
         """
-        credential_manager = self.get_credential_manager
-        return credential_manager.get_bonus_websites()
+        return self._cm.get_bonus_websites()
     
     def _get_event_loop(self) -> asyncio.AbstractEventLoop:
         """
-        Get or create an event loop for async operations.
+        Get the background event loop, starting it on first use.
+        
+        Never touches asyncio.get_event_loop() or the calling thread's loop,
+        so it works the same from the GUI thread, worker threads and tests.
         
         Returns:
             Event loop
         """
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            return loop
-        except RuntimeError:
-            # No event loop in current thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # Fast path: the loop is already running, no lock needed to read it
+        loop = self._bg_loop
+        if loop is not None and not loop.is_closed():
             return loop
+        
+        with self._bg_lock:
+            if self._bg_loop is None or self._bg_loop.is_closed():
+                # Build the loop directly rather than installing a global policy
+                loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+                # Surface slow callbacks and never-awaited coroutines while developing
+                if self.config_manager.get("asyncio_debug", False):
+                    loop.set_debug(True)
+                thread = threading.Thread(
+                    target=self._run_event_loop, args=(loop,),
+                    name="AppCoreEventLoop", daemon=True
+                )
+                thread.start()
+                self._bg_loop = loop
+                self._bg_thread = thread
+            return self._bg_loop
+    
+    @staticmethod
+    def _run_event_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Run the background event loop until it is stopped, then close it.
+        
+        Args:
+            loop: Event loop owned by the background thread
+        """
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking function in the shared worker pool.
+        
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            
+        Returns:
+            Result of func
+        """
+        with self._bg_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="AppCoreWorker")
+            executor = self._executor
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    
+    def _stop_event_loop(self) -> None:
+        """Stop the background event loop and worker pool, and wait for the loop thread to exit."""
+        with self._bg_lock:
+            loop, thread = self._bg_loop, self._bg_thread
+            executor = self._executor
+            self._bg_loop = None
+            self._bg_thread = None
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        # The loop cannot wait for itself, it will stop once the caller returns
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+    
+    def _bind_status_callback(self, status_callback: Optional[Callable[[Dict[str, Any]], None]]
+                              ) -> Optional[Callable[[Dict[str, Any]], None]]:
+        """
+        Wrap a status callback so calling it never runs GUI code inline in a login task.
+        
+        With a callback_dispatcher set (e.g. a Tk "after" hook), updates are
+        handed to it; otherwise they are queued on the running loop. Either
+        way the login coroutine continues immediately. Each update is a copy,
+        since the browser code keeps mutating one status dictionary.
+        
+        Must be called from a coroutine.
+        
+        Args:
+            status_callback: Caller's callback, or None
+            
+        Returns:
+            Dispatching callback, or None if no callback was given
+        """
+        if status_callback is None:
+            return None
+        dispatch = self.callback_dispatcher
+        if dispatch is not None:
+            return lambda status: dispatch(status_callback, dict(status))
+        loop = asyncio.get_running_loop()
+        return lambda status: loop.call_soon_threadsafe(status_callback, dict(status))
+    
+    async def _precheck_google_oauth(self, url: str) -> bool:
+        """
+        Run the Google OAuth precheck for a URL, reusing recent results.
+
+        Results are cached per page (query and fragment are ignored) for
+        "oauth_precheck_ttl" seconds, up to _OAUTH_CACHE_SIZE pages, and
+        concurrent callers for the same page wait for a single scan instead
+        of each fetching it. Failed fetches are not cached.
+
+        Args:
+            url: Website URL
+
+        Returns:
+            True if Google OAuth was detected, False otherwise
+        """
+        parts = urlparse(url)
+        key = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        ttl = float(self.config_manager.get("oauth_precheck_ttl", 3600))
+        cached = self._oauth_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            self._oauth_cache.move_to_end(key)
+            return cached[1]
+
+        # Callers on other loops (the UI runs logins on loops of its own)
+        # start their own scan rather than awaiting a foreign future
+        scan_key = (asyncio.get_running_loop(), key)
+        scan = self._oauth_scans.get(scan_key)
+        if scan is None:
+            scan = asyncio.ensure_future(self._scan_google_oauth(url, key))
+            self._oauth_scans[scan_key] = scan
+            scan.add_done_callback(lambda _: self._oauth_scans.pop(scan_key, None))
+        # Shield so a cancelled caller does not cancel the scan others wait on
+        return await asyncio.shield(scan)
+    
+    async def _scan_google_oauth(self, url: str, key: str) -> bool:
+        """
+        Scan a page for Google OAuth and cache the result.
+        
+        Args:
+            url: Website URL
+            key: Cache key of the page
+            
+        Returns:
+            True if Google OAuth was detected, False otherwise
+        """
+        from ..core.browser_automation import _scan_login_page
+        result = await self._run_blocking(_scan_login_page, url, self.logger)
+        if result is None:
+            return False
+        self._oauth_cache[key] = (time.monotonic(), result)
+        self._oauth_cache.move_to_end(key)
+        while len(self._oauth_cache) > _OAUTH_CACHE_SIZE:
+            self._oauth_cache.popitem(last=False)
+        return result
     
     async def login_to_website_async(self, url: str,
                                    status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
                                    google_login_method: Optional[str] = None,
                                    force_prompt: bool = False,
                                    prompt_google_login_method: Optional[Callable[[str], str]] = None,
-                                   wait_for_manual_login_confirmation: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+                                   wait_for_manual_login_confirmation: Optional[Callable[[str], None]] = None,
+                                   browser_automation: Optional["BrowserAutomation"] = None) -> Dict[str, Any]:
         """
         Login to a website asynchronously.
 
@@ -277,23 +677,84 @@ class AppCore:
             google_login_method: "playwright" or "system_browser" for Google login, or None
             force_prompt: Force prompt for login method selection
             prompt_google_login_method: Optional callback to prompt user for Google login method
+            browser_automation: Browser session to log in with instead of the shared one
 
         Returns:
             Status dictionary with login result
         """
+        # Piggy-back on an identical login that is already running on this
+        # loop instead of starting a second browser session for the site.
+        # Only calls with the same method, session and callbacks are shared,
+        # so no caller's settings or status updates are dropped
+        loop = asyncio.get_running_loop()
+        key = (_normalize_url(url), google_login_method)
+        params = (force_prompt, status_callback, prompt_google_login_method,
+                  wait_for_manual_login_confirmation, browser_automation)
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.params == params and inflight.task.get_loop() is loop:
+            self.logger.info(f"Login to {url} already in progress, waiting for its result.")
+        else:
+            inflight = _InflightLogin(asyncio.ensure_future(self._login_to_website(
+                url, status_callback, google_login_method, force_prompt,
+                prompt_google_login_method, wait_for_manual_login_confirmation,
+                browser_automation
+            )), params)
+            self._inflight[key] = inflight
+            inflight.task.add_done_callback(lambda _: self._drop_inflight(key, inflight))
+        
+        inflight.callers += 1
         try:
-            # Always perform Google login detection scan before any browser automation
-            self.logger.info(f"Performing Google login detection scan for {url} before browser automation.")
-            if status_callback:
-                status_callback({
-                    "url": url,
-                    "stage": "precheck_google_oauth",
-                    "success": None,
-                    "message": "Performing Google login detection scan before browser automation."
-                })
-            has_google_oauth = precheck_google_oauth(url, logger=self.logger)
+            # Shield so a cancelled caller does not cancel the login for the others
+            return dict(await asyncio.shield(inflight.task))
+        finally:
+            inflight.callers -= 1
+            if not inflight.callers and not inflight.task.done():
+                # The last caller gave up, so stop the login and let it unwind
+                inflight.task.cancel()
+                await asyncio.wait([inflight.task])
+    
+    def _drop_inflight(self, key: Tuple[str, Optional[str]], inflight: "_InflightLogin") -> None:
+        """
+        Forget a finished in-flight login, unless a newer one took its key.
+        
+        Args:
+            key: Normalized URL and login method the login was registered under
+            inflight: The finished login
+        """
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+    
+    async def _login_to_website(self, url: str,
+                                status_callback: Optional[Callable[[Dict[str, Any]], None]],
+                                google_login_method: Optional[str],
+                                force_prompt: bool,
+                                prompt_google_login_method: Optional[Callable[[str], str]],
+                                wait_for_manual_login_confirmation: Optional[Callable[[str], None]],
+                                browser_automation: Optional["BrowserAutomation"]) -> Dict[str, Any]:
+        """
+        Run one login; see login_to_website_async for the arguments.
+        
+        Returns:
+            Status dictionary with login result
+        """
+        status_callback = self._bind_status_callback(status_callback)
+        try:
+            # Scan for Google login before any browser automation; the result only
+            # matters when the caller has not already chosen a login method
+            has_google_oauth = False
+            if not google_login_method:
+                self.logger.info(f"Performing Google login detection scan for {url} before browser automation.")
+                if status_callback:
+                    status_callback({
+                        "url": url,
+                        "stage": "precheck_google_oauth",
+                        "success": None,
+                        "message": "Performing Google login detection scan before browser automation."
+                    })
+                has_google_oauth = await self._precheck_google_oauth(url)
 
-            browser_automation = self.browser_automation
+            if browser_automation is None:
+                browser_automation = self.browser_automation
             credential_manager = self.get_credential_manager
 
             # Get website credentials
@@ -335,15 +796,14 @@ class AppCore:
                         status_callback(error_status)
                     return error_status
 
-            # If Google login is not detected, proceed with default (form) automation
-            if not has_google_oauth and not google_login_method:
-                google_login_method = None  # Will default to form login in browser_automation
+            # Without Google login and a chosen method, google_login_method stays
+            # None and browser_automation falls back to form login
 
             # If manual browser is chosen, open system browser and wait for user confirmation
             if google_login_method == "system_browser" and wait_for_manual_login_confirmation is not None:
                 # Open the system browser for manual login
                 import webbrowser
-                webbrowser.open(url)
+                await self._run_blocking(webbrowser.open, url)
                 if status_callback:
                     status_callback({
                         "url": url,
@@ -354,11 +814,13 @@ class AppCore:
                 # Wait for user confirmation before proceeding
                 wait_for_manual_login_confirmation(url)
 
-            # Run login coroutine (for automation or after manual confirmation)
+            # Run login coroutine (for automation or after manual confirmation);
+            # the precheck verdict is passed on so the page is not scanned again
             status = await browser_automation.login_to_website(
                 url, credentials["username"], credentials["password"], status_callback,
                 google_login_method=google_login_method,
-                force_prompt=force_prompt
+                force_prompt=force_prompt,
+                has_google_oauth=has_google_oauth
             )
 
             # Update last login timestamp
@@ -378,13 +840,86 @@ class AppCore:
                 status_callback(error_status)
             return error_status
     
+    async def login_to_websites_async(self, urls: List[str],
+                                      status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                      max_concurrency: Optional[int] = None,
+                                      **kwargs: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Login to several websites concurrently.
+
+        All logins share one browser process; each site gets its own context
+        and page so their navigation overlaps instead of running back to back.
+
+        Args:
+            urls: Website URLs
+            status_callback: Callback function for status updates
+            max_concurrency: Maximum number of logins in flight at once
+                (defaults to the "max_concurrent_logins" setting)
+            **kwargs: Passed through to login_to_website_async
+
+        Returns:
+            Status dictionary per URL
+        """
+        if max_concurrency is None:
+            max_concurrency = int(self.config_manager.get("max_concurrent_logins", 4))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        browser_automation = self.browser_automation
+        notify = self._bind_status_callback(status_callback)
+
+        async def login_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    session = await browser_automation.new_session()
+                except Exception as e:
+                    self.logger.error(f"Error opening browser session for {url}: {e}")
+                    error_status = {
+                        "url": url,
+                        "stage": "error",
+                        "success": False,
+                        "message": f"Error: {str(e)}"
+                    }
+                    if notify:
+                        notify(error_status)
+                    return error_status
+                try:
+                    return await self.login_to_website_async(
+                        url, status_callback, browser_automation=session, **kwargs
+                    )
+                finally:
+                    await session.close()
+
+        # Launch the browser once, with a context ready for each session that
+        # can run at once, before the sessions race to use it
+        await browser_automation.prewarm(min(max(1, max_concurrency), len(urls)))
+        results = await asyncio.gather(*(login_one(url) for url in urls))
+        return dict(zip(urls, results))
+    
+    @error_handler.handle
+    def login_to_websites(self, urls: List[str],
+                          status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                          max_concurrency: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Login to several websites concurrently, blocking until all finish.
+
+        Args:
+            urls: Website URLs
+            status_callback: Callback function for status updates
+            max_concurrency: Maximum number of logins in flight at once
+
+        Returns:
+            Status dictionary per URL
+        """
+        return self.run_async(
+            self.login_to_websites_async(urls, status_callback, max_concurrency)
+        )
+    
     @error_handler.handle
     def login_to_website(self, url: str, 
                         status_callback: Optional[Callable[[Dict[str, Any]], None]] = None, 
                         google_login_method: Optional[str] = None, 
                         force_prompt: bool = False) -> Optional[str]:
         """
-        Login to a website in a separate thread.
+        Start a login to a website as a task on the background event loop.
 
         Args:
             url: Website URL
@@ -404,38 +939,37 @@ class AppCore:
                 self.logger.error(f"No credentials found for {url}")
                 return None
 
-            # Generate task ID
-            task_id = str(uuid.uuid4())
+            # Task IDs are only keys into login_tasks, so a process-local
+            # counter is enough; next() on itertools.count is atomic
+            task_id = f"t{next(self._task_counter)}"
 
-            # Create login task
-            self.login_tasks[task_id] = {
-                "url": url,
-                "status": "starting",
-                "thread": None
-            }
+            # Create login task before scheduling so the coroutine can update it
+            with self._tasks_lock:
+                self.login_tasks[task_id] = LoginTask(url, "starting")
 
-            # Start login thread
-            thread = threading.Thread(
-                target=self._run_login_task,
-                args=(task_id, url, credentials["username"], credentials["password"], 
-                     status_callback, google_login_method, force_prompt)
+            # Schedule login coroutine (no thread per login)
+            future = asyncio.run_coroutine_threadsafe(
+                self._run_login_task(
+                    task_id, url, credentials["username"], credentials["password"],
+                    status_callback, google_login_method, force_prompt
+                ),
+                self._get_event_loop()
             )
-            thread.daemon = True
-            thread.start()
 
-            self.login_tasks[task_id]["thread"] = thread
+            with self._tasks_lock:
+                self.login_tasks[task_id].future = future
 
             return task_id
         except Exception as e:
             self.logger.error(f"Error starting login task: {e}")
             return None
     
-    def _run_login_task(self, task_id: str, url: str, username: str, password: str, 
-                       status_callback: Optional[Callable[[Dict[str, Any]], None]], 
-                       google_login_method: Optional[str] = None, 
-                       force_prompt: bool = False) -> None:
+    async def _run_login_task(self, task_id: str, url: str, username: str, password: str, 
+                             status_callback: Optional[Callable[[Dict[str, Any]], None]], 
+                             google_login_method: Optional[str] = None, 
+                             force_prompt: bool = False) -> Optional[Dict[str, Any]]:
         """
-        Run login task in a separate thread.
+        Run a login task on the background event loop.
 
         Args:
             task_id: Task ID
@@ -445,33 +979,38 @@ class AppCore:
             status_callback: Callback function for status updates
             google_login_method: "playwright" or "system_browser" for Google login, or None
             force_prompt: Force prompt for login method selection
-        """
-        # Create event loop for async operations
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
 
+        Returns:
+            Status dictionary with login result, or None if the login raised
+        """
+        run = asyncio.current_task()
+        self._login_runs.add(run)
+        run.add_done_callback(self._login_runs.discard)
+        status_callback = self._bind_status_callback(status_callback)
         try:
             # Use property to ensure lazy instantiation
             browser_automation = self.browser_automation
 
             # Run login coroutine
-            status = loop.run_until_complete(
-                browser_automation.login_to_website(
-                    url, username, password, status_callback,
-                    google_login_method=google_login_method,
-                    force_prompt=force_prompt
-                )
+            status = await browser_automation.login_to_website(
+                url, username, password, status_callback,
+                google_login_method=google_login_method,
+                force_prompt=force_prompt
             )
 
             # Update task status
-            self.login_tasks[task_id]["status"] = status["stage"]
+            with self._tasks_lock:
+                self.login_tasks[task_id].status = status["stage"]
 
             # Update last login timestamp
             if status["success"] is not None and self.credential_manager:
                 self.credential_manager.update_last_login(url, status["success"])
 
+            return status
         except Exception as e:
             self.logger.error(f"Error in login task: {e}")
+            with self._tasks_lock:
+                self.login_tasks[task_id].status = "error"
             if status_callback:
                 status_callback({
                     "url": url,
@@ -479,9 +1018,7 @@ class AppCore:
                     "success": False,
                     "message": f"Error: {str(e)}"
                 })
-        finally:
-            # Close event loop
-            loop.close()
+            return None
     
     @error_handler.handle
     def get_login_status(self, task_id: str) -> Optional[Dict[str, Any]]:
@@ -494,7 +1031,16 @@ class AppCore:
         Returns:
             Task status or None if not found
         """
-        return self.login_tasks.get(task_id)
+        with self._tasks_lock:
+            task = self.login_tasks.get(task_id)
+            if task is None:
+                return None
+            
+            # A task that never reported back was cancelled or crashed
+            future = task.future
+            if future is not None and future.done() and task.status == "starting":
+                task.status = "cancelled" if future.cancelled() else "error"
+            return task.to_dict()
     
     async def wait_for_user_action_async(self, timeout: int = 300) -> bool:
         """
@@ -530,70 +1076,120 @@ class AppCore:
         try:
             browser_automation = self.browser_automation
             
-            # Create event loop for async operations
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # Run wait coroutine
-                result = loop.run_until_complete(
-                    browser_automation.wait_for_user_action(timeout)
-                )
-                return result
-            finally:
-                # Close event loop
-                loop.close()
+            # Run wait coroutine
+            return self.run_async(browser_automation.wait_for_user_action(timeout))
         except Exception as e:
             self.logger.error(f"Error waiting for user action: {e}")
             return False
     
-    async def close_async(self) -> None:
-        """Close application core and release resources asynchronously."""
-        if self.browser_automation:
+    def _clear_sensitive_data(self) -> None:
+        """Drop decrypted credentials held by the credential manager."""
+        if self.credential_manager:
+            self.credential_manager.clear_memory()
+    
+    async def _cancel_own_tasks(self) -> None:
+        """
+        Cancel the logins and precheck scans AppCore started on the current loop and wait for them.
+        
+        Other tasks on the loop are left alone; Playwright's driver connection
+        runs as one, and the browser cannot be closed without it.
+        """
+        loop = asyncio.get_running_loop()
+        with self._tasks_lock:
+            futures = [task.future for task in self.login_tasks.values() if task.future is not None]
+        # Futures from run_coroutine_threadsafe pass the cancellation on to their task
+        for future in futures:
+            future.cancel()
+        tasks = [
+            task for task in itertools.chain(
+                list(self._login_runs),
+                [inflight.task for inflight in list(self._inflight.values())],
+                list(self._oauth_scans.values())
+            )
+            if task.get_loop() is loop
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _release(self, browser_automation: "BrowserAutomation") -> None:
+        """
+        Close the browser and clear credentials from memory at the same time.
+        
+        Only call this once the logins are stopped, since they need both.
+        
+        Args:
+            browser_automation: Browser to close
+        """
+        async def close_browser() -> None:
             try:
-                # Close browser
-                await self.browser_automation.close()
+                await browser_automation.close()
             except Exception as e:
                 self.logger.error(f"Error closing browser: {e}")
         
-        # Clear sensitive data
-        if self.credential_manager:
-            self.credential_manager.clear_memory()
-        
+        # Wiping memory can take a while for large stores, so it runs in the
+        # worker pool while the loop drives the browser shutdown
+        await asyncio.gather(close_browser(), self._run_blocking(self._clear_sensitive_data))
+    
+    async def close_async(self) -> None:
+        """Close application core and release resources asynchronously."""
+        # Use the backing field so closing never creates a browser just to close it
+        browser_automation = self._browser_automation
+        released = False
+        try:
+            # Running logins need the browser and the credentials, so they
+            # are stopped before either is released
+            loop = self._bg_loop
+            if loop is not None and not loop.is_closed():
+                if loop is asyncio.get_running_loop():
+                    await self._cancel_own_tasks()
+                else:
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._cancel_own_tasks(), loop))
+            if browser_automation:
+                await self._release(browser_automation)
+                released = True
+        finally:
+            self._stop_event_loop()
+            if not released:
+                # Also reached when the close failed or was cancelled
+                self._clear_sensitive_data()
         self.logger.info("Application core closed asynchronously")
     
     @error_handler.handle
     def close(self) -> None:
         """Close application core and release resources."""
-        if self.browser_automation:
-            # Create event loop for async operations
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # Close browser
-                loop.run_until_complete(self.browser_automation.close())
-            except Exception as e:
-                self.logger.error(f"Error closing browser: {e}")
-            finally:
-                # Close event loop
-                loop.close()
-        
-        # Clear sensitive data
-        if self.credential_manager:
-            self.credential_manager.clear_memory()
-        
+        browser_automation = self._browser_automation
+        released = False
+        try:
+            # Running logins need the browser and the credentials, so they
+            # are stopped before either is released
+            if self._bg_loop is not None and not self._bg_loop.is_closed():
+                self.run_async(self._cancel_own_tasks())
+            if browser_automation:
+                self.run_async(self._release(browser_automation))
+                released = True
+        finally:
+            self._stop_event_loop()
+            if not released:
+                self._clear_sensitive_data()
         self.logger.info("Application core closed")
     
     def run_async(self, coroutine: Awaitable[Any]) -> Any:
         """
-        Run an async coroutine from synchronous code.
+        Run an async coroutine on the background loop from synchronous code.
         
         Args:
             coroutine: Async coroutine to run
             
         Returns:
             Result of the coroutine
+            
+        Raises:
+            RuntimeError: If called from the background loop itself, which
+                would deadlock
         """
         loop = self._get_event_loop()
-        return loop.run_until_complete(coroutine)
+        if threading.current_thread() is self._bg_thread:
+            coroutine.close()
+            raise RuntimeError("run_async cannot block the event loop it runs on")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
@@ -4,133 +4,275 @@ Handles browser control and login automation using Playwright.
 """
 
 import asyncio
+import importlib.util
 import re
 import time
 import uuid
-from typing import Dict, Optional, Any, Callable, List, Tuple, Union, Type
+from functools import lru_cache
+from typing import Awaitable, Dict, Iterator, Optional, Any, Callable, List, Tuple, Union, Type
 from urllib.parse import urlparse
 
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, ElementHandle, Frame, Locator, Playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import webbrowser
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Optional; precheck falls back to BeautifulSoup
+    LexborHTMLParser = None
+
 from ..utils.logger import Logger
 from ..utils.config_manager import ConfigManager
 from ..utils.exceptions import BrowserError, LoginError, NetworkError
 from ..utils.error_handler import ErrorHandler
 error_handler = ErrorHandler(Logger("BrowserAutomation"))
 
+# Precheck fetches share one session so repeated prechecks (batch logins) reuse
+# kept-alive connections instead of a new TCP/TLS handshake per page
+_PRECHECK_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/113.0.0.0 Safari/537.36"
+}
+_PRECHECK_SESSION = requests.Session()
+for _scheme in ("https://", "http://"):
+    _PRECHECK_SESSION.mount(_scheme, HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+# Streamed precheck bodies are read in chunks and scanned as they arrive for
+# the OAuth endpoint, which settles the result without parsing wherever it
+# appears. Sign-in labels are left to the full scan, since the same words also
+# turn up in titles, meta tags, scripts and comments
+_PRECHECK_CHUNK_SIZE = 16384
+_PRECHECK_EARLY_RE = re.compile(rb"accounts\.google\.com/o/oauth2", re.IGNORECASE)
+_PRECHECK_EARLY_OVERLAP = 64
+_PRECHECK_GOOGLE_RE = re.compile(rb"google", re.IGNORECASE)
+
+# Tags the precheck inspects: links and forms for OAuth URLs, and buttons,
+# links, divs and spans for Google sign-in text and attributes
+_PRECHECK_TAGS = ["a", "form", "button", "div", "span"]
+
+# BeautifulSoup fallback: only build the tags the precheck looks at, with lxml's
+# C parser when it is installed
+_PRECHECK_STRAINER = SoupStrainer(_PRECHECK_TAGS)
+_PRECHECK_BS4_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+# Google sign-in phrases looked for in element text, aria-label and title,
+# compiled into one alternation so each string is scanned once in C
+_GOOGLE_TEXT_PATTERNS = (
+    "sign in with google",
+    "sign in using google",
+    "continue with google",
+    "login with google",
+    "log in with google",
+    "google sign in",
+    "google login",
+)
+_GOOGLE_TEXT_RE = re.compile("|".join(map(re.escape, _GOOGLE_TEXT_PATTERNS)))
+
+def _iter_precheck_elements(html: str) -> Iterator[Tuple[str, Dict[str, str], str]]:
+    """
+    Parse a login page and walk the elements precheck_google_oauth inspects, once.
+
+    Uses selectolax's C lexbor parser when it is installed and BeautifulSoup otherwise
+    (lxml if available, restricted to the inspected tags); both yield the same
+    elements so the checks do not depend on the backend.
+
+    Args:
+        html: Page HTML
+
+    Yields:
+        (tag name, attributes, lowercased text) in document order; the class list
+        is joined into one string and forms have no text
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        for node in tree.css(", ".join(_PRECHECK_TAGS)):
+            # Valueless attributes come back as None
+            attrs = {key: value or "" for key, value in node.attributes.items()}
+            text = "" if node.tag == "form" else node.text(separator=" ", strip=True).lower()
+            yield node.tag, attrs, text
+        return
+
+    soup = BeautifulSoup(html, _PRECHECK_BS4_PARSER, parse_only=_PRECHECK_STRAINER)
+    for tag in soup.find_all(_PRECHECK_TAGS):
+        attrs = dict(tag.attrs)
+        if "class" in attrs:
+            attrs["class"] = " ".join(tag.get("class", []))
+        text = "" if tag.name == "form" else tag.get_text(separator=" ", strip=True).lower()
+        yield tag.name, attrs, text
+
 def precheck_google_oauth(url: str, logger: Optional[Logger] = None) -> bool:
     """
-    Fetch the login page and scan for Google OAuth options using requests and BeautifulSoup.
+    Fetch the login page and scan for Google OAuth options using requests and an HTML parser
+    (selectolax's lexbor backend when installed, else BeautifulSoup).
     Returns True if Google OAuth is detected, else False.
     Enhanced to be robust to different page structures and element variations.
+
+    Results are not cached here; AppCore keeps recent results per page.
+    """
+    return bool(_scan_login_page(url, logger))
+
+def _scan_login_page(url: str, logger: Optional[Logger] = None) -> Optional[bool]:
+    """
+    Fetch a login page and scan it for Google OAuth options (uncached precheck).
+
+    Args:
+        url: Login page URL
+        logger: Optional logger for diagnostics
+
+    Returns:
+        True or False, or None if the page could not be fetched or scanned
     """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                          "AppleWebKit/537.36 (KHTML, like Gecko) "
-                          "Chrome/113.0.0.0 Safari/537.36"
-        }
-        resp = requests.get(url, headers=headers, timeout=10)
+        # Stream so a verdict from the headers never downloads the body
+        resp = _PRECHECK_SESSION.get(url, headers=_PRECHECK_HEADERS, timeout=10, stream=True)
+    except Exception as e:
+        if logger:
+            logger.error(f"[Precheck] Error during Google OAuth pre-check: {e}")
+        return None
+    try:
+        return _scan_login_response(url, resp, logger)
+    finally:
+        resp.close()
+
+_GOOGLE_ACCOUNTS_HOST = "accounts.google.com"
+# The <URI> targets of a Link header
+_LINK_TARGET_RE = re.compile(r"<([^>]*)>")
+
+def _google_oauth_in_headers(resp: requests.Response) -> bool:
+    """
+    Check a precheck response for Google sign-in before reading its body.
+
+    Args:
+        resp: Response to the login page request, with its redirect history
+
+    Returns:
+        True if the page redirected to Google accounts or tells the browser
+        to preconnect to it
+    """
+    # Compare hosts so a Google URL in a query string or path doesn't count
+    for hop in resp.history:
+        if _netloc(hop.headers.get("Location", "")) == _GOOGLE_ACCOUNTS_HOST:
+            return True
+    if _netloc(resp.url or "") == _GOOGLE_ACCOUNTS_HOST:
+        return True
+    return any(
+        _netloc(target) == _GOOGLE_ACCOUNTS_HOST
+        for target in _LINK_TARGET_RE.findall(resp.headers.get("Link", ""))
+    )
+
+def _scan_login_response(url: str, resp: requests.Response, logger: Optional[Logger] = None) -> Optional[bool]:
+    """
+    Scan a fetched login page for Google OAuth options.
+
+    Args:
+        url: Login page URL
+        resp: Streamed response for the page
+        logger: Optional logger for diagnostics
+
+    Returns:
+        True or False, or None if the page could not be fetched or scanned
+    """
+    try:
+        if _google_oauth_in_headers(resp):
+            if logger:
+                logger.info("[Precheck] Found Google accounts redirect or preconnect in response headers.")
+            return True
+
         if resp.status_code != 200:
             if logger:
                 logger.warning(f"[Precheck] Could not fetch login page (status {resp.status_code}) for {url}")
-            return False
+            return None
+
+        # Read the body in chunks and stop as soon as it names the OAuth
+        # endpoint, without decoding or parsing the rest
+        body = bytearray()
+        for chunk in resp.iter_content(_PRECHECK_CHUNK_SIZE):
+            # Re-scan a little of the previous chunk for matches split across chunks
+            start = max(0, len(body) - _PRECHECK_EARLY_OVERLAP)
+            body += chunk
+            match = _PRECHECK_EARLY_RE.search(body, start)
+            if match:
+                if logger:
+                    logger.info(f"[Precheck] Found '{match.group(0).decode(errors='replace')}' in login page source.")
+                return True
 
-        # Log the first 500 characters of the fetched HTML for diagnostics
+        # Log the start of the fetched HTML for diagnostics (without decoding the whole body)
         if logger:
-            logger.info(f"[Precheck][DIAG] First 500 chars of fetched HTML for {url}:\n{resp.text[:500]}")
-
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Log all <a> and <form> href/action attributes containing "google"
-        google_links = []
-        for a in soup.find_all("a", href=True):
-            if "google" in a["href"]:
-                google_links.append(a["href"])
-        for form in soup.find_all("form", action=True):
-            if "google" in form["action"]:
-                google_links.append(form["action"])
-        if logger and google_links:
-            logger.info(f"[Precheck][DIAG] Found <a>/<form> href/action(s) containing 'google': {google_links}")
+            head = bytes(body[:500]).decode(resp.encoding or "utf-8", errors="replace")
+            logger.info(f"[Precheck][DIAG] First 500 chars of fetched HTML for {url}:\n{head}")
 
-        # Check for hrefs containing Google OAuth (original strict check)
-        for a in soup.find_all("a", href=True):
-            if "accounts.google.com/o/oauth2" in a["href"]:
-                if logger:
-                    logger.info("[Precheck] Found Google OAuth href in login page.")
-                return True
+        # Every check below needs "google" somewhere in the markup, so most pages
+        # are settled on the raw bytes without decoding or parsing them
+        if not _PRECHECK_GOOGLE_RE.search(body):
+            if logger:
+                logger.info("[Precheck][DIAG] No 'google' in page source; skipping HTML parse.")
+            return False
+        html = body.decode(resp.encoding or "utf-8", errors="replace")
+
+        # Diagnostics are only collected when they will be logged
+        google_links: Optional[List[str]] = [] if logger else None
+        found_google_texts: Optional[List[Dict[str, str]]] = [] if logger else None
+
+        # One walk over the page; every check returns on its first hit
+        for name, attrs, text in _iter_precheck_elements(html):
+            if name == "a" or name == "form":
+                # Check for hrefs / form actions pointing to Google OAuth (original strict check)
+                link = attrs.get("href" if name == "a" else "action", "")
+                if "accounts.google.com/o/oauth2" in link:
+                    if logger:
+                        kind = "href" if name == "a" else "form action"
+                        logger.info(f"[Precheck] Found Google OAuth {kind} in login page.")
+                    return True
+                if google_links is not None and "google" in link:
+                    google_links.append(link)
+                if name == "form":
+                    continue
 
-        # Check for <form> actions pointing to Google OAuth (original strict check)
-        for form in soup.find_all("form", action=True):
-            if "accounts.google.com/o/oauth2" in form["action"]:
+            # Check for buttons/links/divs/spans with Google sign-in text, aria-label, or title
+            aria_label = attrs.get("aria-label", "").lower()
+            title = attrs.get("title", "").lower()
+            match = (
+                _GOOGLE_TEXT_RE.search(text)
+                or _GOOGLE_TEXT_RE.search(aria_label)
+                or _GOOGLE_TEXT_RE.search(title)
+            )
+            if match:
                 if logger:
-                    logger.info("[Precheck] Found Google OAuth form action in login page.")
+                    logger.info(f"[Precheck] Found Google OAuth pattern '{match.group(0)}' in element: text='{text}', aria-label='{aria_label}', title='{title}'")
                 return True
-
-        # Check for buttons/links/divs/spans with Google sign-in text, aria-label, or title
-        google_text_patterns = [
-            "sign in with google",
-            "sign in using google",
-            "continue with google",
-            "login with google",
-            "log in with google",
-            "google sign in",
-            "google login",
-        ]
-        found_google_texts = []
-        for tag in soup.find_all(["button", "a", "div", "span"]):
-            text = tag.get_text(separator=" ", strip=True).lower()
-            aria_label = tag.attrs.get("aria-label", "").lower()
-            title = tag.attrs.get("title", "").lower()
-            # Check for "google" in text, aria-label, or title
-            if "google" in text or "google" in aria_label or "google" in title:
+            if found_google_texts is not None and (
+                "google" in text or "google" in aria_label or "google" in title
+            ):
                 found_google_texts.append({
                     "text": text,
                     "aria-label": aria_label,
                     "title": title
                 })
-            # Check for any of the patterns in text, aria-label, or title
-            for pattern in google_text_patterns:
-                if (
-                    pattern in text
-                    or pattern in aria_label
-                    or pattern in title
-                ):
-                    if logger:
-                        logger.info(f"[Precheck] Found Google OAuth pattern '{pattern}' in element: text='{text}', aria-label='{aria_label}', title='{title}'")
-                    return True
 
-        if logger and found_google_texts:
-            logger.info(f"[Precheck][DIAG] Found element(s) with 'google' in text/aria-label/title: {found_google_texts}")
-
-        # Check for common Google OAuth button class names or data attributes
-        google_class_patterns = [
-            "google-sign-in", "google-login", "btn-google", "google-auth", "google_oauth", "google"
-        ]
-        found_google_classes = []
-        for tag in soup.find_all(["button", "a", "div", "span"], class_=True):
-            classes = " ".join(tag.get("class", [])).lower()
-            for pattern in google_class_patterns:
-                if pattern in classes:
-                    found_google_classes.append(classes)
-                    if logger:
-                        logger.info(f"[Precheck] Found Google OAuth class pattern '{pattern}' in classes: {classes}")
-                    return True
+            # Check for Google OAuth button class names; the usual ones
+            # (google-sign-in, btn-google, google_oauth, ...) all contain "google"
+            classes = attrs.get("class", "").lower()
+            if "google" in classes:
+                if logger:
+                    logger.info(f"[Precheck] Found Google OAuth class name in classes: {classes}")
+                return True
 
-        # Check for data-provider or data-auth attributes
-        for tag in soup.find_all(["button", "a", "div", "span"]):
-            data_provider = tag.attrs.get("data-provider", "").lower()
-            data_auth = tag.attrs.get("data-auth", "").lower()
+            # Check for data-provider or data-auth attributes
+            data_provider = attrs.get("data-provider", "").lower()
+            data_auth = attrs.get("data-auth", "").lower()
             if "google" in data_provider or "google" in data_auth:
                 if logger:
                     logger.info(f"[Precheck] Found Google OAuth data attribute in element: data-provider='{data_provider}', data-auth='{data_auth}'")
                 return True
 
-        if logger and found_google_classes:
-            logger.info(f"[Precheck][DIAG] Found element(s) with Google OAuth class: {found_google_classes}")
+        if google_links:
+            logger.info(f"[Precheck][DIAG] Found <a>/<form> href/action(s) containing 'google': {google_links}")
+        if found_google_texts:
+            logger.info(f"[Precheck][DIAG] Found element(s) with 'google' in text/aria-label/title: {found_google_texts}")
 
         if logger:
             logger.info("[Precheck][DIAG] No Google OAuth indicators detected in precheck.")
@@ -139,7 +281,170 @@ def precheck_google_oauth(url: str, logger: Optional[Logger] = None) -> bool:
     except Exception as e:
         if logger:
             logger.error(f"[Precheck] Error during Google OAuth pre-check: {e}")
-        return False
+        return None
+
+async def precheck_google_oauth_async(url: str, logger: Optional[Logger] = None) -> bool:
+    """
+    Run precheck_google_oauth without blocking the event loop.
+
+    The fetch and parse run in the default executor, so concurrent logins can
+    precheck their pages at the same time while the loop keeps driving browsers.
+    This is for callers without an AppCore (such as the CLI); AppCore runs the
+    precheck in its own worker pool and passes the verdict to login_to_website.
+
+    Args:
+        url: Login page URL
+        logger: Optional logger for diagnostics
+
+    Returns:
+        True if Google OAuth is detected, else False
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, precheck_google_oauth, url, logger)
+
+# The authority part of an absolute URL (what urlparse calls netloc)
+_NETLOC_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*://([^/?#]*)")
+
+@lru_cache(maxsize=1024)
+def _netloc(url: str) -> str:
+    """Return the lowercased host of url; login checks compare the same URLs repeatedly."""
+    match = _NETLOC_RE.match(url)
+    return match.group(1).lower() if match else ""
+
+# FormLoginStrategy._check_login_success: URL parts that mean the login page is
+# still showing, and error messages that mean the login was rejected
+_LOGIN_URL_RE = re.compile(r"login|signin|sign-in|log-in", re.IGNORECASE)
+_LOGIN_ERROR_RE = re.compile(
+    r"incorrect password|invalid (?:username|email|credentials)|login failed|authentication failed",
+    re.IGNORECASE
+)
+
+# GoogleOAuthStrategy's sign-in button selectors (CSS, ARIA, data attributes,
+# role), in priority order; each tier is one selector list queried in a single
+# round trip
+_GOOGLE_SELECTOR_TIERS = (
+    # CSS/Text
+    "button:has-text('Sign in with Google'), button:has-text('Continue with Google'), "
+    "button:has-text('Login with Google'), button:has-text('Log in with Google')",
+    "a:has-text('Sign in with Google'), a:has-text('Continue with Google'), "
+    "a:has-text('Login with Google'), a:has-text('Log in with Google')",
+    "div:has-text('Sign in with Google'), div:has-text('Continue with Google'), "
+    "div:has-text('Login with Google'), div:has-text('Log in with Google')",
+    # ARIA, data attributes, role and class
+    "[aria-label*='Google'], [aria-label*='google'], "
+    "[data-provider*='google'], [data-auth*='google'], "
+    "[role='button'][aria-label*='Google'], "
+    ".google-sign-in, .google-login, .btn-google, .google-auth, .google_oauth, .google",
+)
+_GOOGLE_CSS_UNION = ", ".join(_GOOGLE_SELECTOR_TIERS)
+# XPath fallbacks, queried as one union through page.locator("xpath=...")
+_GOOGLE_XPATHS = (
+    "//button[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
+    "//a[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
+    "//div[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
+    "//span[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
+)
+_GOOGLE_XPATH_UNION = "xpath=" + " | ".join(_GOOGLE_XPATHS)
+
+# GoogleOAuthStrategy: URLs of Google's sign-in pages
+_GOOGLE_ACCOUNTS_URL_RE = re.compile(r"accounts\.google\.com")
+
+# Controls on Google's two-step sign-in form. Each step's Next button is
+# matched by its container id, with the button text as a fallback
+_GOOGLE_EMAIL_SEL = "input[type='email']"
+_PASSWORD_SEL = "input[type='password']"
+# Google's email step also carries a hidden password input for autofill
+_GOOGLE_PASSWORD_SEL = "input[type='password']:visible"
+_GOOGLE_EMAIL_NEXT_SEL = "#identifierNext button"
+_GOOGLE_PASSWORD_NEXT_SEL = "#passwordNext button"
+_GOOGLE_NEXT_TEXT_SEL = "button:has-text('Next')"
+_GOOGLE_ERROR_SEL = "div[aria-live='assertive']"
+
+# GoogleOAuthStrategy._check_login_success: Google services a completed
+# sign-in may land on
+_GOOGLE_REDIRECT_DOMAINS = frozenset({
+    "accounts.google.com",
+    "myaccount.google.com",
+    "mail.google.com",
+    "drive.google.com",
+    "docs.google.com",
+    "sheets.google.com",
+    "slides.google.com",
+    "calendar.google.com",
+})
+
+# In-page scan for GoogleOAuthStrategy's broad fallback: the first visible
+# button/link/div/span whose text, aria-label or title mentions Google
+_GOOGLE_TEXT_ELEMENT_JS = """() => {
+    for (const el of document.querySelectorAll('button, a, div, span')) {
+        const text = (el.innerText || '').toLowerCase();
+        const ariaLabel = (el.getAttribute('aria-label') || '').toLowerCase();
+        const title = (el.getAttribute('title') || '').toLowerCase();
+        if (!text.includes('google') && !ariaLabel.includes('google') && !title.includes('google')) {
+            continue;
+        }
+        // Same rule as Playwright's is_visible: a non-empty box and not visibility:hidden
+        const rect = el.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden') {
+            return el;
+        }
+    }
+    return null;
+}"""
+
+# BrowserAutomation._detect_login_form: everything the field scoring needs from
+# a list of inputs (attributes and label text), read in one round trip
+_LOGIN_FIELD_ROWS_JS = """(inputs) => inputs.map((el) => {
+    let label = null;
+    if (el.id) {
+        const forLabel = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+        if (forLabel) label = forLabel.innerText;
+    }
+    if (label === null && el.parentElement && el.parentElement.tagName === 'LABEL') {
+        label = el.parentElement.innerText;
+    }
+    return {
+        type: (el.getAttribute('type') || '').toLowerCase(),
+        name: (el.getAttribute('name') || '').toLowerCase(),
+        placeholder: (el.getAttribute('placeholder') || '').toLowerCase(),
+        label: (label || '').trim().toLowerCase(),
+    };
+})"""
+
+_LOGIN_FIELD_KEYWORDS_RE = re.compile(r"user|email|pass|login")
+
+def _score_login_field(row: Dict[str, str], field_type: str) -> float:
+    """
+    Score how likely an input is the username or password field of a login form.
+
+    Args:
+        row: The input's type, name, placeholder and label text (lowercased)
+        field_type: "username" or "password"
+
+    Returns:
+        Score; higher is more likely
+    """
+    score = 0
+    input_type = row["type"]
+    # One scan for all keywords across label, placeholder and name
+    keywords = set(_LOGIN_FIELD_KEYWORDS_RE.findall(f"{row['label']} {row['placeholder']} {row['name']}"))
+    # Username/email field
+    if field_type == "username":
+        if "user" in keywords:
+            score += 2
+        if "email" in keywords:
+            score += 2
+        if input_type == "email":
+            score += 1.5
+    # Password field
+    if field_type == "password":
+        if "pass" in keywords:
+            score += 2
+        if input_type == "password":
+            score += 2
+    # General
+    if "login" in keywords:
+        score += 0.5
+    return score
 
 # Abstract base class for login strategies
 class LoginStrategy:
@@ -176,6 +481,48 @@ class LoginStrategy:
             raise BrowserError("Browser page not available")
             
         raise NotImplementedError("Subclasses must implement login method")
+    
+    def _fail(self, status: Dict[str, Any], message: str, log_message: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Log a login failure and mark the status with it.
+
+        Args:
+            status: Status dictionary of the login in progress
+            message: Message for the status
+            log_message: Message for the log, if it differs from the status message
+
+        Returns:
+            The updated status dictionary
+        """
+        self.logger.error(log_message or message)
+        status.update({
+            "stage": "error",
+            "success": False,
+            "message": message
+        })
+        return status
+
+    async def _wait_for_selector_or_idle(self, selector: str) -> None:
+        """
+        Wait after navigation until the element a strategy needs is visible.
+        
+        Waits up to 5 seconds for the selector, then at most 2 seconds for
+        network idle; analytics-heavy pages can take far longer to go idle
+        than to render their login controls.
+        
+        Args:
+            selector: Selector for the element the strategy looks for next
+        """
+        try:
+            await self.page.wait_for_selector(selector, timeout=5000)
+            return
+        except Exception:
+            pass
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=2000)
+        except Exception as e:
+            self.logger.warning(f"Timeout waiting for page to load: {e}")
+            # Continue anyway, page might still be usable
 
 # Standard form login strategy
 class FormLoginStrategy(LoginStrategy):
@@ -215,20 +562,10 @@ class FormLoginStrategy(LoginStrategy):
             self.logger.info(f"Navigating to {url}")
             await self.page.goto(url, wait_until="domcontentloaded")
         except Exception as e:
-            self.logger.error(f"Error navigating to {url}: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error navigating to {url}: {e}"
-            })
-            return status
+            return self._fail(status, f"Error navigating to {url}: {e}")
 
-        # Wait for page to load
-        try:
-            await self.page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception as e:
-            self.logger.warning(f"Timeout waiting for page to load: {e}")
-            # Continue anyway, page might still be usable
+        # Wait for the password field rather than for the network to go idle
+        await self._wait_for_selector_or_idle(_PASSWORD_SEL)
 
         # Update status
         status.update({
@@ -260,21 +597,9 @@ class FormLoginStrategy(LoginStrategy):
                 })
                 return status
             if not username_field or not password_field:
-                self.logger.error("Could not find username or password field")
-                status.update({
-                    "stage": "error",
-                    "success": False,
-                    "message": "Could not find username or password field"
-                })
-                return status
+                return self._fail(status, "Could not find username or password field")
         except Exception as e:
-            self.logger.error(f"Error detecting login form: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error detecting login form: {e}"
-            })
-            return status
+            return self._fail(status, f"Error detecting login form: {e}")
 
         # Update status
         status.update({
@@ -289,13 +614,7 @@ class FormLoginStrategy(LoginStrategy):
         try:
             await self.browser._fill_login_form(form_info, username, password)
         except Exception as e:
-            self.logger.error(f"Error filling login form: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error filling login form: {e}"
-            })
-            return status
+            return self._fail(status, f"Error filling login form: {e}")
 
         # Update status
         status.update({
@@ -310,43 +629,38 @@ class FormLoginStrategy(LoginStrategy):
         try:
             await self.browser._submit_login_form(form_info)
         except Exception as e:
-            self.logger.error(f"Error submitting login form: {e}")
+            return self._fail(status, f"Error submitting login form: {e}")
+
+        # Detect CAPTCHA and two-factor authentication; the two checks are
+        # independent page queries, so they run concurrently
+        captcha_present, two_factor_present = await asyncio.gather(
+            self.browser._detect_captcha(),
+            self.browser._detect_two_factor(),
+            return_exceptions=True
+        )
+        if isinstance(captcha_present, Exception):
+            self.logger.error(f"Error detecting CAPTCHA: {captcha_present}")
+        elif captcha_present:
             status.update({
-                "stage": "error",
+                "stage": "captcha_detected",
                 "success": False,
-                "message": f"Error submitting login form: {e}"
+                "message": "CAPTCHA detected. Manual intervention required."
             })
+            if callback:
+                callback(status)
             return status
 
-        # Detect CAPTCHA
-        try:
-            captcha_present = await self.browser._detect_captcha()
-            if captcha_present:
-                status.update({
-                    "stage": "captcha_detected",
-                    "success": False,
-                    "message": "CAPTCHA detected. Manual intervention required."
-                })
-                if callback:
-                    callback(status)
-                return status
-        except Exception as e:
-            self.logger.error(f"Error detecting CAPTCHA: {e}")
-
-        # Detect two-factor authentication
-        try:
-            two_factor_present = await self.browser._detect_two_factor()
-            if two_factor_present:
-                status.update({
-                    "stage": "two_factor_detected",
-                    "success": False,
-                    "message": "Two-factor authentication detected. Manual intervention required."
-                })
-                if callback:
-                    callback(status)
-                return status
-        except Exception as e:
-            self.logger.error(f"Error detecting two-factor authentication: {e}")
+        if isinstance(two_factor_present, Exception):
+            self.logger.error(f"Error detecting two-factor authentication: {two_factor_present}")
+        elif two_factor_present:
+            status.update({
+                "stage": "two_factor_detected",
+                "success": False,
+                "message": "Two-factor authentication detected. Manual intervention required."
+            })
+            if callback:
+                callback(status)
+            return status
 
         # Update status
         status.update({
@@ -396,8 +710,9 @@ class FormLoginStrategy(LoginStrategy):
         Returns:
             True if login was successful, False otherwise
         """
-        # Get the page from browser automation when needed
-        self.page = await self.browser.get_page()
+        # login() has already resolved the page; only look it up when called on its own
+        if not self.page:
+            self.page = await self.browser.get_page()
         if not self.page:
             raise BrowserError("Browser page not available")
             
@@ -405,34 +720,24 @@ class FormLoginStrategy(LoginStrategy):
         current_url = self.page.url
         
         # If we're redirected to a different domain, login was probably successful
-        parsed_original = urlparse(url)
-        parsed_current = urlparse(current_url)
-        
-        if parsed_original.netloc != parsed_current.netloc:
-            self.logger.info(f"Redirected to different domain: {parsed_current.netloc}")
+        current_netloc = _netloc(current_url)
+        if _netloc(url) != current_netloc:
+            self.logger.info(f"Redirected to different domain: {current_netloc}")
             return True
         
         # Check if URL contains common login failure indicators
-        if any(indicator in current_url.lower() for indicator in ["login", "signin", "sign-in", "log-in"]):
+        if _LOGIN_URL_RE.search(current_url):
             self.logger.info(f"Still on login page: {current_url}")
             return False
         
-        # Check for common error messages on the page
+        # Check for common error messages on the page, in one scan of the
+        # content without lowercasing a copy of it
         try:
             page_content = await self.page.content()
-            error_patterns = [
-                "incorrect password",
-                "invalid username",
-                "invalid email",
-                "invalid credentials",
-                "login failed",
-                "authentication failed"
-            ]
-            
-            for pattern in error_patterns:
-                if pattern in page_content.lower():
-                    self.logger.info(f"Found error message on page: {pattern}")
-                    return False
+            match = _LOGIN_ERROR_RE.search(page_content)
+            if match:
+                self.logger.info(f"Found error message on page: {match.group(0).lower()}")
+                return False
         except Exception as e:
             self.logger.error(f"Error checking page content: {e}")
         
@@ -477,20 +782,10 @@ class GoogleOAuthStrategy(LoginStrategy):
             self.logger.info(f"Navigating to {url}")
             await self.page.goto(url, wait_until="domcontentloaded")
         except Exception as e:
-            self.logger.error(f"Error navigating to {url}: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error navigating to {url}: {e}"
-            })
-            return status
+            return self._fail(status, f"Error navigating to {url}: {e}")
         
-        # Wait for page to load
-        try:
-            await self.page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception as e:
-            self.logger.warning(f"Timeout waiting for page to load: {e}")
-            # Continue anyway, page might still be usable
+        # Wait for a sign-in control rather than for the network to go idle
+        await self._wait_for_selector_or_idle(_GOOGLE_CSS_UNION)
         
         # Update status
         status.update({
@@ -506,139 +801,28 @@ class GoogleOAuthStrategy(LoginStrategy):
         detection_attempts = 0
         max_detection_attempts = 2  # First: normal, Second: slow mode + spoofed UA
 
-        # Define selector strategies (CSS, ARIA, XPath, data attributes, role)
-        google_selectors = [
-            # CSS/Text
-            "button:has-text('Sign in with Google')",
-            "button:has-text('Continue with Google')",
-            "button:has-text('Login with Google')",
-            "button:has-text('Log in with Google')",
-            "a:has-text('Sign in with Google')",
-            "a:has-text('Continue with Google')",
-            "a:has-text('Login with Google')",
-            "a:has-text('Log in with Google')",
-            "div:has-text('Sign in with Google')",
-            "div:has-text('Continue with Google')",
-            "div:has-text('Login with Google')",
-            "div:has-text('Log in with Google')",
-            # ARIA
-            "[aria-label*='Google']",
-            "[aria-label*='google']",
-            # Data attributes
-            "[data-provider*='google']",
-            "[data-auth*='google']",
-            # Role
-            "[role='button'][aria-label*='Google']",
-            # Class
-            ".google-sign-in, .google-login, .btn-google, .google-auth, .google_oauth, .google",
-            # XPath (Playwright supports $x via evaluate)
-        ]
-        # XPath selectors (to be used via evaluate)
-        google_xpaths = [
-            "//button[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
-            "//a[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
-            "//div[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]",
-            "//span[contains(translate(text(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'google')]"
-        ]
-
         while not google_button and detection_attempts < max_detection_attempts:
             try:
-                # 1. Try all CSS/ARIA/data/role/class selectors
-                for selector in google_selectors:
-                    elements = await self.page.query_selector_all(selector)
-                    if elements:
-                        for element in elements:
-                            is_visible = await element.is_visible()
-                            if is_visible:
-                                google_button = element
-                                break
-                    if google_button:
-                        break
-
-                # 2. Try XPath selectors
-                if not google_button:
-                    for xpath in google_xpaths:
-                        elements = await self.page.evaluate(
-                            """(xpath) => {
-                                const results = [];
-                                const nodes = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
-                                for (let i = 0; i < nodes.snapshotLength; i++) {
-                                    results.push(nodes.snapshotItem(i));
-                                }
-                                return results;
-                            }""", xpath
-                        )
-                        # Wrap DOM nodes as Playwright element handles
-                        if elements:
-                            for node in elements:
-                                handle = await self.page.evaluate_handle("(el) => el", node)
-                                is_visible = await handle.is_visible()
-                                if is_visible:
-                                    google_button = handle
-                                    break
-                        if google_button:
-                            break
+                # 1./2. Try all CSS/ARIA/data/role/class selector tiers and the XPath
+                # union at once; the first hit in priority order wins, so buttons
+                # still beat the links and wrapper divs containing the same text
+                queries = [self.page.locator(selector) for selector in _GOOGLE_SELECTOR_TIERS]
+                queries.append(self.page.locator(_GOOGLE_XPATH_UNION))
+                google_button = await self._first_hit(
+                    [self._first_visible(locator) for locator in queries]
+                )
 
                 # 3. If not found, try broader search: any element with "google" in text, aria-label, or title
                 if not google_button:
-                    candidates = await self.page.query_selector_all("button, a, div, span")
-                    for element in candidates:
-                        try:
-                            text = (await element.inner_text()).lower()
-                        except Exception:
-                            text = ""
-                        try:
-                            aria_label = (await element.get_attribute("aria-label") or "").lower()
-                        except Exception:
-                            aria_label = ""
-                        try:
-                            title = (await element.get_attribute("title") or "").lower()
-                        except Exception:
-                            title = ""
-                        if (
-                            "google" in text
-                            or "google" in aria_label
-                            or "google" in title
-                        ):
-                            is_visible = await element.is_visible()
-                            if is_visible:
-                                google_button = element
-                                break
-
-                # 4. If still not found, search inside iframes
+                    google_button = await self._find_google_text_element(self.page)
+
+                # 4. If still not found, search inside iframes, all frames at once
                 if not google_button:
-                    frames = self.page.frames
-                    for frame in frames:
-                        if frame == self.page.main_frame:
-                            continue
-                        try:
-                            elements = await frame.query_selector_all("button, a, div, span")
-                            for element in elements:
-                                try:
-                                    text = (await element.inner_text()).lower()
-                                except Exception:
-                                    text = ""
-                                try:
-                                    aria_label = (await element.get_attribute("aria-label") or "").lower()
-                                except Exception:
-                                    aria_label = ""
-                                try:
-                                    title = (await element.get_attribute("title") or "").lower()
-                                except Exception:
-                                    title = ""
-                                if (
-                                    "google" in text
-                                    or "google" in aria_label
-                                    or "google" in title
-                                ):
-                                    is_visible = await element.is_visible()
-                                    if is_visible:
-                                        google_button = element
-                                        break
-                            if google_button:
-                                break
-                        except Exception:
-                            continue
+                    google_button = await self._first_hit([
+                        self._find_google_text_element(frame)
+                        for frame in self.page.frames
+                        if frame != self.page.main_frame
+                    ])
 
                 # If found, break out of retry loop
                 if google_button:
@@ -655,24 +839,16 @@ class GoogleOAuthStrategy(LoginStrategy):
                     })
                     await self.page.reload(wait_until="domcontentloaded")
             except Exception as e:
-                self.logger.error(f"Error finding Google sign-in button: {e}")
-                status.update({
-                    "stage": "error",
-                    "success": False,
-                    "message": f"Error finding Google sign-in button: {e}"
-                })
-                return status
+                return self._fail(status, f"Error finding Google sign-in button: {e}")
             detection_attempts += 1
 
         if not google_button:
             # As a last resort, suggest running in non-headless mode
-            self.logger.error("Could not find Google sign-in button after all strategies. Try running in non-headless mode.")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": "Could not find Google sign-in button. This may be due to overlays, anti-bot measures, or dynamic rendering. Try running in non-headless mode or check your network."
-            })
-            return status
+            return self._fail(
+                status,
+                "Could not find Google sign-in button. This may be due to overlays, anti-bot measures, or dynamic rendering. Try running in non-headless mode or check your network.",
+                log_message="Could not find Google sign-in button after all strategies. Try running in non-headless mode."
+            )
         
         # Update status
         status.update({
@@ -683,72 +859,28 @@ class GoogleOAuthStrategy(LoginStrategy):
         if callback:
             callback(status)
         
-        # Robustly handle overlays and click Google sign-in button
+        # Click Google sign-in button. Playwright's click already scrolls the
+        # element into view and waits for it to be actionable; if an overlay
+        # keeps intercepting the pointer, a DOM click on the element itself
+        # is not affected by it.
         try:
-            # Scroll button into view before clicking
+            await google_button.click(timeout=5000)
+            self.logger.info("Clicked Google sign-in button")
+        except Exception as click_exc:
+            self.logger.warning(f"Standard click failed due to: {click_exc}. Retrying with JS click.")
             try:
-                await google_button.scroll_into_view_if_needed(timeout=3000)
-            except Exception:
-                pass
-
-            # Wait for overlays to disappear or forcibly hide them if needed
-            overlay_removed = await self._handle_click_intercepting_overlays()
-            if not overlay_removed:
-                self.logger.warning("Overlay may still be present, attempting click anyway.")
-
-            click_attempts = 0
-            max_click_attempts = 2
-            while click_attempts < max_click_attempts:
-                try:
-                    await google_button.click(timeout=10000)
-                    self.logger.info("Clicked Google sign-in button")
-                    break
-                except Exception as click_exc:
-                    self.logger.warning(f"Standard click failed due to: {click_exc}. Retrying with JS click and scroll.")
-                    try:
-                        # Try JS click as a fallback
-                        await self.page.evaluate(
-                            "(el) => { el.scrollIntoView({behavior: 'smooth', block: 'center'}); el.click(); }", google_button
-                        )
-                        self.logger.info("Clicked Google sign-in button via JS.")
-                        break
-                    except Exception as js_exc:
-                        if click_attempts == max_click_attempts - 1:
-                            self.logger.error(f"Error clicking Google sign-in button (JS fallback): {js_exc}")
-                            status.update({
-                                "stage": "error",
-                                "success": False,
-                                "message": f"Error clicking Google sign-in button: {js_exc}"
-                            })
-                            return status
-                        else:
-                            # Wait and retry
-                            await self.page.wait_for_timeout(1000)
-                click_attempts += 1
-        except Exception as e:
-            self.logger.error(f"Error clicking Google sign-in button: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error clicking Google sign-in button: {e}"
-            })
-            return status
+                await google_button.evaluate("(el) => el.click()")
+                self.logger.info("Clicked Google sign-in button via JS.")
+            except Exception as js_exc:
+                return self._fail(
+                    status,
+                    f"Error clicking Google sign-in button: {js_exc}",
+                    log_message=f"Error clicking Google sign-in button (JS fallback): {js_exc}"
+                )
         
         # Wait for Google sign-in page or popup
         try:
-            # Wait for either navigation or popup (new page)
-            popup_page = None
-            context = self.page.context
-            popup_task = asyncio.create_task(context.wait_for_event("page", timeout=7000))
-            nav_task = asyncio.create_task(self.page.wait_for_load_state("networkidle", timeout=10000))
-            done, pending = await asyncio.wait([popup_task, nav_task], return_when=asyncio.FIRST_COMPLETED)
-            for task in pending:
-                task.cancel()
-            if popup_task in done and not popup_task.cancelled():
-                try:
-                    popup_page = popup_task.result()
-                except Exception:
-                    popup_page = None
+            popup_page = await self._wait_for_google_signin()
             if popup_page:
                 self.logger.info("Detected Google sign-in popup window, switching context.")
                 self.page = popup_page
@@ -763,13 +895,7 @@ class GoogleOAuthStrategy(LoginStrategy):
         # Check if we're on Google sign-in page
         current_url = self.page.url
         if "accounts.google.com" not in current_url:
-            self.logger.error(f"Not on Google sign-in page: {current_url}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Not on Google sign-in page: {current_url}"
-            })
-            return status
+            return self._fail(status, f"Not on Google sign-in page: {current_url}")
         
         # Update status
         status.update({
@@ -782,80 +908,21 @@ class GoogleOAuthStrategy(LoginStrategy):
         
         # Fill Google email
         try:
-            # Look for email field
-            email_field = await self.page.query_selector("input[type='email']")
-            if not email_field:
-                self.logger.error("Could not find Google email field")
-                status.update({
-                    "stage": "error",
-                    "success": False,
-                    "message": "Could not find Google email field"
-                })
-                return status
-            
-            # Fill email field
-            await email_field.fill(username)
-            
-            # Click Next button
-            next_button = await self.page.query_selector("button:has-text('Next')")
-            if not next_button:
-                self.logger.error("Could not find Next button")
-                status.update({
-                    "stage": "error",
-                    "success": False,
-                    "message": "Could not find Next button"
-                })
-                return status
-            
-            await next_button.click()
-            
-            # Wait for password field
-            await self.page.wait_for_selector("input[type='password']", timeout=10000)
+            # page.fill waits for the field to render (the sign-in page is built by
+            # script after domcontentloaded) and fills it in one call; a field that
+            # never shows up times out into the error status below
+            await self.page.fill(_GOOGLE_EMAIL_SEL, username, timeout=10000)
+            await self._click_next(_GOOGLE_EMAIL_NEXT_SEL)
         except Exception as e:
-            self.logger.error(f"Error filling Google email: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error filling Google email: {e}"
-            })
-            return status
+            return self._fail(status, f"Error filling Google email: {e}")
         
         # Fill Google password
         try:
-            # Look for password field
-            password_field = await self.page.query_selector("input[type='password']")
-            if not password_field:
-                self.logger.error("Could not find Google password field")
-                status.update({
-                    "stage": "error",
-                    "success": False,
-                    "message": "Could not find Google password field"
-                })
-                return status
-            
-            # Fill password field
-            await password_field.fill(password)
-            
-            # Click Next button
-            next_button = await self.page.query_selector("button:has-text('Next')")
-            if not next_button:
-                self.logger.error("Could not find Next button")
-                status.update({
-                    "stage": "error",
-                    "success": False,
-                    "message": "Could not find Next button"
-                })
-                return status
-            
-            await next_button.click()
+            # Fill password field once the password step has rendered
+            await self.page.fill(_GOOGLE_PASSWORD_SEL, password, timeout=10000)
+            await self._click_next(_GOOGLE_PASSWORD_NEXT_SEL)
         except Exception as e:
-            self.logger.error(f"Error filling Google password: {e}")
-            status.update({
-                "stage": "error",
-                "success": False,
-                "message": f"Error filling Google password: {e}"
-            })
-            return status
+            return self._fail(status, f"Error filling Google password: {e}")
         
         # Update status
         status.update({
@@ -866,11 +933,9 @@ class GoogleOAuthStrategy(LoginStrategy):
         if callback:
             callback(status)
         
-        # Wait for navigation
-        try:
-            await self.page.wait_for_load_state("networkidle", timeout=20000)
-        except Exception as e:
-            self.logger.warning(f"Timeout waiting for Google authentication: {e}")
+        # Wait until the page leaves Google or shows a sign-in error
+        if not await self._wait_for_google_outcome(20000):
+            self.logger.warning("Timeout waiting for Google authentication")
             # Continue anyway, login might still be successful
         
         # Check if we're still on Google sign-in page
@@ -878,16 +943,10 @@ class GoogleOAuthStrategy(LoginStrategy):
         if "accounts.google.com" in current_url:
             # Check for error messages
             try:
-                error_message = await self.page.query_selector("div[aria-live='assertive']")
+                error_message = await self.page.query_selector(_GOOGLE_ERROR_SEL)
                 if error_message:
                     error_text = await error_message.text_content()
-                    self.logger.error(f"Google sign-in error: {error_text}")
-                    status.update({
-                        "stage": "error",
-                        "success": False,
-                        "message": f"Google sign-in error: {error_text}"
-                    })
-                    return status
+                    return self._fail(status, f"Google sign-in error: {error_text}")
             except Exception as e:
                 self.logger.error(f"Error checking for Google sign-in error: {e}")
             
@@ -904,25 +963,16 @@ class GoogleOAuthStrategy(LoginStrategy):
                     if callback:
                         callback(status)
                     
-                    # Wait for user to complete 2FA
-                    await self.browser.wait_for_user_action(300)
-                    
-                    # Check if we're still on Google sign-in page
-                    current_url = self.page.url
-                    if "accounts.google.com" in current_url:
-                        self.logger.error("Still on Google sign-in page after 2FA")
-                        status.update({
-                            "stage": "error",
-                            "success": False,
-                            "message": "Still on Google sign-in page after 2FA"
-                        })
-                        return status
+                    # Wait for user to complete 2FA; returns as soon as the sign-in
+                    # page is left
+                    if not await self._wait_for_google_exit(300):
+                        return self._fail(status, "Still on Google sign-in page after 2FA")
             except Exception as e:
                 self.logger.error(f"Error handling Google 2FA: {e}")
         
         # Wait for final navigation
         try:
-            await self.page.wait_for_load_state("networkidle", timeout=10000)
+            await self.page.wait_for_load_state("domcontentloaded", timeout=10000)
         except Exception as e:
             self.logger.warning(f"Timeout waiting for final navigation: {e}")
             # Continue anyway, login might still be successful
@@ -949,52 +999,184 @@ class GoogleOAuthStrategy(LoginStrategy):
         
         return status
     
-    async def _handle_click_intercepting_overlays(self, timeout: float = 5.0) -> bool:
+    async def _first_hit(self, searches: List[Awaitable[Optional[ElementHandle]]]) -> Optional[ElementHandle]:
+        """
+        Run element searches concurrently and return the first hit in list order.
+
+        Searches that fail (e.g. a frame detached mid-query) count as misses;
+        handles from lower-priority hits are released.
+
+        Args:
+            searches: Awaitables resolving to an element handle or None
+
+        Returns:
+            Element handle, or None if every search missed
+        """
+        results = await asyncio.gather(*searches, return_exceptions=True)
+        hits = [result for result in results if result is not None and not isinstance(result, BaseException)]
+        for extra in hits[1:]:
+            try:
+                await extra.dispose()
+            except Exception:
+                pass
+        return hits[0] if hits else None
+
+    async def _find_google_text_element(self, frame: Union[Page, Frame]) -> Optional[ElementHandle]:
+        """
+        Find the first visible button/link/div/span mentioning Google in its text,
+        aria-label or title.
+
+        The scan runs inside the page as one script, instead of four protocol
+        round trips (text, two attributes, visibility) per candidate element.
+
+        Args:
+            frame: Page or frame to search
+
+        Returns:
+            Element handle, or None if nothing matches
+        """
+        handle = await frame.evaluate_handle(_GOOGLE_TEXT_ELEMENT_JS)
+        element = handle.as_element()
+        if element is None:
+            await handle.dispose()
+        return element
+
+    async def _wait_for_google_signin(self, timeout: float = 7000) -> Optional[Page]:
+        """
+        Wait for the Google sign-in page to open after the button click, either
+        as a popup or by navigating the current page.
+
+        Args:
+            timeout: Maximum wait in milliseconds
+
+        Returns:
+            The popup page, or None if the current page reached Google's sign-in
+            page (or neither happened within the timeout)
         """
-        Detect and handle overlays that intercept pointer events before clicking.
-        Returns True if overlays are gone or hidden, False if overlays may still be present.
+        context = self.page.context
+        popup: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        def on_page(page: Page) -> None:
+            if not popup.done():
+                popup.set_result(page)
+
+        context.on("page", on_page)
+        # Google's sign-in page keeps telemetry requests going, so wait for the
+        # URL and DOM rather than for the network to go idle
+        navigation = asyncio.ensure_future(
+            self.page.wait_for_url(_GOOGLE_ACCOUNTS_URL_RE, wait_until="domcontentloaded", timeout=timeout)
+        )
+        try:
+            await asyncio.wait({popup, navigation}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            context.remove_listener("page", on_page)
+            if not navigation.done():
+                navigation.cancel()
+            elif not navigation.cancelled():
+                navigation.exception()  # a timeout only means there was no navigation
+        return popup.result() if popup.done() else None
+
+    async def _click_next(self, step_selector: str) -> None:
+        """
+        Click the Next button of the current Google sign-in step.
+
+        The button is found by its step's container id, which the selector
+        engine resolves without walking text nodes; the button text is only
+        a fallback for layouts without the id. Either way it is one click call,
+        which waits for the button to become clickable.
+
+        Args:
+            step_selector: Selector for the step's Next button by container id
+
+        Raises:
+            Exception: If no Next button became clickable within 5 seconds
         """
-        import time
+        next_button = self.page.locator(step_selector).or_(self.page.locator(_GOOGLE_NEXT_TEXT_SEL))
+        await next_button.first.click(timeout=5000)
 
-        overlay_selectors = [
-            # Generic Google sign-in overlays and common patterns
-            "div[id^='gsi_'][id$='-overlay']",
-            "div[class*='overlay']",
-            "div[style*='pointer-events: auto']",
-            "div[style*='pointer-events:all']",
-            "div[style*='z-index']"
+    async def _wait_for_google_outcome(self, timeout: float) -> bool:
+        """
+        Wait for the password step to resolve: the page leaving Google's
+        sign-in pages, or Google showing a sign-in error.
+
+        Args:
+            timeout: Maximum wait in milliseconds
+
+        Returns:
+            True if either happened, False if the wait timed out
+        """
+        waits = [
+            asyncio.ensure_future(self.page.wait_for_url(
+                lambda page_url: not _GOOGLE_ACCOUNTS_URL_RE.search(page_url),
+                wait_until="domcontentloaded", timeout=timeout
+            )),
+            asyncio.ensure_future(self.page.wait_for_selector(_GOOGLE_ERROR_SEL, timeout=timeout)),
         ]
-        start = time.time()
-        while time.time() - start < timeout:
-            overlays = []
-            for selector in overlay_selectors:
-                found = await self.page.query_selector_all(selector)
-                overlays.extend(found)
-            # Filter overlays that are visible and intercept pointer events
-            intercepting = []
-            for overlay in overlays:
-                try:
-                    visible = await overlay.is_visible()
-                    pointer_events = await self.page.evaluate(
-                        "(el) => getComputedStyle(el).pointerEvents", overlay
-                    )
-                    if visible and pointer_events in ("auto", "all"):
-                        intercepting.append(overlay)
-                except Exception:
-                    continue
-            if not intercepting:
-                return True  # No overlays intercepting
-            # Try to hide overlays forcibly
-            for overlay in intercepting:
-                try:
-                    await self.page.evaluate(
-                        "(el) => { el.style.display = 'none'; el.style.pointerEvents = 'none'; }", overlay
-                    )
-                except Exception:
-                    continue
-            await asyncio.sleep(0.2)
-        # After timeout, overlays may still be present
-        return False
+        pending = set(waits)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # A wait that ended in a timeout or error does not count
+                if any(wait.exception() is None for wait in done):
+                    return True
+            return False
+        finally:
+            for wait in pending:
+                wait.cancel()
+
+    async def _wait_for_google_exit(self, timeout: float) -> bool:
+        """
+        Wait for the user to finish a manual step (such as 2FA) on Google's
+        sign-in page: until the page navigates off Google or, for a popup
+        sign-in, the popup closes.
+
+        Args:
+            timeout: Maximum wait in seconds
+
+        Returns:
+            True if the sign-in page was left, False if the wait timed out
+        """
+        page = self.page
+        left = asyncio.Event()
+
+        def on_navigated(frame: Frame) -> None:
+            if frame == page.main_frame and not _GOOGLE_ACCOUNTS_URL_RE.search(frame.url):
+                left.set()
+
+        def on_close(_page: Page) -> None:
+            left.set()
+
+        page.on("framenavigated", on_navigated)
+        page.on("close", on_close)
+        # The redirect (or popup close) may have happened before the
+        # listeners were attached
+        if page.is_closed() or not _GOOGLE_ACCOUNTS_URL_RE.search(page.url):
+            left.set()
+        try:
+            await asyncio.wait_for(left.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Timeout waiting for user action after {timeout} seconds")
+            return False
+        finally:
+            page.remove_listener("framenavigated", on_navigated)
+            page.remove_listener("close", on_close)
+
+    async def _first_visible(self, locator: Locator) -> Optional[ElementHandle]:
+        """
+        Return a handle to the first visible element matched by a locator.
+
+        Args:
+            locator: Playwright locator
+
+        Returns:
+            Element handle, or None if no match is visible
+        """
+        # Filter in the browser so the cost is two round trips however many match
+        visible = locator.filter(visible=True)
+        if await visible.count():
+            return await visible.first.element_handle()
+        return None
 
     async def _check_login_success(self, url: str) -> bool:
         """
@@ -1006,7 +1188,9 @@ class GoogleOAuthStrategy(LoginStrategy):
         Returns:
             True if login was successful, False otherwise
         """
-        # Get the page from browser automation when needed
+        # Re-resolve the page rather than reuse self.page: after a popup sign-in,
+        # self.page is the (possibly closed) popup, and the outcome shows on the
+        # original page
         self.page = await self.browser.get_page()
         if not self.page:
             raise BrowserError("Browser page not available")
@@ -1018,27 +1202,14 @@ class GoogleOAuthStrategy(LoginStrategy):
             return False
         
         # If we're back on the original domain, login was probably successful
-        parsed_original = urlparse(url)
-        parsed_current = urlparse(current_url)
-        
-        if parsed_original.netloc == parsed_current.netloc:
-            self.logger.info(f"Back on original domain: {parsed_current.netloc}")
+        current_netloc = _netloc(current_url)
+        if _netloc(url) == current_netloc:
+            self.logger.info(f"Back on original domain: {current_netloc}")
             return True
         
         # If we're on a different domain, check if it's a common redirect domain
-        common_redirect_domains = [
-            "accounts.google.com",
-            "myaccount.google.com",
-            "mail.google.com",
-            "drive.google.com",
-            "docs.google.com",
-            "sheets.google.com",
-            "slides.google.com",
-            "calendar.google.com"
-        ]
-        
-        if parsed_current.netloc in common_redirect_domains:
-            self.logger.info(f"Redirected to Google service: {parsed_current.netloc}")
+        if current_netloc in _GOOGLE_REDIRECT_DOMAINS:
+            self.logger.info(f"Redirected to Google service: {current_netloc}")
             return True
         
         # If we got this far, login was probably successful
@@ -1091,47 +1262,23 @@ class BrowserAutomation:
         self.config_manager = config_manager
         self.browser_type = self.config_manager.get("browser", "chromium")
         self.headless = self.config_manager.get("headless", False)
-        self._browser: Optional[Browser] = None
-        self._context: Optional[BrowserContext] = None
-        self._page: Optional[Page] = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
         self._playwright: Optional[Playwright] = None
         self._playwright_instance = None
         self.status: Dict[str, Any] = {}
         self.error_handler = ErrorHandler(self.logger)
         self._initialized = False
+        # Sessions created by new_session() borrow the browser of their parent
+        self._owns_browser = True
+        # Fresh (context, page) pairs made ahead of time by prewarm(); each is
+        # handed to one session and closed with it, never reused
+        self._context_pool: List[Tuple[BrowserContext, Page]] = []
 
         # For test/mocking compatibility
-        self.browser = None
-        self.page = None
         self._check_login_success = None
     
-    @property
-    def browser(self):
-        """Return the injected browser if set, otherwise the internal _browser."""
-        return self._browser if self.__dict__["browser"] is None else self.__dict__["browser"]
-
-    @browser.setter
-    def browser(self, value):
-        self.__dict__["browser"] = value
-
-    @property
-    def page(self):
-        """Return the injected page if set, otherwise the internal _page."""
-        return self._page if self.__dict__["page"] is None else self.__dict__["page"]
-
-    @page.setter
-    def page(self, value):
-        self.__dict__["page"] = value
-
-    @property
-    def context(self):
-        """Return the injected context if set, otherwise the internal _context."""
-        return self._context if self.__dict__.get("context", None) is None else self.__dict__["context"]
-
-    @context.setter
-    def context(self, value):
-        self.__dict__["context"] = value
-
     async def get_browser(self) -> Optional[Browser]:
         """
         Get or initialize browser.
@@ -1142,9 +1289,9 @@ class BrowserAutomation:
         Raises:
             BrowserError: If browser initialization fails
         """
-        if not self._browser:
+        if not self.browser:
             await self.initialize()
-        return self._browser
+        return self.browser
 
     async def get_context(self) -> Optional[BrowserContext]:
         """
@@ -1156,9 +1303,9 @@ class BrowserAutomation:
         Raises:
             BrowserError: If browser initialization fails
         """
-        if not self._context:
+        if not self.context:
             await self.initialize()
-        return self._context
+        return self.context
 
     async def get_page(self) -> Optional[Page]:
         """
@@ -1170,15 +1317,33 @@ class BrowserAutomation:
         Raises:
             BrowserError: If browser initialization fails
         """
-        if not self._page:
+        if not self.page:
             await self.initialize()
-        return self._page
+        return self.page
 
     def set_page(self, value):
         """
         Set the browser page (for testing/mocking purposes).
         """
-        self._page = value
+        self.page = value
+
+    def set_browser_type(self, browser_type: str) -> None:
+        """
+        Set the browser engine used on the next launch.
+
+        Args:
+            browser_type: "chromium", "firefox" or "webkit"
+        """
+        self.browser_type = browser_type
+
+    def set_headless(self, headless: bool) -> None:
+        """
+        Set whether the browser is launched in headless mode on the next launch.
+
+        Args:
+            headless: True to run without a visible window
+        """
+        self.headless = headless
 
     async def _detect_login_form(self) -> dict:
         """
@@ -1201,80 +1366,37 @@ class BrowserAutomation:
         forms = await page.query_selector_all("form")
         candidates = []
 
-        async def get_label_text(field):
-            # Try to find a label associated with the field
-            try:
-                id_attr = await field.get_attribute("id")
-                if id_attr:
-                    label = await page.query_selector(f"label[for='{id_attr}']")
-                    if label:
-                        return (await label.inner_text()).strip().lower()
-                # Try parent label
-                parent = await field.evaluate_handle("el => el.parentElement")
-                if parent:
-                    tag = await parent.evaluate("el => el.tagName")
-                    if tag and tag.lower() == "label":
-                        return (await parent.inner_text()).strip().lower()
-            except Exception:
-                pass
-            return ""
-
-        async def score_field(field, field_type):
-            # Score based on label, placeholder, name, and type
-            score = 0
-            try:
-                label = (await get_label_text(field)) or ""
-                placeholder = (await field.get_attribute("placeholder") or "").lower()
-                name = (await field.get_attribute("name") or "").lower()
-                input_type = (await field.get_attribute("type") or "").lower()
-                # Username/email field
-                if field_type == "username":
-                    if "user" in label or "user" in placeholder or "user" in name:
-                        score += 2
-                    if "email" in label or "email" in placeholder or "email" in name:
-                        score += 2
-                    if input_type == "email":
-                        score += 1.5
-                # Password field
-                if field_type == "password":
-                    if "pass" in label or "pass" in placeholder or "pass" in name:
-                        score += 2
-                    if input_type == "password":
-                        score += 2
-                # General
-                if "login" in label or "login" in placeholder or "login" in name:
-                    score += 0.5
-            except Exception:
-                pass
-            return score
-
         # Consider all forms, not just the first
         for form in forms:
             try:
-                # Find all input fields in the form
-                inputs = await form.query_selector_all("input")
+                # Find all input fields in the form, and read what scoring needs
+                # from all of them in one round trip
+                inputs, rows = await asyncio.gather(
+                    form.query_selector_all("input"),
+                    form.eval_on_selector_all("input", _LOGIN_FIELD_ROWS_JS)
+                )
+                if len(inputs) != len(rows):
+                    continue  # The form changed between the two reads
                 username_candidates = []
                 password_candidates = []
-                for field in inputs:
-                    input_type = (await field.get_attribute("type") or "").lower()
-                    if input_type in ["text", "email"]:
-                        username_candidates.append(field)
-                    if input_type == "password":
-                        password_candidates.append(field)
-                # Score all username/password candidates
-                for u in username_candidates:
-                    u_score = await score_field(u, "username")
-                    for p in password_candidates:
-                        p_score = await score_field(p, "password")
+                for index, (field, row) in enumerate(zip(inputs, rows)):
+                    if row["type"] in ["text", "email"]:
+                        username_candidates.append((index, field, row))
+                    if row["type"] == "password":
+                        password_candidates.append((index, field, row))
+                if not username_candidates or not password_candidates:
+                    continue
+                # Score each field once, then combine the scores for every pair
+                u_scores = [_score_login_field(row, "username") for _, _, row in username_candidates]
+                p_scores = [_score_login_field(row, "password") for _, _, row in password_candidates]
+                # Check for submit button nearby
+                submit_btn = await form.query_selector("button[type='submit'], input[type='submit']")
+                submit_bonus = 0.5 if submit_btn else 0.0
+                for (u_index, u, _), u_score in zip(username_candidates, u_scores):
+                    for (p_index, p, _), p_score in zip(password_candidates, p_scores):
                         # Proximity: fields close together get a bonus
-                        u_index = inputs.index(u)
-                        p_index = inputs.index(p)
                         proximity = 1.0 if abs(u_index - p_index) <= 2 else 0.0
-                        total_score = u_score + p_score + proximity
-                        # Check for submit button nearby
-                        submit_btn = await form.query_selector("button[type='submit'], input[type='submit']")
-                        if submit_btn:
-                            total_score += 0.5
+                        total_score = u_score + p_score + proximity + submit_bonus
                         candidates.append({
                             "form": form,
                             "username_field": u,
@@ -1286,20 +1408,30 @@ class BrowserAutomation:
 
         # If no forms, fallback to page-level search (high recall, low precision)
         if not candidates:
-            username_fields = await page.query_selector_all("input[type='text'], input[type='email']")
-            password_fields = await page.query_selector_all("input[type='password']")
-            for u in username_fields:
-                u_score = await score_field(u, "username")
-                for p in password_fields:
-                    p_score = await score_field(p, "password")
-                    proximity = 1.0  # Assume close if no form
-                    total_score = u_score + p_score + proximity
-                    candidates.append({
-                        "form": None,
-                        "username_field": u,
-                        "password_field": p,
-                        "score": total_score
-                    })
+            username_selector = "input[type='text'], input[type='email']"
+            password_selector = "input[type='password']"
+            username_fields, password_fields, username_rows, password_rows = await asyncio.gather(
+                page.query_selector_all(username_selector),
+                page.query_selector_all(password_selector),
+                page.eval_on_selector_all(username_selector, _LOGIN_FIELD_ROWS_JS),
+                page.eval_on_selector_all(password_selector, _LOGIN_FIELD_ROWS_JS)
+            )
+            # Skip if the page changed between the reads and the lists no longer line up
+            if (username_fields and password_fields
+                    and len(username_fields) == len(username_rows)
+                    and len(password_fields) == len(password_rows)):
+                u_scores = [_score_login_field(row, "username") for row in username_rows]
+                p_scores = [_score_login_field(row, "password") for row in password_rows]
+                for u, u_score in zip(username_fields, u_scores):
+                    for p, p_score in zip(password_fields, p_scores):
+                        proximity = 1.0  # Assume close if no form
+                        total_score = u_score + p_score + proximity
+                        candidates.append({
+                            "form": None,
+                            "username_field": u,
+                            "password_field": p,
+                            "score": total_score
+                        })
 
         # Rank candidates by score
         candidates = sorted(candidates, key=lambda c: c["score"], reverse=True)
@@ -1412,10 +1544,39 @@ class BrowserAutomation:
         Raises:
             BrowserError: If browser initialization fails
         """
-        if self._initialized and self._browser:
+        if self._initialized and self.browser:
             self.logger.info("Browser already initialized")
             return True
             
+        try:
+            # Launch browser unless one is already running (or shared with us)
+            if not self.browser:
+                await self.launch(headless_override)
+
+            self.context, self.page = await self._new_context_page()
+
+            self.logger.info(f"Initialized {self.browser_type} browser context")
+            self._initialized = True
+            return True
+        except BrowserError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error initializing browser: {e}")
+            raise BrowserError(f"Failed to initialize browser: {str(e)}") from e
+    
+    async def launch(self, headless_override: Optional[bool] = None) -> None:
+        """
+        Start Playwright and launch the browser without opening a context.
+
+        Args:
+            headless_override: If set, overrides self.headless for this launch.
+
+        Raises:
+            BrowserError: If the browser cannot be launched
+        """
+        if self.browser:
+            return
+            
         try:
             # Start Playwright
             self._playwright_instance = async_playwright()
@@ -1435,22 +1596,91 @@ class BrowserAutomation:
             launch_headless = self.headless if headless_override is None else headless_override
 
             # Launch browser
-            self._browser = await browser_class.launch(headless=launch_headless)
-            self._context = await self._browser.new_context()
-            self._page = await self._context.new_page()
-
-            self.logger.info(f"Initialized {self.browser_type} browser (headless={launch_headless})")
-            self._initialized = True
-            return True
+            self.browser = await browser_class.launch(headless=launch_headless)
+            self.logger.info(f"Launched {self.browser_type} browser (headless={launch_headless})")
+        except BrowserError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error initializing browser: {e}")
+            self.logger.error(f"Error launching browser: {e}")
             raise BrowserError(f"Failed to initialize browser: {str(e)}") from e
     
+    async def new_session(self) -> 'BrowserAutomation':
+        """
+        Create a BrowserAutomation that shares this browser process but has
+        its own context and page, so several logins can run side by side.
+
+        Closing the session only closes its context; the browser stays up
+        until this instance is closed.
+
+        Returns:
+            Initialized BrowserAutomation session
+
+        Raises:
+            BrowserError: If the browser cannot be launched
+        """
+        await self.launch()
+        
+        session = BrowserAutomation(self.config_manager)
+        session.browser_type = self.browser_type
+        session.headless = self.headless
+        session.browser = self.browser
+        session._owns_browser = False
+        if self._context_pool:
+            # Take a prewarmed context instead of opening one on the critical path
+            session.context, session.page = self._context_pool.pop()
+            session._initialized = True
+        else:
+            await session.initialize()
+        return session
+    
+    async def prewarm(self, count: int) -> None:
+        """
+        Open browser contexts and pages ahead of time for upcoming sessions.
+
+        The contexts are created concurrently and handed out by new_session().
+        Used contexts are closed rather than recycled, so no cookies or storage
+        carry over from one login to the next.
+
+        Args:
+            count: Number of ready contexts to keep
+
+        Raises:
+            BrowserError: If the browser cannot be launched
+        """
+        await self.launch()
+        missing = count - len(self._context_pool)
+        if missing <= 0:
+            return
+        results = await asyncio.gather(
+            *(self._new_context_page() for _ in range(missing)), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                # Sessions fall back to opening their own context
+                self.logger.warning(f"Error prewarming browser context: {result}")
+            else:
+                self._context_pool.append(result)
+    
+    async def _new_context_page(self) -> Tuple[BrowserContext, Page]:
+        """
+        Open a browser context with one page in the running browser.
+
+        Returns:
+            (context, page) pair
+        """
+        context = await self.browser.new_context()
+        try:
+            return context, await context.new_page()
+        except BaseException:
+            await context.close()
+            raise
+    
     @ErrorHandler.handle_async
     async def login_to_website(self, url: str, username: str, password: str, 
                               callback: Optional[Callable[[Dict[str, Any]], None]] = None, 
                               google_login_method: Optional[str] = None, 
-                              force_prompt: bool = False) -> Dict[str, Any]:
+                              force_prompt: bool = False,
+                              has_google_oauth: Optional[bool] = None) -> Dict[str, Any]:
         """
         Login to a website.
         
@@ -1461,6 +1691,9 @@ class BrowserAutomation:
             callback: Callback function for status updates
             google_login_method: "playwright" or "system_browser" for Google login, or None
             force_prompt: Force prompt for login method selection
+            has_google_oauth: Precheck verdict the caller already has (AppCore
+                              runs it in its own worker pool); None to
+                              precheck here
             
         Returns:
             Status dictionary with login result
@@ -1470,18 +1703,29 @@ class BrowserAutomation:
             BrowserError: If browser initialization fails
             NetworkError: If network error occurs
         """
+        # Check if Google OAuth is available; the page fetch runs while the
+        # browser starts, and its verdict decides whether the Google flow
+        # (navigation, network idle wait, button hunt) runs at all
+        precheck: Optional[asyncio.Task] = None
+        if has_google_oauth is None and not force_prompt and not google_login_method:
+            precheck = asyncio.create_task(precheck_google_oauth_async(url, self.logger))
+        
         # Initialize browser if needed
-        if not self._initialized:
-            await self.initialize()
+        try:
+            if not self._initialized:
+                await self.initialize()
+        except BaseException:
+            if precheck is not None:
+                precheck.cancel()
+            raise
         
         # Determine login strategy
         strategy: LoginStrategy = None
         
-        # Check if Google OAuth is available
-        has_google_oauth = False
-        if not force_prompt and not google_login_method:
+        has_google_oauth = bool(has_google_oauth)
+        if precheck is not None:
             try:
-                has_google_oauth = precheck_google_oauth(url, self.logger)
+                has_google_oauth = await precheck
             except Exception as e:
                 self.logger.error(f"Error in Google OAuth precheck: {e}")
                 has_google_oauth = False
@@ -1539,39 +1783,64 @@ class BrowserAutomation:
         Raises:
             BrowserError: If browser is not initialized
         """
-        if not self._initialized or not self._page:
+        if not self._initialized or not self.page:
             raise BrowserError("Browser not initialized")
         
+        current_url = self.page.url
+        # Done when the URL changes or the title reports success; both are
+        # watched inside Playwright/the page, with no per-second round trips
+        waits = [
+            asyncio.ensure_future(self.page.wait_for_url(
+                lambda page_url: page_url != current_url, wait_until="commit", timeout=timeout * 1000
+            )),
+            asyncio.ensure_future(self.page.wait_for_function(
+                "() => /success|welcome/i.test(document.title)", timeout=timeout * 1000
+            )),
+        ]
+        pending = set(waits)
+        errors: List[BaseException] = []
         try:
-            # Wait for navigation or timeout
-            start_time = time.time()
-            current_url = self._page.url
-            
-            while time.time() - start_time < timeout:
-                await asyncio.sleep(1)
-                
-                # Check if URL changed
-                new_url = self._page.url
-                if new_url != current_url:
-                    self.logger.info(f"URL changed from {current_url} to {new_url}")
-                    return True
-                
-                # Check if page content changed significantly
-                # This is a simple heuristic and might need improvement
-                try:
-                    title = await self._page.title()
-                    if "success" in title.lower() or "welcome" in title.lower():
-                        self.logger.info(f"Page title indicates success: {title}")
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for wait in done:
+                    if wait.exception() is None:
+                        if wait is waits[0]:
+                            self.logger.info(f"URL changed from {current_url} to {self.page.url}")
+                        else:
+                            self.logger.info("Page title indicates success")
                         return True
-                except Exception:
-                    pass
-            
-            self.logger.warning(f"Timeout waiting for user action after {timeout} seconds")
-            return False
-        except Exception as e:
-            self.logger.error(f"Error waiting for user action: {e}")
-            raise BrowserError(f"Error waiting for user action: {str(e)}") from e
+                    errors.append(wait.exception())
+        finally:
+            for wait in pending:
+                wait.cancel()
+
+        unexpected = [e for e in errors if not isinstance(e, PlaywrightTimeoutError)]
+        if unexpected:
+            self.logger.error(f"Error waiting for user action: {unexpected[0]}")
+            raise BrowserError(f"Error waiting for user action: {str(unexpected[0])}") from unexpected[0]
+        self.logger.warning(f"Timeout waiting for user action after {timeout} seconds")
+        return False
     
+    async def _close_all(self, targets: List[Any], what: str) -> None:
+        """
+        Close several Playwright objects concurrently, logging any failures.
+
+        Args:
+            targets: Objects with an async close() method
+            what: Description used in warnings
+
+        Raises:
+            KeyboardInterrupt, SystemExit: If one of the closes was interrupted
+        """
+        results = await asyncio.gather(*(target.close() for target in targets), return_exceptions=True)
+        for result in results:
+            # A close that was cancelled returns CancelledError, which is not an Exception
+            if isinstance(result, BaseException):
+                self.logger.warning(f"Error closing {what}: {result!r}")
+        for result in results:
+            if isinstance(result, (KeyboardInterrupt, SystemExit)):
+                raise result
+
     @ErrorHandler.handle_async
     async def close(self) -> None:
         """
@@ -1580,34 +1849,29 @@ class BrowserAutomation:
         Raises:
             BrowserError: If error occurs while closing browser
         """
-        if not self._initialized:
+        if not self._initialized and not (self._owns_browser and self.browser):
             return
 
+        # Prewarmed contexts that no session took
+        pool, self._context_pool = self._context_pool, []
+
         try:
-            # Always use the property (which prefers injected mocks) for closing
             page = self.page
             context = self.context
-            browser = self.browser
+            # A session leaves the shared browser to its parent
+            browser = self.browser if self._owns_browser else None
 
-            # Close page if it exists
+            # Each level is one concurrent batch of independent closes; pages
+            # go before their contexts and contexts before the browser
             if page:
-                try:
-                    await page.close()
-                except Exception as e:
-                    self.logger.warning(f"Error closing page: {e}")
-            # Close context if it exists
+                await self._close_all([page], "page")
+            contexts = [pooled_context for pooled_context, _ in pool]
             if context:
-                try:
-                    await context.close()
-                except Exception as e:
-                    self.logger.warning(f"Error closing context: {e}")
-            # Close browser
+                contexts.append(context)
+            await self._close_all(contexts, "context")
             if browser:
-                try:
-                    await browser.close()
-                except Exception as e:
-                    self.logger.warning(f"Error closing browser: {e}")
-                self._browser = None
+                await self._close_all([browser], "browser")
+            self.browser = None
 
             # Close Playwright
             if self._playwright_instance:
@@ -1615,18 +1879,10 @@ class BrowserAutomation:
                 self._playwright_instance = None
                 self._playwright = None
 
-            self._context = None
-            self._page = None
+            self.context = None
+            self.page = None
             self._initialized = False
 
-            # Also clear injected mocks after closing
-            if "browser" in self.__dict__:
-                self.__dict__["browser"] = None
-            if "context" in self.__dict__:
-                self.__dict__["context"] = None
-            if "page" in self.__dict__:
-                self.__dict__["page"] = None
-
             self.logger.info("Browser closed")
         except RuntimeError as e:
             if "Event loop is closed" in str(e):
@@ -5,23 +5,115 @@ Handles secure storage and retrieval of website credentials.
 
 import os
 import json
+import atexit
 import base64
 import datetime
 import secrets
 import hashlib
+import hmac
+import mmap
+import threading
 from typing import Dict, Optional, Any, Union, List, Tuple, Dict, Set
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.fernet import InvalidToken
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.exceptions import InvalidTag
+
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib json module
+    orjson = None
+
 from ..utils.logger import Logger
 from ..utils.config_manager import ConfigManager
 
+def _dump_json(data: Any) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+def _load_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode())
+
+def _open_private(path: str):
+    """Open a file for binary writing, created with 0600 permissions (only owner can read/write)."""
+    return os.fdopen(os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600), "wb")
+
+def _normalize_url(url: str) -> str:
+    """Remove trailing slashes so a site has a single key."""
+    return url.rstrip('/')
+
+class GCMCipher:
+    """
+    AES-256-GCM cipher with the same encrypt/decrypt interface as Fernet.
+    
+    Tokens are laid out as MAGIC || nonce (12 bytes) || ciphertext || tag.
+    Tokens without the magic prefix are treated as legacy Fernet tokens and
+    decrypted with the same key, so existing credential files keep loading
+    and are rewritten in the new format on the next save.
+    """
+    
+    MAGIC = b"AGC1"
+    NONCE_SIZE = 12
+    
+    def __init__(self, key: bytes) -> None:
+        """
+        Initialize cipher with a raw 32-byte key.
+        
+        Args:
+            key: Raw 256-bit key
+        """
+        self._aead = AESGCM(key)
+        self._legacy = Fernet(base64.urlsafe_b64encode(key))
+    
+    def encrypt(self, data: bytes) -> bytes:
+        """
+        Encrypt data under a fresh random nonce.
+        
+        Args:
+            data: Plaintext bytes
+            
+        Returns:
+            Encrypted token
+        """
+        nonce = os.urandom(self.NONCE_SIZE)
+        return self.MAGIC + nonce + self._aead.encrypt(nonce, data, None)
+    
+    def decrypt(self, token) -> bytes:
+        """
+        Authenticate and decrypt a token.
+        
+        Args:
+            token: Encrypted token; any bytes-like object (including an mmap)
+                   is accepted and is not copied before decryption
+            
+        Returns:
+            Plaintext bytes
+            
+        Raises:
+            InvalidToken: If the key is wrong or the token was tampered with
+        """
+        with memoryview(token) as view:
+            header = len(self.MAGIC)
+            if view[:header] != self.MAGIC:
+                return self._legacy.decrypt(bytes(view))
+            try:
+                return self._aead.decrypt(
+                    view[header:header + self.NONCE_SIZE],
+                    view[header + self.NONCE_SIZE:],
+                    None
+                )
+            except InvalidTag as e:
+                raise InvalidToken from e
+
 class CredentialManager:
     """
     Manages secure storage and retrieval of website credentials.
-    Uses Fernet symmetric encryption for local credential storage.
+    Uses AES-256-GCM authenticated encryption for local credential storage.
     """
     
     def __init__(self, config_manager: ConfigManager, master_password: Optional[str] = None) -> None:
@@ -32,6 +124,9 @@ class CredentialManager:
             config_manager: Application configuration manager
             master_password: Master password for encryption.
                            If None, will prompt user during first use.
+                           
+        Raises:
+            ValueError: If master password is given but cannot be used
         """
         self.logger = Logger("CredentialManager")
         self.logger.debug(f"CredentialManager __init__ called with master_password={'***' if master_password else None}")
@@ -52,20 +147,37 @@ class CredentialManager:
         
         # Initialize credentials dictionary first to avoid AttributeError
         self.credentials: Dict[str, Dict[str, Any]] = {}
+        # Whether the last load_credentials() call succeeded
+        self.is_loaded = False
+        
+        # With a debounce, save_credentials() only marks the credentials dirty
+        # and one write happens after the delay (or on flush()), however many
+        # changes came in meanwhile
+        self._autosave_delay = self.config_manager.get("credential_autosave_debounce_ms", 0) / 1000
+        # _save_lock guards the credentials dict, the dirty flag and the timer;
+        # mutators hold it while they change an entry. _write_lock keeps file
+        # writes in order and is never taken while _save_lock is held
+        self._save_lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
         
         # Initialize or load salt
         self.salt = self._initialize_or_load_salt()
         
         # Set master password if provided, otherwise it will be set during first use
         self._master_password = None
+        self._key: Optional[bytes] = None
         self.cipher_suite = None
         
         if master_password:
             self.logger.debug("Master password provided at initialization; initializing cipher suite.")
-            self.set_master_password(master_password)
+            # A manager constructed with a password always has a cipher suite
+            if not self.set_master_password(master_password):
+                raise ValueError("Failed to initialize cipher suite with the given master password")
             
-            # Load credentials if file exists and cipher suite is initialized
-            if os.path.exists(self.credentials_file) and self.cipher_suite:
+            # Load credentials if file exists
+            if os.path.exists(self.credentials_file):
                 self.logger.debug("Credentials file exists and cipher suite initialized; loading credentials.")
                 self.load_credentials()
         else:
@@ -91,15 +203,42 @@ class CredentialManager:
             else:
                 # Generate new salt with cryptographically secure random number generator
                 salt = secrets.token_bytes(32)  # Increased from 16 to 32 bytes for better security
-                with open(self.salt_file, "wb") as f:
+                with _open_private(self.salt_file) as f:
                     f.write(salt)
-                # Set secure permissions on salt file (0600 - only owner can read/write)
-                os.chmod(self.salt_file, 0o600)
                 return salt
         except IOError as e:
             self.logger.error(f"Failed to access salt file {self.salt_file}: {e}")
             raise IOError(f"Failed to access salt file: {e}") from e
     
+    def _derive_key(self, password: str) -> bytes:
+        """
+        Derive an encryption key from a password and the stored salt.
+        
+        The key for the current master password is kept while the cipher
+        suite is active, so deriving it again skips the 600 000 PBKDF2 rounds.
+        Other passwords (for example a wrong one being verified) are never
+        cached.
+        
+        Args:
+            password: Password to derive the key from
+            
+        Returns:
+            Raw 32-byte key
+        """
+        if self._key is not None and hmac.compare_digest(password.encode(), self._master_password.encode()):
+            return self._key
+        
+        # Derive key from password with stronger parameters. hashlib runs
+        # OpenSSL's PBKDF2 loop directly, without the cryptography KDF object
+        key = hashlib.pbkdf2_hmac(
+            "sha256",
+            password.encode(),
+            self.salt,
+            600000,  # Increased from 100000 to 600000 for better security
+            dklen=32
+        )
+        return key
+    
     def _initialize_cipher_suite(self) -> None:
         """
         Initialize cipher suite with derived key from master password.
@@ -114,16 +253,10 @@ class CredentialManager:
             raise ValueError("Master password not set")
         
         try:
-            # Derive key from password with stronger parameters
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=self.salt,
-                iterations=600000,  # Increased from 100000 to 600000 for better security
-                backend=default_backend()
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(self._master_password.encode()))
-            self.cipher_suite = Fernet(key)
+            # The previous key belongs to the previous password
+            self._key = None
+            self._key = self._derive_key(self._master_password)
+            self.cipher_suite = GCMCipher(self._key)
             self.logger.debug("Cipher suite successfully initialized.")
         except Exception as e:
             self.logger.error(f"Failed to initialize cipher suite: {e}")
@@ -159,10 +292,14 @@ class CredentialManager:
             self._master_password = password
             self._initialize_cipher_suite()
             
-            # If we had existing credentials, re-encrypt them with new key
-            if old_cipher_suite and old_credentials:
+            # If we had existing credentials, re-encrypt them with new key.
+            # This write is never deferred: the file must not stay under the
+            # old key once the in-memory state has moved on
+            if old_cipher_suite and (old_credentials or self._dirty):
                 self.credentials = old_credentials
                 self.save_credentials()
+                if not self.flush():
+                    return False
             
             return True
         except ValueError as e:
@@ -178,10 +315,32 @@ class CredentialManager:
             # Clear password from memory
             password = None
     
+    def verify_password(self, password: str) -> bool:
+        """
+        Check whether a password is the current master password.
+        
+        The key derived from the candidate is compared in constant time with
+        the active key, so the answer does not depend on what is on disk
+        (which may still be waiting for a debounced write).
+        
+        Args:
+            password: Candidate master password
+            
+        Returns:
+            True if the password is correct, False otherwise
+        """
+        if not password or not self._key:
+            return False
+        
+        return hmac.compare_digest(self._derive_key(password), self._key)
+    
     def load_credentials(self) -> bool:
         """
         Load encrypted credentials from file.
 
+        The result is also kept in is_loaded, so callers of the constructor
+        can check whether it loaded the file without decrypting it again.
+
         Returns:
             True if successful, False otherwise
 
@@ -192,24 +351,33 @@ class CredentialManager:
             self.logger.error("Cipher suite not initialized")
             raise RuntimeError("Cipher suite not initialized. Please set the master password before loading credentials.")
 
+        self.is_loaded = False
         if not os.path.exists(self.credentials_file):
             self.logger.info("No credentials file found, starting with empty credentials")
             self.credentials = {}
+            self.is_loaded = True
             return True
 
         try:
+            # Decrypt straight out of a read-only mapping instead of copying
+            # the ciphertext into a separate buffer first
             with open(self.credentials_file, "rb") as f:
-                encrypted_data = f.read()
+                if os.fstat(f.fileno()).st_size == 0:
+                    decrypted_data = self.cipher_suite.decrypt(b"")
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as encrypted_data:
+                        decrypted_data = self.cipher_suite.decrypt(encrypted_data)
 
-            decrypted_data = self.cipher_suite.decrypt(encrypted_data)
-            self.credentials = json.loads(decrypted_data.decode())
+            self.credentials = _load_json(decrypted_data)
 
-            # Migrate credentials to ensure 'login_strategy' field exists for all
+            # Migrate credentials to ensure 'login_strategy' and 'google_login'
+            # fields exist for all, so readers don't need to default them
             for cred in self.credentials.values():
-                if "login_strategy" not in cred:
-                    cred["login_strategy"] = None
+                cred.setdefault("login_strategy", None)
+                cred.setdefault("google_login", False)
 
             self.logger.info(f"Loaded {len(self.credentials)} credential entries")
+            self.is_loaded = True
             return True
         except FileNotFoundError as e:
             self.logger.error(f"Credentials file not found: {e}")
@@ -232,8 +400,13 @@ class CredentialManager:
         """
         Save encrypted credentials to file.
         
+        With credential_autosave_debounce_ms set, the write is deferred by that
+        long and coalesced with any other saves requested in the meantime; call
+        flush() to write pending changes immediately. Pending changes are also
+        written at interpreter exit.
+        
         Returns:
-            True if successful, False otherwise
+            True if successful (or scheduled), False otherwise
             
         Raises:
             RuntimeError: If cipher suite is not initialized
@@ -243,40 +416,104 @@ class CredentialManager:
             self.logger.error("Cipher suite not initialized")
             raise RuntimeError("Cipher suite not initialized. Please set the master password before saving credentials.")
         
-        try:
-            # Convert credentials to JSON string
-            credentials_json = json.dumps(self.credentials)
-            
-            # Encrypt the JSON string
-            encrypted_data = self.cipher_suite.encrypt(credentials_json.encode())
+        if self._autosave_delay <= 0:
+            return self._write_credentials()
+        
+        with self._save_lock:
+            self._dirty = True
+            self._schedule_flush()
+        self.logger.debug("save_credentials EXIT: write scheduled")
+        return True
+    
+    def _schedule_flush(self) -> None:
+        """Start the debounce timer unless one is pending; call with _save_lock held."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self._autosave_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+            # The timer thread is a daemon, so write pending changes at
+            # interpreter exit as well
+            atexit.register(self.flush)
+    
+    def _cancel_flush(self) -> None:
+        """Stop the debounce timer and its exit hook, if any; call with _save_lock held."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+            atexit.unregister(self.flush)
+    
+    def flush(self) -> bool:
+        """
+        Write credentials changed since the last write, if any.
+        
+        Returns:
+            True if nothing was pending or the write succeeded, False otherwise
+        """
+        with self._save_lock:
+            self._cancel_flush()
+            if not self._dirty:
+                return True
+            if not self.cipher_suite:
+                self.logger.error("Cannot write pending credentials: cipher suite not initialized")
+                return False
+        return self._write_credentials()
+    
+    def _write_credentials(self) -> bool:
+        """
+        Encrypt all credentials and write them to file.
+        
+        The credentials are copied under _save_lock, so other threads can keep
+        changing them while the copy is encrypted and written. If the write
+        fails the changes stay pending: the dirty flag is set again and, with
+        a debounce, another write is scheduled.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        with self._write_lock:
+            with self._save_lock:
+                # Nested values such as last_login are replaced, never changed
+                # in place, so copying each entry gives a consistent snapshot
+                credentials = {url: dict(cred) for url, cred in self.credentials.items()}
+                cipher_suite = self.cipher_suite
+                self._dirty = False
+            try:
+                # Convert credentials to JSON bytes
+                credentials_json = _dump_json(credentials)
             
-            # Write encrypted data to file with secure permissions
-            # First write to a temporary file, then rename for atomicity
-            temp_file = f"{self.credentials_file}.tmp"
-            with open(temp_file, "wb") as f:
-                f.write(encrypted_data)
+                # Encrypt the JSON bytes
+                encrypted_data = cipher_suite.encrypt(credentials_json)
             
-            # Set secure permissions (0600 - only owner can read/write)
-            os.chmod(temp_file, 0o600)
+                # Write encrypted data to file with secure permissions
+                # First write to a temporary file, then rename for atomicity
+                temp_file = f"{self.credentials_file}.tmp"
+                with _open_private(temp_file) as f:
+                    f.write(encrypted_data)
+                    f.flush()
+                    os.fsync(f.fileno())
             
-            # Rename for atomic update
-            os.replace(temp_file, self.credentials_file)
+                # Rename for atomic update
+                os.replace(temp_file, self.credentials_file)
             
-            self.logger.info(f"Saved {len(self.credentials)} credential entries")
-            self.logger.debug("save_credentials EXIT: result=True")
-            return True
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to serialize credentials to JSON: {e}")
-            self.logger.debug("save_credentials EXIT: result=False (JSONDecodeError)")
-            return False
-        except IOError as e:
-            self.logger.error(f"I/O error writing credentials file: {e}")
-            self.logger.debug("save_credentials EXIT: result=False (IOError)")
-            return False
-        except Exception as e:
-            self.logger.error(f"Unexpected error saving credentials: {e}")
-            self.logger.debug("save_credentials EXIT: result=False (Exception)")
-            return False
+                self.logger.info(f"Saved {len(credentials)} credential entries")
+                self.logger.debug("save_credentials EXIT: result=True")
+                return True
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Failed to serialize credentials to JSON: {e}")
+                self.logger.debug("save_credentials EXIT: result=False (JSONDecodeError)")
+            except IOError as e:
+                self.logger.error(f"I/O error writing credentials file: {e}")
+                self.logger.debug("save_credentials EXIT: result=False (IOError)")
+            except Exception as e:
+                self.logger.error(f"Unexpected error saving credentials: {e}")
+                self.logger.debug("save_credentials EXIT: result=False (Exception)")
+        
+        # Keep the changes pending so a later flush (or the retry) writes them
+        with self._save_lock:
+            self._dirty = True
+            if self._autosave_delay > 0:
+                self._schedule_flush()
+        return False
     
     def add_website(self, url: str, username: str, password: str,
                    has_bonus: bool = False, notes: str = "", login_strategy: Optional[str] = None, google_login: bool = False) -> bool:
@@ -313,20 +550,22 @@ class CredentialManager:
 
         try:
             # Normalize URL (remove trailing slash)
-            url = url.rstrip('/')
+            url = _normalize_url(url)
 
             # Add or update credentials
-            self.credentials[url] = {
-                "username": username,
-                "password": password,
-                "has_bonus": has_bonus,
-                "notes": notes,
-                "last_login": None,  # Will be updated after successful login
-                "created_at": datetime.datetime.now().isoformat(),
-                "updated_at": datetime.datetime.now().isoformat(),
-                "login_strategy": login_strategy,
-                "google_login": google_login
-            }
+            now = datetime.datetime.now().isoformat()
+            with self._save_lock:
+                self.credentials[url] = {
+                    "username": username,
+                    "password": password,
+                    "has_bonus": has_bonus,
+                    "notes": notes,
+                    "last_login": None,  # Will be updated after successful login
+                    "created_at": now,
+                    "updated_at": now,
+                    "login_strategy": login_strategy,
+                    "google_login": google_login
+                }
 
             # Log the current state (without sensitive data)
             self.logger.debug(f"add_website: Added/updated URL '{url}'. Credentials now: {list(self.credentials.keys())}")
@@ -367,7 +606,7 @@ class CredentialManager:
             raise ValueError("Website URL cannot be empty")
             
         # Normalize URL (remove trailing slash)
-        url = url.rstrip('/')
+        url = _normalize_url(url)
             
         if url not in self.credentials:
             self.logger.warning(f"Website not found: {url}")
@@ -375,7 +614,8 @@ class CredentialManager:
         
         try:
             # Remove credentials
-            del self.credentials[url]
+            with self._save_lock:
+                del self.credentials[url]
             
             # Save updated credentials
             return self.save_credentials()
@@ -409,18 +649,14 @@ class CredentialManager:
             raise ValueError("Website URL cannot be empty")
 
         # Normalize URL (remove trailing slash)
-        url = url.rstrip('/')
+        url = _normalize_url(url)
 
         cred = self.credentials.get(url)
         if cred is None:
             return None
-        # Always return a copy with 'login_strategy' present
-        cred_copy = dict(cred)
-        if "login_strategy" not in cred_copy:
-            cred_copy["login_strategy"] = None
-        if "google_login" not in cred_copy:
-            cred_copy["google_login"] = False
-        return cred_copy
+        # Always return a copy; 'login_strategy' and 'google_login' are
+        # guaranteed present by add_website() and load_credentials()
+        return dict(cred)
     
     def get_all_websites(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -436,15 +672,10 @@ class CredentialManager:
             self.logger.error("Cipher suite not initialized")
             raise RuntimeError("Cipher suite not initialized. Please set the master password before retrieving credentials.")
 
-        # Return a dict of credentials, each with 'login_strategy' present
-        return {
-            url: {
-                **cred,
-                "login_strategy": cred.get("login_strategy", None),
-                "google_login": cred.get("google_login", False)
-            }
-            for url, cred in self.credentials.items()
-        }
+        # Return copies, so callers never hold on to (or modify) the stored
+        # entries; 'login_strategy' and 'google_login' are already present
+        with self._save_lock:
+            return {url: dict(cred) for url, cred in self.credentials.items()}
     
     def get_bonus_websites(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -460,7 +691,8 @@ class CredentialManager:
             self.logger.error("Cipher suite not initialized")
             raise RuntimeError("Cipher suite not initialized. Please set the master password before retrieving credentials.")
             
-        return {url: data for url, data in self.credentials.items() if data.get("has_bonus", False)}
+        with self._save_lock:
+            return {url: data for url, data in self.credentials.items() if data.get("has_bonus", False)}
     
     def update_last_login(self, url: str, success: bool) -> bool:
         """
@@ -486,7 +718,7 @@ class CredentialManager:
             raise ValueError("Website URL cannot be empty")
             
         # Normalize URL (remove trailing slash)
-        url = url.rstrip('/')
+        url = _normalize_url(url)
             
         if url not in self.credentials:
             self.logger.warning(f"Website not found: {url}")
@@ -494,10 +726,11 @@ class CredentialManager:
         
         try:
             # Update last login
-            self.credentials[url]["last_login"] = {
-                "timestamp": datetime.datetime.now().isoformat(),
-                "success": success
-            }
+            with self._save_lock:
+                self.credentials[url]["last_login"] = {
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "success": success
+                }
             
             # Save updated credentials
             return self.save_credentials()
@@ -508,6 +741,48 @@ class CredentialManager:
             self.logger.error(f"Error updating last login for {url}: {e}")
             return False
     
+    def update_last_login_bulk(self, updates: Dict[str, bool]) -> bool:
+        """
+        Update last login timestamps for several websites with a single save.
+        
+        Args:
+            updates: Mapping of website URL to whether its login was successful
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            RuntimeError: If cipher suite is not initialized
+        """
+        if not self.cipher_suite:
+            self.logger.error("Cipher suite not initialized")
+            raise RuntimeError("Cipher suite not initialized. Please set the master password before updating credentials.")
+        
+        if not updates:
+            return True
+        
+        timestamp = datetime.datetime.now().isoformat()
+        updated = 0
+        with self._save_lock:
+            for url, success in updates.items():
+                # Normalize URL (remove trailing slash)
+                url = _normalize_url(url)
+                cred = self.credentials.get(url)
+                if cred is None:
+                    self.logger.warning(f"Website not found: {url}")
+                    continue
+                cred["last_login"] = {
+                    "timestamp": timestamp,
+                    "success": success
+                }
+                updated += 1
+        
+        if not updated:
+            return False
+        
+        # Save updated credentials once for the whole batch
+        return self.save_credentials()
+    
     def change_website_password(self, url: str, new_password: str, login_strategy: Optional[str] = None) -> bool:
         """
         Change password and/or login strategy for a website.
@@ -537,7 +812,7 @@ class CredentialManager:
             raise ValueError("Password cannot be empty")
 
         # Normalize URL (remove trailing slash)
-        url = url.rstrip('/')
+        url = _normalize_url(url)
 
         if url not in self.credentials:
             self.logger.warning(f"Website not found: {url}")
@@ -545,10 +820,12 @@ class CredentialManager:
 
         try:
             # Update password
-            self.credentials[url]["password"] = new_password
-            self.credentials[url]["updated_at"] = datetime.datetime.now().isoformat()
-            if login_strategy is not None:
-                self.credentials[url]["login_strategy"] = login_strategy
+            with self._save_lock:
+                cred = self.credentials[url]
+                cred["password"] = new_password
+                cred["updated_at"] = datetime.datetime.now().isoformat()
+                if login_strategy is not None:
+                    cred["login_strategy"] = login_strategy
 
             # Save updated credentials
             return self.save_credentials()
@@ -562,10 +839,19 @@ class CredentialManager:
     def clear_memory(self) -> None:
         """
         Clear sensitive data from memory.
+        
+        Pending debounced changes are written first, while the key is still
+        available. The derived key is dropped as well.
         """
-        self._master_password = None
-        self.cipher_suite = None
-        self.credentials = {}
+        self.flush()
+        with self._save_lock:
+            # Anything still unwritten cannot be saved without the key
+            self._cancel_flush()
+            self._dirty = False
+            self._master_password = None
+            self._key = None
+            self.cipher_suite = None
+            self.credentials = {}
         
     @property
     def master_password(self) -> Optional[str]:
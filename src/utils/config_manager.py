@@ -113,7 +113,13 @@ class ConfigManager:
             "first_run": True,
             "check_updates": True,
             "log_level": "INFO",
-            "post_login_delay": 5  # Default post-login delay in seconds
+            "post_login_delay": 5,  # Default post-login delay in seconds
+            "max_concurrent_logins": 4,  # Sites logged in to at once during batch login
+            "oauth_precheck_ttl": 3600,  # Seconds a Google OAuth precheck result is reused
+            "max_task_history": 512,  # Finished login tasks kept for status lookups
+            "task_history_ttl": 86400,  # Seconds a finished login task is kept
+            "asyncio_debug": False,  # Run the background event loop in asyncio debug mode
+            "credential_autosave_debounce_ms": 0  # Coalesce credential saves within this window (0 writes immediately)
         }
     
     def get(self, key: str, default: Any = None) -> Any:
@@ -116,7 +116,7 @@ class TestLazyLoading(unittest.TestCase):
             self.container.register_factory("browser_automation", lambda: mock_browser_automation(self.config_manager))
 
             # Create app core
-            app_core = AppCore(self.container)
+            app_core = AppCore.from_container(self.container)
 
             # Check that browser automation was not created yet
             mock_browser_automation.assert_not_called()
@@ -137,9 +137,9 @@ class TestLazyLoading(unittest.TestCase):
 
             # Call a method that uses browser automation with the new test URL
             task_id = app_core.login_to_website("https://the-internet.herokuapp.com/login")
-            # Wait for the login thread to finish to ensure lazy instantiation occurs
+            # Wait for the login task to finish to ensure lazy instantiation occurs
             if task_id is not None:
-                app_core.login_tasks[task_id]["thread"].join()
+                app_core.login_tasks[task_id].future.result()
 
             # Check that browser automation was created
             mock_browser_automation.assert_called_once()
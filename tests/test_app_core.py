@@ -7,7 +7,7 @@ import pytest
 import asyncio
 from unittest.mock import patch, MagicMock
 
-from src.core.app_core import AppCore
+from src.core.app_core import AppCore, LoginTask, LoginTaskHistory
 
 class TestAppCore:
     """Test suite for the AppCore class."""
@@ -22,7 +22,7 @@ class TestAppCore:
 
         # Create app core with patching applied before instantiation
         with patch('src.core.app_core.CredentialManager') as mock_cm, \
-             patch('src.core.app_core.BrowserAutomation') as mock_ba:
+             patch('src.core.browser_automation.BrowserAutomation') as mock_ba:
             
             # Set up mocks
             mock_cm_instance = MagicMock()
@@ -44,12 +44,44 @@ class TestAppCore:
             mock_cm.assert_called_once_with(config_manager, "TestPassword123!")
             mock_ba.assert_called_once_with(config_manager)
     
+    def test_factories(self, config_manager):
+        """Test the from_container and from_config constructors."""
+        from src.core.service_container import ServiceContainer
+
+        container = ServiceContainer()
+        container.register("config_manager", config_manager)
+
+        from_container = AppCore.from_container(container)
+        assert from_container.container is container
+        assert from_container.config_manager is config_manager
+
+        from_config = AppCore.from_config(config_manager)
+        assert from_config.container is None
+        assert from_config.config_manager is config_manager
+
+        with pytest.raises(TypeError):
+            AppCore(object())
+        with pytest.raises(TypeError):
+            AppCore()
+
+    def test_initialize_reuses_credential_manager(self, config_manager):
+        """Test that initialize reuses a supplied credential manager."""
+        with patch('src.core.app_core.CredentialManager') as mock_cm:
+            existing = MagicMock()
+            app_core = AppCore(config_manager)
+
+            result = app_core.initialize("TestPassword123!", existing)
+
+            assert result is True
+            assert app_core.credential_manager is existing
+            mock_cm.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_initialize_async(self, config_manager):
         """Test asynchronous initialization."""
         # Create app core with patching applied before instantiation
         with patch('src.core.app_core.CredentialManager') as mock_cm, \
-             patch('src.core.app_core.BrowserAutomation') as mock_ba:
+             patch('src.core.browser_automation.BrowserAutomation') as mock_ba:
             
             # Set up mocks
             mock_cm_instance = MagicMock()
@@ -120,6 +152,24 @@ class TestAppCore:
         assert result == {"https://example.com": {"username": "testuser", "has_bonus": True}}
         mock_cm.get_bonus_websites.assert_called_once()
     
+    def test_credential_methods_require_initialization(self, config_manager):
+        """Test that forwarders raise CredentialError before initialization."""
+        from src.utils.exceptions import CredentialError
+        
+        app_core = AppCore(config_manager)
+        assert app_core.credential_manager is None
+        
+        with pytest.raises(CredentialError):
+            app_core.get_website("https://example.com")
+        with pytest.raises(CredentialError):
+            app_core.get_all_websites()
+        
+        # Introspection of the stand-in is not mistaken for a credential call
+        import copy
+        assert not hasattr(app_core._cm, "__deepcopy__")
+        assert not hasattr(app_core._cm, "no_such_method")
+        copy.copy(app_core._cm)
+    
     def test_login_to_website(self, config_manager):
         """Test login to website."""
         # Create app core
@@ -138,21 +188,30 @@ class TestAppCore:
             "password": "testpass"
         }
         
-        # Test login_to_website
-        with patch('src.core.app_core.threading.Thread') as mock_thread:
-            # Set up mock thread
-            mock_thread_instance = MagicMock()
-            mock_thread.return_value = mock_thread_instance
-            
+        # Mock the browser login coroutine
+        from unittest.mock import AsyncMock
+        mock_ba.login_to_website = AsyncMock(return_value={
+            "stage": "complete",
+            "success": True,
+            "message": "Login successful"
+        })
+        
+        try:
             # Call login_to_website
             result = app_core.login_to_website("https://example.com")
             
             # Verify result
             assert result is not None
-            assert "https://example.com" in app_core.login_tasks[result]["url"]
+            assert "https://example.com" in app_core.login_tasks[result].url
             mock_cm.get_website.assert_called_once_with("https://example.com")
-            mock_thread.assert_called_once()
-            mock_thread_instance.start.assert_called_once()
+            
+            # The login runs as a task on the shared event loop
+            status = app_core.login_tasks[result].future.result(timeout=5)
+            assert status["success"] is True
+            assert app_core.get_login_status(result)["status"] == "complete"
+            mock_cm.update_last_login.assert_called_once_with("https://example.com", True)
+        finally:
+            app_core.close()
     
     @pytest.mark.asyncio
     async def test_login_to_website_async(self, config_manager):
@@ -182,18 +241,286 @@ class TestAppCore:
         })
         
         # Call login_to_website_async
-        result = await app_core.login_to_website_async("https://example.com")
+        with patch('src.core.browser_automation._scan_login_page', return_value=False) as mock_precheck:
+            result = await app_core.login_to_website_async("https://example.com")
         
         # Verify result
+        mock_precheck.assert_called_once()
         assert result["stage"] == "complete"
         assert result["success"] is True
         mock_cm.get_website.assert_called_once_with("https://example.com")
         mock_ba.login_to_website.assert_called_once_with(
             "https://example.com", "testuser", "testpass", None, 
-            google_login_method=None, force_prompt=False
+            google_login_method=None, force_prompt=False, has_google_oauth=False
         )
         mock_cm.update_last_login.assert_called_once_with("https://example.com", True)
     
+    @pytest.mark.asyncio
+    async def test_login_to_websites_async(self, config_manager):
+        """Test concurrent login to several websites with one session each."""
+        from unittest.mock import AsyncMock
+        
+        # Create app core
+        app_core = AppCore(config_manager)
+        
+        # Set up mocks
+        mock_cm = MagicMock()
+        mock_cm.get_website.return_value = {"username": "testuser", "password": "testpass"}
+        mock_ba = MagicMock()
+        mock_ba.prewarm = AsyncMock()
+        sessions = []
+        
+        async def new_session():
+            session = MagicMock()
+            session.login_to_website = AsyncMock(return_value={
+                "stage": "complete", "success": True, "message": "Login successful"
+            })
+            session.close = AsyncMock()
+            sessions.append(session)
+            return session
+        
+        mock_ba.new_session = new_session
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+        app_core.is_initialized = True
+        
+        urls = ["https://example1.com", "https://example2.com"]
+        with patch('src.core.browser_automation._scan_login_page', return_value=False):
+            results = await app_core.login_to_websites_async(urls, max_concurrency=2)
+        
+        # Verify results
+        assert list(results) == urls
+        assert all(status["success"] is True for status in results.values())
+        mock_ba.prewarm.assert_awaited_once_with(2)
+        assert len(sessions) == 2
+        for session in sessions:
+            session.login_to_website.assert_awaited_once()
+            session.close.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_login_to_website_async_skips_precheck_with_method(self, config_manager):
+        """Test that no Google OAuth scan runs when the login method is given."""
+        from unittest.mock import AsyncMock
+        
+        app_core = AppCore(config_manager)
+        mock_cm = MagicMock()
+        mock_cm.get_website.return_value = {"username": "testuser", "password": "testpass"}
+        mock_ba = MagicMock()
+        mock_ba.login_to_website = AsyncMock(return_value={
+            "stage": "complete", "success": True, "message": "Login successful"
+        })
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+        
+        with patch('src.core.browser_automation._scan_login_page') as mock_precheck:
+            result = await app_core.login_to_website_async(
+                "https://example.com", google_login_method="playwright"
+            )
+        
+        assert result["success"] is True
+        mock_precheck.assert_not_called()
+        assert mock_ba.login_to_website.call_args.kwargs["google_login_method"] == "playwright"
+    
+    @pytest.mark.asyncio
+    async def test_login_to_website_async_coalesces_duplicates(self, config_manager):
+        """Test that concurrent logins to one URL share a single browser login."""
+        app_core = AppCore(config_manager)
+        
+        mock_cm = MagicMock()
+        mock_cm.get_website.return_value = {"username": "testuser", "password": "testpass"}
+        mock_ba = MagicMock()
+        release = asyncio.Event()
+        
+        async def login_to_website(*args, **kwargs):
+            await release.wait()
+            return {"stage": "complete", "success": True, "message": "Login successful"}
+        
+        mock_ba.login_to_website = MagicMock(side_effect=login_to_website)
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+        app_core.is_initialized = True
+        
+        with patch('src.core.browser_automation._scan_login_page', return_value=False):
+            first = asyncio.ensure_future(app_core.login_to_website_async("https://example.com"))
+            # A trailing slash is the same site
+            second = asyncio.ensure_future(app_core.login_to_website_async("https://example.com/"))
+            await asyncio.sleep(0.05)
+            release.set()
+            results = await asyncio.gather(first, second)
+        
+        assert mock_ba.login_to_website.call_count == 1
+        assert results[0] == results[1]
+        assert results[0] is not results[1]
+        assert app_core._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_login_to_website_async_shares_only_matching_calls(self, config_manager):
+        """Test that logins with a different method or callback are not merged."""
+        app_core = AppCore(config_manager)
+        
+        mock_cm = MagicMock()
+        mock_cm.get_website.return_value = {"username": "testuser", "password": "testpass"}
+        mock_ba = MagicMock()
+        release = asyncio.Event()
+        
+        async def login_to_website(*args, **kwargs):
+            await release.wait()
+            return {"stage": "complete", "success": True, "message": "Login successful"}
+        
+        mock_ba.login_to_website = MagicMock(side_effect=login_to_website)
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+        updates = []
+        
+        calls = [
+            app_core.login_to_website_async("https://example.com", google_login_method="playwright"),
+            app_core.login_to_website_async("https://example.com", google_login_method="system_browser"),
+            app_core.login_to_website_async("https://example.com", updates.append,
+                                            google_login_method="playwright"),
+        ]
+        tasks = [asyncio.ensure_future(call) for call in calls]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(*tasks)
+        
+        assert mock_ba.login_to_website.call_count == 3
+        assert app_core._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_login_to_website_async_survives_cancelled_caller(self, config_manager):
+        """Test that cancelling one caller neither cancels the shared login nor fails the others."""
+        app_core = AppCore(config_manager)
+        
+        mock_cm = MagicMock()
+        mock_cm.get_website.return_value = {"username": "testuser", "password": "testpass"}
+        mock_ba = MagicMock()
+        release = asyncio.Event()
+        cancelled = []
+        
+        async def login_to_website(*args, **kwargs):
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return {"stage": "complete", "success": True, "message": "Login successful"}
+        
+        mock_ba.login_to_website = MagicMock(side_effect=login_to_website)
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+        
+        first = asyncio.ensure_future(app_core.login_to_website_async("https://example.com", google_login_method="playwright"))
+        second = asyncio.ensure_future(app_core.login_to_website_async("https://example.com", google_login_method="playwright"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert (await second)["success"] is True
+        assert first.cancelled()
+        assert mock_ba.login_to_website.call_count == 1
+        assert cancelled == []
+        
+        # With no caller left, the login itself is cancelled
+        release.clear()
+        only = asyncio.ensure_future(app_core.login_to_website_async("https://example.com", google_login_method="playwright"))
+        await asyncio.sleep(0.05)
+        only.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await only
+        assert cancelled == [True]
+        assert app_core._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_status_callback_dispatch(self, config_manager):
+        """Test that status callbacks are deferred and receive a copy of the status."""
+        app_core = AppCore(config_manager)
+        received = []
+        
+        # Default: queued on the running loop rather than called inline
+        notify = app_core._bind_status_callback(received.append)
+        status = {"stage": "starting"}
+        notify(status)
+        status["stage"] = "complete"
+        assert received == []
+        await asyncio.sleep(0)
+        assert received == [{"stage": "starting"}]
+        
+        # A custom dispatcher takes over delivery
+        dispatched = []
+        app_core.callback_dispatcher = lambda fn, s: dispatched.append((fn, s))
+        app_core._bind_status_callback(received.append)({"stage": "done"})
+        assert dispatched == [(received.append, {"stage": "done"})]
+        
+        # The GUI hands updates to Tk's after(0, ...)
+        root = MagicMock()
+        app_core.use_tk_dispatcher(root)
+        app_core._bind_status_callback(received.append)({"stage": "tk"})
+        root.after.assert_called_once_with(0, received.append, {"stage": "tk"})
+        
+        assert app_core._bind_status_callback(None) is None
+    
+    @pytest.mark.asyncio
+    async def test_precheck_google_oauth_is_cached(self, config_manager):
+        """Test that precheck results are reused until the TTL expires."""
+        app_core = AppCore(config_manager)
+        
+        with patch('src.core.browser_automation._scan_login_page', return_value=True) as mock_precheck:
+            # Concurrent and repeated checks share one scan
+            results = await asyncio.gather(
+                app_core._precheck_google_oauth("https://example.com"),
+                app_core._precheck_google_oauth("https://example.com")
+            )
+            assert results == [True, True]
+            assert await app_core._precheck_google_oauth("https://example.com") is True
+            mock_precheck.assert_called_once()
+            
+            # Query strings and fragments share the page's entry
+            assert await app_core._precheck_google_oauth("https://example.com?next=/home#top") is True
+            mock_precheck.assert_called_once()
+            
+            # An expired entry triggers a new scan
+            app_core._oauth_cache["https://example.com"] = (0.0, True)
+            config_manager.set("oauth_precheck_ttl", 1)
+            await app_core._precheck_google_oauth("https://example.com")
+            assert mock_precheck.call_count == 2
+            
+            # A failed fetch is reported as False and retried next time
+            mock_precheck.return_value = None
+            assert await app_core._precheck_google_oauth("https://example.org") is False
+            assert "https://example.org" not in app_core._oauth_cache
+        
+        # Finished scans do not linger
+        assert app_core._oauth_scans == {}
+    
+    @pytest.mark.asyncio
+    async def test_precheck_google_oauth_across_loops(self, config_manager):
+        """Test that prechecks of one page from two event loops do not share a future."""
+        import threading
+        import time as time_module
+        
+        app_core = AppCore(config_manager)
+        
+        def slow_scan(url, logger=None):
+            time_module.sleep(0.05)
+            return True
+        
+        with patch('src.core.browser_automation._scan_login_page', side_effect=slow_scan):
+            pending = asyncio.ensure_future(app_core._precheck_google_oauth("https://example.com"))
+            await asyncio.sleep(0)
+            
+            # A UI thread with its own loop asks for the same page meanwhile
+            other = []
+            thread = threading.Thread(
+                target=lambda: other.append(asyncio.run(app_core._precheck_google_oauth("https://example.com")))
+            )
+            thread.start()
+            assert await pending is True
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        
+        assert other == [True]
+        assert app_core._oauth_scans == {}
+    
     def test_get_login_status(self, config_manager):
         """Test get login status."""
         # Create app core
@@ -201,10 +528,7 @@ class TestAppCore:
         
         # Add a task
         task_id = "test-task-id"
-        app_core.login_tasks[task_id] = {
-            "url": "https://example.com",
-            "status": "complete"
-        }
+        app_core.login_tasks[task_id] = LoginTask("https://example.com", "complete")
         
         # Get status
         result = app_core.get_login_status(task_id)
@@ -217,6 +541,31 @@ class TestAppCore:
         result = app_core.get_login_status("non-existent")
         assert result is None
     
+    def test_login_task_history_eviction(self):
+        """Test that the task history drops old finished tasks but keeps running ones."""
+        history = LoginTaskHistory(max_size=2, ttl=60)
+        
+        history["running"] = LoginTask("https://a.com", "starting")
+        history["done1"] = LoginTask("https://b.com", "complete")
+        history["done2"] = LoginTask("https://c.com", "complete")
+        
+        # Over the limit: the oldest finished task goes, the running one stays
+        assert list(history) == ["running", "done2"]
+        
+        # Finished tasks past the TTL are dropped on the next insert
+        history = LoginTaskHistory(max_size=10, ttl=60)
+        history["running"] = LoginTask("https://a.com", "starting", created_at=0.0)
+        history["expired"] = LoginTask("https://b.com", "complete", created_at=0.0)
+        history["recent"] = LoginTask("https://c.com", "complete")
+        assert list(history) == ["running", "recent"]
+    
+    def test_login_task_has_no_instance_dict(self):
+        """Test that login tasks use slots instead of a per-instance dictionary."""
+        task = LoginTask("https://a.com", "starting")
+        assert not hasattr(task, "__dict__")
+        assert task.future is None
+        assert task.to_dict() == {"url": "https://a.com", "status": "starting", "future": None}
+    
     @pytest.mark.asyncio
     async def test_wait_for_user_action_async(self, config_manager):
         """Test asynchronous wait for user action."""
@@ -240,29 +589,25 @@ class TestAppCore:
     
     def test_wait_for_user_action(self, config_manager):
         """Test wait for user action."""
+        from unittest.mock import AsyncMock
+
         # Create app core
         app_core = AppCore(config_manager)
         
         # Set up mock browser automation
         mock_ba = MagicMock()
+        mock_ba.wait_for_user_action = AsyncMock(return_value=True)
         app_core.browser_automation = mock_ba
         
-        # Mock asyncio
-        with patch('src.core.app_core.asyncio') as mock_asyncio:
-            # Set up mock event loop
-            mock_loop = MagicMock()
-            mock_asyncio.new_event_loop.return_value = mock_loop
-            mock_loop.run_until_complete.return_value = True
-            
+        try:
             # Call wait_for_user_action
             result = app_core.wait_for_user_action("test-task-id", timeout=60)
             
             # Verify result
             assert result is True
-            mock_asyncio.new_event_loop.assert_called_once()
-            mock_asyncio.set_event_loop.assert_called_once_with(mock_loop)
-            mock_loop.run_until_complete.assert_called_once()
-            mock_loop.close.assert_called_once()
+            mock_ba.wait_for_user_action.assert_awaited_once_with(60)
+        finally:
+            app_core.close()
     
     @pytest.mark.asyncio
     async def test_close_async(self, config_manager):
@@ -287,50 +632,114 @@ class TestAppCore:
         mock_ba.close.assert_called_once()
         mock_cm.clear_memory.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_close_async_clears_memory_when_browser_close_fails(self, config_manager):
+        """Test that close_async clears credentials even if the browser fails to close."""
+        from unittest.mock import AsyncMock
+
+        app_core = AppCore(config_manager)
+        mock_cm = MagicMock()
+        mock_ba = MagicMock()
+        mock_ba.close = AsyncMock(side_effect=RuntimeError("boom"))
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+
+        await app_core.close_async()
+
+        mock_cm.clear_memory.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_async_without_browser(self, config_manager):
+        """Test that close_async does not create a browser just to close it."""
+        app_core = AppCore(config_manager)
+        with patch('src.core.browser_automation.BrowserAutomation') as mock_ba:
+            await app_core.close_async()
+        mock_ba.assert_not_called()
+        assert app_core._browser_automation is None
+
     def test_close(self, config_manager):
         """Test close."""
+        from unittest.mock import AsyncMock
+
         # Create app core
         app_core = AppCore(config_manager)
         
         # Set up mocks
         mock_cm = MagicMock()
         mock_ba = MagicMock()
+        mock_ba.close = AsyncMock()
         app_core.credential_manager = mock_cm
         app_core.browser_automation = mock_ba
         
-        # Mock asyncio
-        with patch('src.core.app_core.asyncio') as mock_asyncio:
-            # Set up mock event loop
-            mock_loop = MagicMock()
-            mock_asyncio.new_event_loop.return_value = mock_loop
-            
-            # Call close
-            app_core.close()
-            
-            # Verify result
-            mock_asyncio.new_event_loop.assert_called_once()
-            mock_asyncio.set_event_loop.assert_called_once_with(mock_loop)
-            mock_loop.run_until_complete.assert_called_once()
-            mock_loop.close.assert_called_once()
-            mock_cm.clear_memory.assert_called_once()
+        # Close runs the browser shutdown on the background loop, then stops it
+        app_core.close()
+        
+        # Verify result
+        mock_ba.close.assert_awaited_once()
+        mock_cm.clear_memory.assert_called_once()
+        assert app_core._bg_loop is None
+    
+    def test_close_stops_logins_before_releasing_resources(self, config_manager):
+        """Test that close cancels only AppCore's logins, then closes the browser and clears memory together."""
+        import threading
+        from unittest.mock import AsyncMock
+        
+        app_core = AppCore(config_manager)
+        mock_cm = MagicMock()
+        mock_cm.get_website.return_value = {"username": "testuser", "password": "testpass"}
+        mock_ba = MagicMock()
+        app_core.credential_manager = mock_cm
+        app_core.browser_automation = mock_ba
+        order = []
+        cleared = threading.Event()
+        
+        async def login_to_website(*args, **kwargs):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                order.append("login")
+                raise
+        
+        async def close_browser():
+            # Stands in for Playwright's driver connection, which must outlive close
+            assert not driver.done()
+            # Memory is cleared while the browser is still closing
+            assert await asyncio.get_running_loop().run_in_executor(None, cleared.wait, 5)
+            order.append("browser")
+        
+        def clear_memory():
+            order.append("memory")
+            cleared.set()
+        
+        mock_ba.login_to_website = MagicMock(side_effect=login_to_website)
+        mock_ba.close = AsyncMock(side_effect=close_browser)
+        mock_cm.clear_memory.side_effect = clear_memory
+        
+        driver = asyncio.run_coroutine_threadsafe(asyncio.sleep(3600), app_core._get_event_loop())
+        app_core.login_to_website("https://example.com", google_login_method="playwright")
+        app_core.run_async(asyncio.sleep(0.05))
+        
+        app_core.close()
+        
+        assert order == ["login", "memory", "browser"]
+        assert not driver.cancelled()
     
     def test_run_async(self, config_manager):
-        """Test run_async utility method."""
+        """Test that run_async reuses one background event loop."""
         # Create app core
         app_core = AppCore(config_manager)
         
-        # Mock _get_event_loop
-        mock_loop = MagicMock()
-        mock_loop.run_until_complete.return_value = "test_result"
-        app_core._get_event_loop = MagicMock(return_value=mock_loop)
-        
-        # Create mock coroutine
-        mock_coro = MagicMock()
+        async def current_loop():
+            return asyncio.get_running_loop()
         
-        # Call run_async
-        result = app_core.run_async(mock_coro)
+        try:
+            # Both calls run on the same long-lived loop
+            first = app_core.run_async(current_loop())
+            second = app_core.run_async(current_loop())
+            assert first is second
+            assert first is app_core._get_event_loop()
+        finally:
+            app_core.close()
         
-        # Verify result
-        assert result == "test_result"
-        app_core._get_event_loop.assert_called_once()
-        mock_loop.run_until_complete.assert_called_once_with(mock_coro)
+        # Closing stops the loop and its thread
+        assert first.is_closed()
@@ -13,8 +13,12 @@ from src.core.browser_automation import (
     FormLoginStrategy, 
     GoogleOAuthStrategy,
     SystemBrowserLoginStrategy,
-    precheck_google_oauth
+    precheck_google_oauth,
+    precheck_google_oauth_async,
+    _score_login_field,
+    _netloc
 )
+from src.utils.exceptions import BrowserError
 
 class TestBrowserAutomation:
     """Test suite for the BrowserAutomation class."""
@@ -108,6 +112,137 @@ class TestBrowserAutomation:
             ba_browser.close.assert_called_once()
             # Skip checking __aexit__ since it's handled differently in the implementation
     
+    @pytest.mark.asyncio
+    async def test_close_continues_after_errors(self, config_manager):
+        """Test that a failed or cancelled close is logged and the remaining objects are still closed."""
+        ba = BrowserAutomation(config_manager)
+        ba._initialized = True
+        ba.page = MagicMock(close=AsyncMock(side_effect=Exception("page gone")))
+        ba.context = MagicMock(close=AsyncMock(side_effect=asyncio.CancelledError()))
+        browser = ba.browser = MagicMock(close=AsyncMock())
+        pooled = MagicMock(close=AsyncMock())
+        ba._context_pool = [(pooled, MagicMock())]
+        
+        with patch.object(ba.logger, "warning") as warning:
+            await ba.close()
+        
+        pooled.close.assert_awaited_once()
+        browser.close.assert_awaited_once()
+        assert warning.call_count == 2
+        assert ba.page is None and ba.context is None and ba.browser is None
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_user_action(self, config_manager):
+        """Test that a URL change ends the wait and the title wait is cancelled."""
+        ba = BrowserAutomation(config_manager)
+        ba._initialized = True
+        ba.page = MagicMock(url="https://example.com/login")
+        title_seen = asyncio.Event()
+
+        async def title_never_matches(*args, **kwargs):
+            await title_seen.wait()
+
+        ba.page.wait_for_url = AsyncMock(return_value=None)
+        ba.page.wait_for_function = title_never_matches
+
+        assert await ba.wait_for_user_action(60) is True
+        predicate = ba.page.wait_for_url.call_args.args[0]
+        assert predicate("https://example.com/home") and not predicate("https://example.com/login")
+        assert ba.page.wait_for_url.call_args.kwargs["timeout"] == 60000
+
+    @pytest.mark.asyncio
+    async def test_wait_for_user_action_timeout(self, config_manager):
+        """Test that the wait reports a timeout as False and other errors as BrowserError."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        ba = BrowserAutomation(config_manager)
+        ba._initialized = True
+        ba.page = MagicMock(url="https://example.com/login")
+        ba.page.wait_for_url = AsyncMock(side_effect=PlaywrightTimeoutError("url"))
+        ba.page.wait_for_function = AsyncMock(side_effect=PlaywrightTimeoutError("title"))
+        assert await ba.wait_for_user_action(1) is False
+
+        ba.page.wait_for_function = AsyncMock(side_effect=RuntimeError("page crashed"))
+        with pytest.raises(BrowserError):
+            await ba.wait_for_user_action(1)
+
+    @pytest.mark.asyncio
+    async def test_new_session_shares_browser(self, config_manager):
+        """Test that sessions share one browser and only close their own context."""
+        with patch('src.core.browser_automation.async_playwright') as mock_playwright:
+            mock_pw = MagicMock()
+            mock_chromium = MagicMock()
+            mock_browser = MagicMock()
+            
+            mock_pw.chromium = mock_chromium
+            mock_chromium.launch = AsyncMock(return_value=mock_browser)
+            mock_browser.new_context = AsyncMock(side_effect=lambda: MagicMock(
+                new_page=AsyncMock(return_value=MagicMock(close=AsyncMock())),
+                close=AsyncMock()
+            ))
+            mock_browser.close = AsyncMock()
+            
+            mock_playwright_instance = MagicMock()
+            mock_playwright_instance.__aenter__ = AsyncMock(return_value=mock_pw)
+            mock_playwright_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_playwright.return_value = mock_playwright_instance
+            
+            ba = BrowserAutomation(config_manager)
+            await ba.launch()
+            first = await ba.new_session()
+            second = await ba.new_session()
+            
+            # One browser, one context per session
+            mock_chromium.launch.assert_awaited_once()
+            assert first.browser is mock_browser and second.browser is mock_browser
+            assert first.context is not second.context
+            
+            # Closing a session leaves the shared browser running
+            first_context = first.context
+            await first.close()
+            first_context.close.assert_awaited_once()
+            mock_browser.close.assert_not_called()
+            
+            await ba.close()
+            mock_browser.close.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_prewarm_hands_out_fresh_contexts(self, config_manager):
+        """Test that prewarmed contexts go to sessions once and leftovers are closed."""
+        with patch('src.core.browser_automation.async_playwright') as mock_playwright:
+            mock_pw = MagicMock()
+            mock_browser = MagicMock()
+            mock_pw.chromium.launch = AsyncMock(return_value=mock_browser)
+            mock_browser.new_context = AsyncMock(side_effect=lambda: MagicMock(
+                new_page=AsyncMock(return_value=MagicMock(close=AsyncMock())),
+                close=AsyncMock()
+            ))
+            mock_browser.close = AsyncMock()
+            mock_playwright_instance = MagicMock()
+            mock_playwright_instance.__aenter__ = AsyncMock(return_value=mock_pw)
+            mock_playwright_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_playwright.return_value = mock_playwright_instance
+            
+            ba = BrowserAutomation(config_manager)
+            await ba.prewarm(2)
+            assert mock_browser.new_context.await_count == 2
+            pooled = [context for context, _ in ba._context_pool]
+            
+            # Sessions take pooled contexts without opening new ones
+            session = await ba.new_session()
+            assert session.context in pooled
+            assert mock_browser.new_context.await_count == 2
+            
+            # Used contexts are closed, not returned to the pool
+            await session.close()
+            assert len(ba._context_pool) == 1
+            
+            # Unused prewarmed contexts are closed with the browser
+            leftover = ba._context_pool[0][0]
+            await ba.close()
+            leftover.close.assert_awaited_once()
+            assert ba._context_pool == []
+    
     @pytest.mark.asyncio
     async def test_detect_login_form(self, config_manager):
         """Test detecting login form."""
@@ -140,6 +275,45 @@ class TestBrowserAutomation:
         assert "username_field" in form_info
         assert "password_field" in form_info
     
+    @pytest.mark.asyncio
+    async def test_detect_login_form_reads_fields_in_bulk(self, config_manager):
+        """Test that a form's fields are read in one call and scored without per-field queries."""
+        ba = BrowserAutomation(config_manager)
+
+        def row(input_type, name, label=""):
+            return {"type": input_type, "name": name, "placeholder": "", "label": label}
+
+        rows = [row("text", f"decoy{i}") for i in range(4)]
+        rows += [row("text", "login", label="your email"), row("password", "pw"), row("password", "confirm")]
+        inputs = [MagicMock() for _ in rows]
+        form = MagicMock()
+        form.query_selector_all = AsyncMock(return_value=inputs)
+        form.eval_on_selector_all = AsyncMock(return_value=rows)
+        form.query_selector = AsyncMock(return_value=MagicMock())
+        page = MagicMock()
+        page.query_selector_all = AsyncMock(return_value=[form])
+        ba.set_page(page)
+
+        form_info = await ba._detect_login_form()
+
+        assert len(form_info["all_candidates"]) == 10
+        assert form_info["username_field"] is inputs[4]
+        assert form_info["password_field"] is inputs[5]
+        form.eval_on_selector_all.assert_awaited_once()
+        form.query_selector.assert_awaited_once()
+        for field in inputs:
+            field.get_attribute.assert_not_called()
+
+    @pytest.mark.parametrize("row, field_type, expected", [
+        ({"type": "email", "name": "username", "placeholder": "email", "label": ""}, "username", 5.5),
+        ({"type": "text", "name": "login", "placeholder": "", "label": "user id"}, "username", 2.5),
+        ({"type": "password", "name": "passwd", "placeholder": "", "label": "login password"}, "password", 4.5),
+        ({"type": "text", "name": "search", "placeholder": "find", "label": ""}, "username", 0),
+    ])
+    def test_score_login_field(self, row, field_type, expected):
+        """Test login field scoring from the field's attributes and label."""
+        assert _score_login_field(row, field_type) == expected
+
     @pytest.mark.asyncio
     async def test_fill_login_form(self, config_manager):
         """Test filling login form."""
@@ -250,6 +424,34 @@ class TestLoginStrategies:
         assert result["stage"] == "success"
         assert result["success"] is True
     
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("captcha, two_factor, expected_stage", [
+        (True, True, "captcha_detected"),
+        (RuntimeError("boom"), True, "two_factor_detected"),
+        (False, RuntimeError("boom"), "success"),
+    ])
+    async def test_form_login_strategy_post_submit_checks(self, config_manager, captcha, two_factor, expected_stage):
+        """Test that the CAPTCHA and 2FA checks both run and a failing check is skipped."""
+        ba = BrowserAutomation(config_manager)
+        ba.set_page(AsyncMock())
+        ba._detect_login_form = AsyncMock(return_value={
+            "username_field": AsyncMock(),
+            "password_field": AsyncMock(),
+            "form": None
+        })
+        ba._fill_login_form = AsyncMock()
+        ba._submit_login_form = AsyncMock()
+        ba._detect_captcha = AsyncMock(side_effect=[captcha])
+        ba._detect_two_factor = AsyncMock(side_effect=[two_factor])
+        strategy = FormLoginStrategy(ba)
+        strategy._check_login_success = AsyncMock(return_value=True)
+
+        result = await strategy.login("https://example.com", "testuser", "testpass")
+
+        ba._detect_captcha.assert_awaited_once()
+        ba._detect_two_factor.assert_awaited_once()
+        assert result["stage"] == expected_stage
+
     @pytest.mark.asyncio
     async def test_form_login_strategy_ambiguous(self, config_manager):
         """Test form login strategy with ambiguous form detection."""
@@ -330,6 +532,252 @@ class TestLoginStrategies:
         assert result["success"] is True
         """
     
+    @pytest.mark.asyncio
+    async def test_google_oauth_wait_for_signin_popup(self, config_manager):
+        """Test that a sign-in popup wins the race and the listener is removed."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        popup = MagicMock()
+        page = MagicMock()
+        page.context.on.side_effect = lambda event, handler: handler(popup)
+        navigation = asyncio.Event()
+
+        async def never_navigates(*args, **kwargs):
+            await navigation.wait()
+
+        page.wait_for_url = never_navigates
+        strategy.page = page
+
+        assert await strategy._wait_for_google_signin() is popup
+        handler = page.context.on.call_args.args[1]
+        page.context.remove_listener.assert_called_once_with("page", handler)
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_wait_for_signin_navigation(self, config_manager):
+        """Test that navigating the current page to Google returns no popup."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        page = MagicMock()
+        page.wait_for_url = AsyncMock(return_value=None)
+        strategy.page = page
+
+        assert await strategy._wait_for_google_signin() is None
+        assert page.wait_for_url.call_args.kwargs["wait_until"] == "domcontentloaded"
+        page.context.remove_listener.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_click_next(self, config_manager):
+        """Test that Next is clicked through the step's id, with the text as fallback."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        page = MagicMock()
+        by_id = page.locator.return_value
+        combined = by_id.or_.return_value
+        combined.first.click = AsyncMock()
+        strategy.page = page
+
+        await strategy._click_next("#identifierNext button")
+
+        assert page.locator.call_args_list[0].args == ("#identifierNext button",)
+        assert page.locator.call_args_list[1].args == ("button:has-text('Next')",)
+        combined.first.click.assert_awaited_once_with(timeout=5000)
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_wait_for_outcome(self, config_manager):
+        """Test that a sign-in error ends the wait without waiting for a redirect."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        redirect = asyncio.Event()
+
+        async def never_redirects(*args, **kwargs):
+            await redirect.wait()
+
+        page = MagicMock()
+        page.wait_for_url = never_redirects
+        page.wait_for_selector = AsyncMock(return_value=MagicMock())
+        strategy.page = page
+
+        assert await strategy._wait_for_google_outcome(20000) is True
+        page.wait_for_selector.assert_awaited_once()
+
+        # Both waits timing out is reported as no outcome
+        page.wait_for_url = AsyncMock(side_effect=TimeoutError("url"))
+        page.wait_for_selector = AsyncMock(side_effect=TimeoutError("selector"))
+        assert await strategy._wait_for_google_outcome(10) is False
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_wait_for_exit(self, config_manager):
+        """Test that the 2FA wait ends on navigation off Google, and not before."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        listeners = {}
+        page = MagicMock(url="https://accounts.google.com/signin/v2/challenge")
+        page.is_closed.return_value = False
+        page.on.side_effect = lambda event, handler: listeners.__setitem__(event, handler)
+        strategy.page = page
+
+        waiter = asyncio.create_task(strategy._wait_for_google_exit(5))
+        await asyncio.sleep(0)
+        # An iframe leaving Google, or the page moving to another Google step, is not enough
+        listeners["framenavigated"](MagicMock(url="https://example.com/ads"))
+        page.main_frame.url = "https://accounts.google.com/challenge/totp"
+        listeners["framenavigated"](page.main_frame)
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        page.main_frame.url = "https://example.com/home"
+        listeners["framenavigated"](page.main_frame)
+        assert await waiter is True
+        assert page.remove_listener.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_wait_for_exit_timeout(self, config_manager):
+        """Test that the 2FA wait reports a timeout when the page never leaves Google."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        strategy.page = MagicMock(url="https://accounts.google.com/signin/v2/challenge")
+        strategy.page.is_closed.return_value = False
+
+        assert await strategy._wait_for_google_exit(0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_wait_for_exit_already_left(self, config_manager):
+        """Test that the 2FA wait returns at once if Google was left before it started."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        strategy.page = MagicMock(url="https://example.com/home")
+        strategy.page.is_closed.return_value = False
+
+        assert await strategy._wait_for_google_exit(5) is True
+
+        # A popup that already closed counts as well
+        strategy.page = MagicMock(url="https://accounts.google.com/signin/v2/challenge")
+        strategy.page.is_closed.return_value = True
+        assert await strategy._wait_for_google_exit(5) is True
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_find_text_element(self, config_manager):
+        """Test that the broad Google button search is one in-page script."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        frame = MagicMock()
+        element = MagicMock()
+        handle = MagicMock()
+        handle.as_element.return_value = element
+        frame.evaluate_handle = AsyncMock(return_value=handle)
+
+        assert await strategy._find_google_text_element(frame) is element
+        frame.evaluate_handle.assert_awaited_once()
+
+        # No match: the returned null handle is released
+        handle.as_element.return_value = None
+        handle.dispose = AsyncMock()
+        assert await strategy._find_google_text_element(frame) is None
+        handle.dispose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_first_visible(self, config_manager):
+        """Test that visible matches are filtered in the browser, not per element."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        locator = MagicMock()
+        visible = locator.filter.return_value
+        visible.count = AsyncMock(return_value=3)
+        element = MagicMock()
+        visible.first.element_handle = AsyncMock(return_value=element)
+
+        assert await strategy._first_visible(locator) is element
+        locator.filter.assert_called_once_with(visible=True)
+
+        visible.count = AsyncMock(return_value=0)
+        assert await strategy._first_visible(locator) is None
+
+    @pytest.mark.asyncio
+    async def test_google_oauth_first_hit(self, config_manager):
+        """Test that concurrent searches resolve to the first hit in priority order."""
+        strategy = GoogleOAuthStrategy(BrowserAutomation(config_manager))
+        first, second = MagicMock(), MagicMock()
+        second.dispose = AsyncMock()
+
+        async def hit(value):
+            return value
+
+        async def fail():
+            raise RuntimeError("frame detached")
+
+        result = await strategy._first_hit([hit(None), fail(), hit(first), hit(second)])
+        assert result is first
+        second.dispose.assert_awaited_once()
+
+        assert await strategy._first_hit([hit(None), fail()]) is None
+        assert await strategy._first_hit([]) is None
+
+    @pytest.mark.asyncio
+    async def test_login_to_website_skips_google_flow(self, config_manager):
+        """Test that a negative precheck overlaps browser startup and selects form login."""
+        ba = BrowserAutomation(config_manager)
+        config_manager.set("post_login_delay", 0)
+        order = []
+
+        async def initialize(*args, **kwargs):
+            # Starting the browser yields to the loop, letting the precheck run
+            await asyncio.sleep(0)
+            order.append("initialize")
+            ba._initialized = True
+            return True
+
+        async def precheck(url, logger=None):
+            order.append("precheck")
+            return False
+
+        ba.initialize = initialize
+        with patch('src.core.browser_automation.precheck_google_oauth_async', side_effect=precheck), \
+             patch.object(FormLoginStrategy, 'login', AsyncMock(return_value={"success": False})) as form_login, \
+             patch.object(GoogleOAuthStrategy, 'login', AsyncMock()) as google_login:
+            await ba.login_to_website("https://example.com", "testuser", "testpass")
+
+        # The precheck runs while the browser starts
+        assert order == ["precheck", "initialize"]
+        form_login.assert_awaited_once()
+        google_login.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_login_to_website_uses_given_precheck(self, config_manager):
+        """Test that a precheck verdict from the caller is used instead of scanning again."""
+        ba = BrowserAutomation(config_manager)
+        ba._initialized = True
+        config_manager.set("post_login_delay", 0)
+
+        with patch('src.core.browser_automation.precheck_google_oauth_async') as precheck, \
+             patch.object(FormLoginStrategy, 'login', AsyncMock(return_value={"success": False})) as form_login:
+            await ba.login_to_website("https://example.com", "testuser", "testpass", has_google_oauth=False)
+
+        precheck.assert_not_called()
+        form_login.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("current_url, content, expected", [
+        ("https://example.com/dashboard", "<p>Welcome back</p>", True),
+        ("https://EXAMPLE.com/account/login", "<p>Welcome back</p>", False),
+        ("https://example.com/Sign-In?next=/", "<p>Welcome back</p>", False),
+        ("https://example.com/dashboard", "<p>Invalid Credentials, try again</p>", False),
+        ("https://example.com/dashboard", "<p>AUTHENTICATION FAILED</p>", False),
+        ("https://other.example.org/login", "<p>Login failed</p>", True),
+    ])
+    async def test_form_check_login_success(self, config_manager, current_url, content, expected):
+        """Test form login success detection from the URL and page content."""
+        ba = BrowserAutomation(config_manager)
+        page = MagicMock()
+        page.url = current_url
+        page.content = AsyncMock(return_value=content)
+        ba.get_page = AsyncMock(return_value=page)
+        strategy = FormLoginStrategy(ba)
+
+        assert await strategy._check_login_success("https://example.com/login") is expected
+
+    @pytest.mark.asyncio
+    async def test_form_check_login_success_reuses_page(self, config_manager):
+        """Test that the success check uses the page login() already resolved."""
+        ba = BrowserAutomation(config_manager)
+        ba.get_page = AsyncMock()
+        strategy = FormLoginStrategy(ba)
+        strategy.page = MagicMock(url="https://example.com/dashboard")
+        strategy.page.content = AsyncMock(return_value="<p>Welcome back</p>")
+
+        assert await strategy._check_login_success("https://example.com/login") is True
+        ba.get_page.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_system_browser_login_strategy(self, config_manager):
         """Test system browser login strategy."""
@@ -352,106 +800,172 @@ class TestLoginStrategies:
             assert result["success"] is None
             assert result["requires_user_action"] is True
 
-def test_precheck_google_oauth():
-    """Test Google OAuth pre-check function (robust detection)."""
-    # Mock requests and BeautifulSoup
-    with patch('src.core.browser_automation.requests.get') as mock_get, \
-         patch('src.core.browser_automation.BeautifulSoup') as mock_bs:
+def _page_response(body, status_code=200, chunk_size=16384):
+    """Build a streamed precheck response for body, delivered in chunks."""
+    response = MagicMock(status_code=status_code, history=[], headers={}, url="https://example.com", encoding="utf-8")
+    response.iter_content.return_value = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    return response
 
-        # Set up mock response
+@pytest.fixture(params=["bs4", "lexbor"])
+def precheck_backend(request):
+    """Run precheck tests against both HTML parser backends."""
+    if request.param == "bs4":
+        with patch('src.core.browser_automation.LexborHTMLParser', None):
+            yield request.param
+    else:
+        pytest.importorskip("selectolax.lexbor")
+        yield request.param
+
+@pytest.mark.parametrize("html, expected", [
+    # 1. Detection via text content
+    ("<html><body><button>Sign in with <b>Google</b></button></body></html>", True),
+    # 2. Detection via aria-label
+    ('<html><body><a aria-label="Continue with Google"></a></body></html>', True),
+    # 3. Detection via title
+    ('<html><body><div title="Google sign in"></div></body></html>', True),
+    # 4. Detection via class name
+    ('<html><body><span class="btn google-sign-in"></span></body></html>', True),
+    # 5. Detection via data-provider attribute
+    ('<html><body><button data-provider="google"></button></body></html>', True),
+    # 6. Detection via data-auth attribute
+    ('<html><body><div data-auth="Google"></div></body></html>', True),
+    # 7. Detection via OAuth href and form action
+    ('<html><body><a href="https://accounts.google.com/o/oauth2/auth?x=1">Go</a></body></html>', True),
+    ('<html><body><form action="https://accounts.google.com/o/oauth2/v2/auth"></form></body></html>', True),
+    # 8. Negative case: no Google indicators
+    ('<html><body><form action="/login"><button disabled>Sign in</button></form></body></html>', False),
+])
+def test_precheck_google_oauth(precheck_backend, html, expected):
+    """Test Google OAuth pre-check function (robust detection)."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.text = "<html><body>Sign in with Google</body></html>"
+        mock_response.iter_content.return_value = [html.encode()]
+        mock_response.encoding = "utf-8"
+        mock_response.history = []
+        mock_response.headers = {}
+        mock_response.url = "https://example.com"
         mock_get.return_value = mock_response
 
-        # Helper to reset mocks
-        def reset_mocks():
-            mock_get.reset_mock()
-            mock_bs.reset_mock()
-
-        # 1. Detection via text content
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = "Sign in with Google"
-        mock_tag.attrs = {}
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        result = precheck_google_oauth("https://example.com")
-        assert result is True
-
-        # 2. Detection via aria-label
-        reset_mocks()
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = ""
-        mock_tag.attrs = {"aria-label": "Continue with Google"}
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        mock_get.return_value = mock_response
-        result = precheck_google_oauth("https://example.com")
-        assert result is True
-
-        # 3. Detection via title
-        reset_mocks()
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = ""
-        mock_tag.attrs = {"title": "Google sign in"}
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        mock_get.return_value = mock_response
-        result = precheck_google_oauth("https://example.com")
-        assert result is True
-
-        # 4. Detection via class name
-        reset_mocks()
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = ""
-        mock_tag.attrs = {}
-        mock_tag.get.return_value = ["google-sign-in"]
-        # Simulate .get("class", []) returning ["google-sign-in"]
-        type(mock_tag).get = lambda self, key, default=None: ["google-sign-in"] if key == "class" else default
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        mock_get.return_value = mock_response
-        result = precheck_google_oauth("https://example.com")
-        assert result is True
-
-        # 5. Detection via data-provider attribute
-        reset_mocks()
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = ""
-        mock_tag.attrs = {"data-provider": "google"}
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        mock_get.return_value = mock_response
-        result = precheck_google_oauth("https://example.com")
-        assert result is True
-
-        # 6. Detection via data-auth attribute
-        reset_mocks()
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = ""
-        mock_tag.attrs = {"data-auth": "google"}
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        mock_get.return_value = mock_response
-        result = precheck_google_oauth("https://example.com")
-        assert result is True
-
-        # 7. Negative case: no Google indicators
-        reset_mocks()
-        mock_soup = MagicMock()
-        mock_tag = MagicMock()
-        mock_tag.get_text.return_value = "Sign in"
-        mock_tag.attrs = {}
-        mock_tag.get.return_value = []
-        type(mock_tag).get = lambda self, key, default=None: [] if key == "class" else default
-        mock_soup.find_all.return_value = [mock_tag]
-        mock_bs.return_value = mock_soup
-        mock_get.return_value = mock_response
-        result = precheck_google_oauth("https://example.com")
-        assert result is False
+        assert precheck_google_oauth("https://example.com") is expected
+
+def test_precheck_google_oauth_bad_status():
+    """Test that a failed page fetch is reported as no Google OAuth."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get:
+        mock_get.return_value = _page_response(b"", status_code=404)
+        assert precheck_google_oauth("https://example.com") is False
+
+def test_precheck_google_oauth_prefilter():
+    """Test that pages are settled from the raw bytes without parsing when possible."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get, \
+         patch('src.core.browser_automation._iter_precheck_elements') as mock_iter:
+        # No "google" anywhere: negative without parsing
+        mock_get.return_value = _page_response(b"<button>Sign in</button>")
+        assert precheck_google_oauth("https://example.com") is False
+
+        # OAuth endpoint anywhere in the source: positive without parsing
+        mock_get.return_value = _page_response(
+            b'<script>var u = "https://ACCOUNTS.google.com/o/oauth2/auth";</script>'
+        )
+        assert precheck_google_oauth("https://example.org") is True
+
+        mock_iter.assert_not_called()
+
+@pytest.mark.parametrize("history, headers, final_url", [
+    # Redirected through Google accounts
+    ([MagicMock(headers={"Location": "https://accounts.google.com/o/oauth2/v2/auth?client_id=x"})],
+     {}, "https://example.com/login"),
+    # Ended up on Google accounts
+    ([], {}, "https://accounts.google.com/signin"),
+    # Preconnect hint for Google accounts
+    ([], {"Link": "<https://accounts.google.com>; rel=preconnect"}, "https://example.com/login"),
+])
+def test_precheck_google_oauth_from_headers(history, headers, final_url):
+    """Test that redirects and preconnect headers detect Google OAuth without reading the body."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get:
+        response = MagicMock(status_code=200, history=history, headers=headers, url=final_url)
+        response.iter_content.side_effect = lambda *args, **kwargs: pytest.fail("body was read")
+        mock_get.return_value = response
+
+        assert precheck_google_oauth("https://example.com/login") is True
+        response.close.assert_called_once()
+
+@pytest.mark.parametrize("history, headers, final_url", [
+    # Google accounts only mentioned in the redirect's query string
+    ([MagicMock(headers={"Location": "https://example.com/sso?next=https://accounts.google.com/x"})],
+     {}, "https://example.com/login"),
+    # Google accounts only mentioned in the final URL's query string
+    ([], {}, "https://example.com/login?next=https://accounts.google.com/x"),
+    # Preconnect hint for an unrelated host whose path mentions Google accounts
+    ([], {"Link": "<https://cdn.example.com/accounts.google.com.js>; rel=preload"}, "https://example.com/login"),
+])
+def test_precheck_google_oauth_headers_match_host(history, headers, final_url):
+    """Test that header detection compares hosts rather than substrings of the URL."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get:
+        response = _page_response(b"<html><body><form></form></body></html>")
+        response.history = history
+        response.headers = headers
+        response.url = final_url
+        mock_get.return_value = response
+
+        assert precheck_google_oauth("https://example.com/login") is False
+
+def test_precheck_google_oauth_early_exit():
+    """Test that the body scan stops at a marker, even one split across chunks."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get, \
+         patch('src.core.browser_automation._iter_precheck_elements') as mock_iter:
+        body = (b"<html>" + b" " * 100
+                + b'<a href="https://accounts.google.com/o/oauth2/v2/auth?client_id=x">Google</a>'
+                + b"x" * 1000)
+        response = _page_response(body, chunk_size=110)
+        chunks = response.iter_content.return_value
+        consumed = []
+        response.iter_content.return_value = (consumed.append(chunk) or chunk for chunk in chunks)
+        mock_get.return_value = response
+
+        assert precheck_google_oauth("https://example.com") is True
+        # The tail of the page was never read or parsed
+        assert len(consumed) == 2
+        mock_iter.assert_not_called()
+
+@pytest.mark.parametrize("body", [
+    b"<html><head><title>Sign in with Google</title></head><body><form></form></body></html>",
+    b'<html><head><meta name="description" content="Sign in with Google"></head><body></body></html>',
+    b"<html><body><!-- Sign in with Google --><form></form></body></html>",
+])
+def test_precheck_google_oauth_early_exit_ignores_non_elements(body, precheck_backend):
+    """Test that sign-in wording outside the inspected elements does not end the scan early."""
+    with patch('src.core.browser_automation._PRECHECK_SESSION.get') as mock_get:
+        mock_get.return_value = _page_response(body)
+        assert precheck_google_oauth("https://example.com") is False
+
+@pytest.mark.asyncio
+async def test_precheck_google_oauth_async():
+    """Test that the async precheck runs the blocking check off the event loop."""
+    import threading
+
+    loop_thread = threading.current_thread()
+    seen = []
+
+    def fake_precheck(url, logger=None):
+        seen.append(threading.current_thread())
+        return True
+
+    with patch('src.core.browser_automation.precheck_google_oauth', side_effect=fake_precheck):
+        assert await precheck_google_oauth_async("https://example.com") is True
+
+    assert seen and seen[0] is not loop_thread
+
+@pytest.mark.parametrize("url", [
+    "https://Example.com/login?next=/",
+    "https://user:pw@example.com:8443/a#b",
+    "http://example.com?x=1",
+    "https://example.com",
+    "about:blank",
+    "example.com/login",
+    "",
+])
+def test_netloc_matches_urlparse(url):
+    """Test that the login checks' host extraction agrees with urlparse."""
+    from urllib.parse import urlparse
+    assert _netloc(url) == urlparse(url).netloc.lower()
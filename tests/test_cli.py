@@ -0,0 +1,115 @@
+"""
+Tests for the command-line interface.
+"""
+
+import argparse
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from cli import CLI, _run_event_loop
+
+def _make_cli(credentials, **args):
+    """Create a CLI without parsing sys.argv or running a command."""
+    cli = CLI.__new__(CLI)
+    cli.config_manager = MagicMock()
+    cli.app_core = None
+    cli.credential_manager = MagicMock(credentials=credentials)
+    cli.args = argparse.Namespace(
+        urls=None, bonus_only=False, concurrency=4, browser="chromium", headless=True, **args
+    )
+    return cli
+
+class TestCLI:
+    """Test suite for the CLI class."""
+
+    def test_login_interrupt_keeps_finished_sites(self, capsys):
+        """Test that an interrupted batch still records the logins that finished."""
+        cli = _make_cli({
+            "https://example1.com": {"username": "user1", "password": "pass1"},
+            "https://example2.com": {"username": "user2", "password": "pass2"},
+        })
+
+        async def interrupted_logins(urls_to_login, results):
+            results["https://example1.com"] = {"success": True, "message": "ok"}
+            raise KeyboardInterrupt
+
+        with patch.object(cli, "_do_logins", interrupted_logins):
+            cli._login_command()
+
+        cli.credential_manager.update_last_login_bulk.assert_called_once_with({"https://example1.com": True})
+        assert "Login successful for https://example1.com" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    async def test_do_logins_runs_sites_concurrently(self):
+        """Test that logins share one browser, run in parallel up to the limit and report per site."""
+        cli = _make_cli({})
+        cli.args.concurrency = 2
+        running = 0
+        peak = 0
+
+        async def login_to_website(url, username, password, callback):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if url == "https://broken.com":
+                raise RuntimeError("boom")
+            return {"success": True, "message": "ok"}
+
+        def new_session():
+            session = MagicMock(close=AsyncMock())
+            session.login_to_website = login_to_website
+            return session
+
+        urls_to_login = [
+            (f"https://example{i}.com", {"username": "user", "password": "pass"}) for i in range(4)
+        ] + [("https://broken.com", {"username": "user", "password": "pass"})]
+
+        with patch("src.core.browser_automation.BrowserAutomation") as mock_ba:
+            browser = mock_ba.return_value
+            browser.prewarm = AsyncMock()
+            browser.close = AsyncMock()
+            browser.new_session = AsyncMock(side_effect=new_session)
+
+            results = {}
+            await cli._do_logins(urls_to_login, results)
+
+        mock_ba.assert_called_once()
+        browser.close.assert_awaited_once()
+        assert peak == 2
+        assert all(results[url]["success"] for url, _ in urls_to_login[:4])
+        assert isinstance(results["https://broken.com"], RuntimeError)
+
+    def test_ensure_initialized_decrypts_once(self, tmp_path):
+        """Test that unlocking reuses the constructor's load instead of decrypting again."""
+        cli = _make_cli({})
+        cli.is_initialized = False
+        cli.credential_manager = None
+        cli._credentials_path = str(tmp_path / "credentials.enc")
+        (tmp_path / "credentials.enc").write_bytes(b"")
+
+        with patch("src.core.credential_manager.CredentialManager") as mock_cm, \
+             patch("src.core.app_core.AppCore") as mock_app_core:
+            mock_cm.return_value.is_loaded = True
+            assert cli._ensure_initialized("secret") is True
+
+            mock_cm.return_value.load_credentials.assert_not_called()
+            mock_app_core.from_config.return_value.initialize.assert_called_once_with("secret", mock_cm.return_value)
+
+            # A password that cannot decrypt the file is rejected
+            cli.is_initialized = False
+            mock_cm.return_value.is_loaded = False
+            assert cli._ensure_initialized("wrong") is False
+
+    def test_run_event_loop_keeps_global_policy(self):
+        """Test that the CLI's uvloop runner does not install a process-wide loop policy."""
+        uvloop = pytest.importorskip("uvloop")
+        policy = asyncio.get_event_loop_policy()
+
+        async def loop_type():
+            return type(asyncio.get_running_loop())
+
+        assert _run_event_loop(loop_type()) is uvloop.Loop
+        assert asyncio.get_event_loop_policy() is policy
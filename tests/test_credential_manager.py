@@ -6,6 +6,7 @@ import os
 import pytest
 import json
 import tempfile
+from unittest.mock import patch
 from cryptography.fernet import InvalidToken
 
 from src.core.credential_manager import CredentialManager
@@ -19,6 +20,11 @@ class TestCredentialManager:
         assert cm is not None
         assert cm.cipher_suite is not None
         
+    def test_initialization_with_weak_password(self, config_manager):
+        """Test that a password which cannot initialize the cipher suite is rejected."""
+        with pytest.raises(ValueError):
+            CredentialManager(config_manager, "weak")
+        
     def test_set_master_password(self, credential_manager):
         """Test setting and changing the master password."""
         # Password should already be set from fixture
@@ -115,6 +121,11 @@ class TestCredentialManager:
         assert len(all_creds) == 2
         assert "https://example1.com" in all_creds
         assert "https://example2.com" in all_creds
+        assert all_creds["https://example1.com"]["google_login"] is False
+        
+        # The result is a copy; changing it leaves the stored entries alone
+        all_creds["https://example1.com"]["password"] = "changed"
+        assert credential_manager.get_website("https://example1.com")["password"] == "pass1"
     
     def test_get_bonus_websites(self, credential_manager):
         """Test retrieving websites with bonus flag."""
@@ -197,6 +208,102 @@ class TestCredentialManager:
         assert len(all_creds) == 2
         assert "https://example1.com" in all_creds
         assert "https://example2.com" in all_creds
+
+    def test_debounced_save_flush(self, config_manager):
+        """Test that debounced saves are coalesced until flushed."""
+        config_manager.set("credential_autosave_debounce_ms", 60000)
+        cm = CredentialManager(config_manager, "TestPassword123!")
+
+        with patch("src.core.credential_manager.atexit") as mock_atexit:
+            cm.add_website("https://example1.com", "user1", "pass1")
+            cm.add_website("https://example2.com", "user2", "pass2")
+
+            # Nothing is written until the debounce window ends, or at exit
+            assert not os.path.exists(cm.credentials_file)
+            mock_atexit.register.assert_called_once_with(cm.flush)
+            cm.flush()
+            mock_atexit.unregister.assert_called_once_with(cm.flush)
+
+        assert os.path.exists(cm.credentials_file)
+
+        new_cm = CredentialManager(config_manager, "TestPassword123!")
+        assert len(new_cm.get_all_websites()) == 2
+
+        # Clearing memory writes pending changes first
+        cm.add_website("https://example3.com", "user3", "pass3")
+        cm.clear_memory()
+        new_cm = CredentialManager(config_manager, "TestPassword123!")
+        assert "https://example3.com" in new_cm.get_all_websites()
+
+    def test_debounced_save_retries_failed_write(self, config_manager):
+        """Test that a failed debounced write keeps the changes pending and schedules a retry."""
+        config_manager.set("credential_autosave_debounce_ms", 60000)
+        cm = CredentialManager(config_manager, "TestPassword123!")
+
+        with patch("src.core.credential_manager.atexit") as mock_atexit:
+            cm.add_website("https://example.com", "testuser", "testpass")
+            with patch("src.core.credential_manager._open_private", side_effect=IOError("disk full")):
+                assert cm.flush() is False
+
+            assert cm._dirty
+            assert cm._flush_timer is not None
+            assert mock_atexit.register.call_count == 2
+
+            assert cm.flush() is True
+
+        assert "https://example.com" in CredentialManager(config_manager, "TestPassword123!").get_all_websites()
+
+    def test_debounced_save_snapshots_credentials(self, config_manager):
+        """Test that changes made while a write is in progress are neither lost nor break it."""
+        from src.core import credential_manager as module
+
+        config_manager.set("credential_autosave_debounce_ms", 60000)
+        cm = CredentialManager(config_manager, "TestPassword123!")
+        dump_json = module._dump_json
+
+        def dump_while_adding(data):
+            # Another thread adding a site in the middle of serialization
+            cm.add_website("https://late.com", "user", "pass")
+            return dump_json(data)
+
+        with patch("src.core.credential_manager.atexit"):
+            cm.add_website("https://example.com", "testuser", "testpass")
+            with patch("src.core.credential_manager._dump_json", side_effect=dump_while_adding):
+                assert cm.flush() is True
+
+            # The late change missed the snapshot, so it is still pending
+            assert cm._dirty
+            assert "https://late.com" not in CredentialManager(config_manager, "TestPassword123!").get_all_websites()
+            assert cm.flush() is True
+
+        assert "https://late.com" in CredentialManager(config_manager, "TestPassword123!").get_all_websites()
+
+    def test_debounced_password_change_writes_immediately(self, config_manager):
+        """Test that a password change re-encrypts the file without waiting for the debounce."""
+        config_manager.set("credential_autosave_debounce_ms", 60000)
+        cm = CredentialManager(config_manager, "TestPassword123!")
+        cm.add_website("https://example.com", "testuser", "testpass")
+        cm.flush()
+
+        assert cm.set_master_password("NewPassword456!") is True
+        assert CredentialManager(config_manager, "NewPassword456!").load_credentials() is True
+        assert CredentialManager(config_manager, "TestPassword123!").load_credentials() is False
+
+    def test_constructor_reports_load_result(self, config_manager):
+        """Test that is_loaded tells whether the constructor could decrypt the file."""
+        cm = CredentialManager(config_manager, "TestPassword123!")
+        cm.add_website("https://example.com", "testuser", "testpass")
+
+        assert CredentialManager(config_manager, "TestPassword123!").is_loaded is True
+        assert CredentialManager(config_manager, "WrongPassword!").is_loaded is False
+        assert CredentialManager(config_manager).is_loaded is False
+
+    def test_saved_files_are_private(self, credential_manager):
+        """Test that the credentials and salt files are created owner-only."""
+        credential_manager.add_website("https://example.com", "testuser", "testpass")
+        
+        for path in (credential_manager.credentials_file, credential_manager.salt_file):
+            assert os.stat(path).st_mode & 0o777 == 0o600
     
     def test_wrong_password(self, config_manager):
         """Test loading credentials with wrong password."""
@@ -212,6 +319,86 @@ class TestCredentialManager:
         result = cm2.load_credentials()
         assert result is False
     
+    def test_update_last_login_bulk(self, credential_manager):
+        """Test updating last login for several websites at once."""
+        credential_manager.add_website("https://example1.com", "user1", "pass1")
+        credential_manager.add_website("https://example2.com", "user2", "pass2")
+        
+        result = credential_manager.update_last_login_bulk({
+            "https://example1.com": True,
+            "https://example2.com/": False,
+            "https://missing.com": True
+        })
+        assert result is True
+        
+        # Verify updates were persisted
+        new_cm = CredentialManager(credential_manager.config_manager, "TestPassword123!")
+        assert new_cm.get_website("https://example1.com")["last_login"]["success"] is True
+        assert new_cm.get_website("https://example2.com")["last_login"]["success"] is False
+        
+        # Nothing to update
+        assert credential_manager.update_last_login_bulk({}) is True
+    
+    def test_load_legacy_fernet_credentials(self, credential_manager):
+        """Test that credentials written with Fernet still load and are re-saved as AES-GCM."""
+        import base64
+        from cryptography.fernet import Fernet
+        from src.core.credential_manager import GCMCipher
+        
+        key = credential_manager._derive_key("TestPassword123!")
+        legacy = Fernet(base64.urlsafe_b64encode(key))
+        creds = {"https://example.com": {"username": "testuser", "password": "testpass"}}
+        with open(credential_manager.credentials_file, "wb") as f:
+            f.write(legacy.encrypt(json.dumps(creds).encode()))
+        
+        assert credential_manager.load_credentials() is True
+        assert credential_manager.get_website("https://example.com")["username"] == "testuser"
+        
+        # The next save uses the new format
+        credential_manager.save_credentials()
+        with open(credential_manager.credentials_file, "rb") as f:
+            assert f.read().startswith(GCMCipher.MAGIC)
+        assert credential_manager.load_credentials() is True
+    
+    def test_derive_key_cache(self, credential_manager):
+        """Test that only the active master password's key is cached."""
+        from src.core import credential_manager as cm_module
+        
+        key = credential_manager._derive_key("TestPassword123!")
+        with patch.object(cm_module.hashlib, "pbkdf2_hmac") as derive:
+            assert credential_manager._derive_key("TestPassword123!") == key
+            derive.assert_not_called()
+        
+        # Failed verifications are derived every time and never cached
+        with patch.object(cm_module.hashlib, "pbkdf2_hmac", wraps=cm_module.hashlib.pbkdf2_hmac) as derive:
+            assert credential_manager.verify_password("OtherPassword456!") is False
+            assert credential_manager.verify_password("OtherPassword456!") is False
+            assert derive.call_count == 2
+        
+        credential_manager.clear_memory()
+        assert credential_manager._key is None
+    
+    def test_verify_password(self, credential_manager):
+        """Test verifying the master password against the active key."""
+        credential_manager.add_website("https://example.com", "testuser", "testpass")
+        
+        assert credential_manager.verify_password("TestPassword123!") is True
+        assert credential_manager.verify_password("WrongPassword456!") is False
+        assert credential_manager.verify_password("") is False
+    
+    def test_verify_password_with_pending_save(self, config_manager):
+        """Test that verify_password follows the in-memory key, not a stale file."""
+        config_manager.set("credential_autosave_debounce_ms", 60000)
+        cm = CredentialManager(config_manager, "TestPassword123!")
+        cm.add_website("https://example.com", "testuser", "testpass")
+        
+        with patch.object(cm, "flush"):
+            assert cm.set_master_password("NewPassword456!") is True
+        
+        assert cm.verify_password("NewPassword456!") is True
+        assert cm.verify_password("TestPassword123!") is False
+        cm.flush()
+    
     def test_clear_memory(self, credential_manager):
         """Test clearing sensitive data from memory."""
         # Add a website
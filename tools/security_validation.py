@@ -105,8 +105,8 @@ class SecurityValidationTest(unittest.TestCase):
             self.assertNotIn(self.test_website, str(decoded), "Credentials should not be stored in plaintext")
             self.assertNotIn("testuser", str(decoded), "Username should not be stored in plaintext")
             self.assertNotIn("testpass123", str(decoded), "Password should not be stored in plaintext")
-        except json.JSONDecodeError:
-            # This is expected if the file is properly encrypted
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # This is expected if the file is properly encrypted (AES-GCM output is binary)
             pass
         
         # Create a new credential manager with same password